@@ -0,0 +1,110 @@
+# benchmark comparing backward construction (Synthesizer) and bottom-up saturation (BottomUpSynthesizer)
+# - many queries over a small literal group: bottom-up saturation wins, since it instantiates combinators once
+# - a single query over a large literal group: backward construction wins, since it instantiates only what is needed
+
+from collections.abc import Callable, Mapping
+from itertools import product
+
+import pytest
+from cosy.bottom_up import BottomUpSynthesizer
+from cosy.dsl import DSL
+from cosy.synthesizer import Specification, Synthesizer
+from cosy.types import Constructor, Literal, Type, Var
+
+ENGINES = [Synthesizer, BottomUpSynthesizer]
+
+
+@pytest.fixture
+def fib_specifications() -> Mapping[str, Specification]:
+    return {
+        "fib_zero": DSL().suffix(Constructor("fib") & Constructor("at", Literal(0, "int"))),
+        "fib_one": DSL().suffix(Constructor("fib") & Constructor("at", Literal(1, "int"))),
+        "fib_next": DSL()
+        .parameter("z", "int")
+        .parameter("y", "int", lambda vs: [vs["z"] - 1])
+        .parameter("x", "int", lambda vs: [vs["z"] - 2])
+        .argument("f1", Constructor("fib") & Constructor("at", Var("y")))
+        .argument("f2", Constructor("fib") & Constructor("at", Var("x")))
+        .suffix(Constructor("fib") & Constructor("at", Var("z"))),
+    }
+
+
+FIB_SIZE = 50
+
+
+def solve_all_fib(engine: type[Synthesizer], fib_specifications: Mapping[str, Specification]) -> None:
+    synthesizer = engine(fib_specifications, {"int": list(range(FIB_SIZE))})
+    for i in range(FIB_SIZE):
+        synthesizer.construct_solution_space(Constructor("fib") & Constructor("at", Literal(i, "int")))
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_benchmark_engines_fibonacci(engine, fib_specifications, benchmark):
+    benchmark(solve_all_fib, engine, fib_specifications)
+
+
+def is_free(pos: tuple[int, int]) -> bool:
+    col, row = pos
+    seed = 0
+    if row == col:
+        return True
+    return pow(11, (row + col + seed) * (row + col + seed) + col + 7, 1000003) % 5 > 0
+
+
+@pytest.fixture
+def maze_specifications() -> Mapping[
+    Callable[[tuple[int, int], tuple[int, int], str], str] | str,
+    Specification,
+]:
+    def up(b: tuple[int, int], _a: tuple[int, int], p: str) -> str:
+        return f"{p} => UP({b})"
+
+    def down(b: tuple[int, int], _a: tuple[int, int], p: str) -> str:
+        return f"{p} => DOWN({b})"
+
+    def left(b: tuple[int, int], _a: tuple[int, int], p: str) -> str:
+        return f"{p} => LEFT({b})"
+
+    def right(b: tuple[int, int], _a: tuple[int, int], p: str) -> str:
+        return f"{p} => RIGHT({b})"
+
+    def pos(ab: str) -> Type:
+        return Constructor("pos", Var(ab))
+
+    return {
+        up: DSL()
+        .parameter("b", "int2")
+        .parameter("a", "int2", lambda vs: [(vs["b"][0], vs["b"][1] + 1)])
+        .argument("pos", pos("a"))
+        .suffix(pos("b")),
+        down: DSL()
+        .parameter("b", "int2")
+        .parameter("a", "int2", lambda vs: [(vs["b"][0], vs["b"][1] - 1)])
+        .argument("pos", pos("a"))
+        .suffix(pos("b")),
+        left: DSL()
+        .parameter("b", "int2")
+        .parameter("a", "int2", lambda vs: [(vs["b"][0] + 1, vs["b"][1])])
+        .argument("pos", pos("a"))
+        .suffix(pos("b")),
+        right: DSL()
+        .parameter("b", "int2")
+        .parameter("a", "int2", lambda vs: [(vs["b"][0] - 1, vs["b"][1])])
+        .argument("pos", pos("a"))
+        .suffix(pos("b")),
+        "START": "pos" @ (Literal((0, 0), "int2")),
+    }
+
+
+MAZE_SIZE = 50
+
+
+def solve_maze(engine: type[Synthesizer], maze_specifications, literals) -> None:
+    synthesizer = engine(maze_specifications, literals)
+    synthesizer.construct_solution_space("pos" @ (Literal((MAZE_SIZE - 1, MAZE_SIZE - 1), "int2")))
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_benchmark_engines_maze(engine, maze_specifications, benchmark):
+    literals = {"int2": frozenset(filter(is_free, product(range(MAZE_SIZE), range(MAZE_SIZE))))}
+    benchmark(solve_maze, engine, maze_specifications, literals)
@@ -0,0 +1,121 @@
+from collections.abc import Callable, Iterable, Mapping
+from itertools import islice, product
+
+import pytest
+from cosy.dsl import DSL
+from cosy.synthesizer import Specification, Synthesizer
+from cosy.tree import Tree
+from cosy.types import Constructor, Literal, Type, Var
+
+
+def is_free(pos: tuple[int, int]) -> bool:
+    col, row = pos
+    seed = 0
+    if row == col:
+        return True
+    return pow(11, (row + col + seed) * (row + col + seed) + col + 7, 1000003) % 5 > 0
+
+
+def pos(ab: str) -> Type:
+    return Constructor("pos", Var(ab))
+
+
+def up(b: tuple[int, int], _a: tuple[int, int], p: str) -> str:
+    return f"{p} => UP({b})"
+
+
+def down(b: tuple[int, int], _a: tuple[int, int], p: str) -> str:
+    return f"{p} => DOWN({b})"
+
+
+def left(b: tuple[int, int], _a: tuple[int, int], p: str) -> str:
+    return f"{p} => LEFT({b})"
+
+
+def right(b: tuple[int, int], _a: tuple[int, int], p: str) -> str:
+    return f"{p} => RIGHT({b})"
+
+
+MOVES: Mapping[Callable[[tuple[int, int], tuple[int, int], str], str], tuple[int, int]] = {
+    up: (0, 1),
+    down: (0, -1),
+    left: (1, 0),
+    right: (-1, 0),
+}
+
+
+def getpath(path: Tree) -> Iterable[tuple[int, int]]:
+    while path.root != "START":
+        position = path.children[0].root
+        path = path.children[2]
+        if isinstance(position, tuple) and isinstance(path, Tree):
+            yield position
+        else:
+            msg = "Expected position to be a tuple and path to be a tree."
+            raise TypeError(msg)
+    yield (0, 0)
+    return
+
+
+def bit(position: tuple[int, int]) -> int:
+    # visited positions are represented by a bitset
+    return 1 << (position[0] * SIZE + position[1])
+
+
+def move(dx: int, dy: int) -> DSL:
+    return (
+        DSL()
+        .parameter("b", "int2")
+        .parameter("a", "int2", lambda vs: [(vs["b"][0] + dx, vs["b"][1] + dy)])
+        .argument("pos", pos("a"))
+    )
+
+
+@pytest.fixture
+def component_specifications_traversal() -> Mapping[Callable | str, Specification]:
+    return {
+        **{
+            c: move(dx, dy).constraint(lambda vs: vs["b"] not in getpath(vs["pos"])).suffix(pos("b"))
+            for c, (dx, dy) in MOVES.items()
+        },
+        "START": "pos" @ (Literal((0, 0), "int2")),
+    }
+
+
+@pytest.fixture
+def component_specifications_attributes() -> Mapping[Callable | str, Specification]:
+    return {
+        **{
+            c: move(dx, dy)
+            .constraint(lambda vs: not vs["pos"].attributes["visited"] & bit(vs["b"]))
+            .attribute("visited", lambda vs: vs["pos"].attributes["visited"] | bit(vs["b"]))
+            .suffix(pos("b"))
+            for c, (dx, dy) in MOVES.items()
+        },
+        "START": DSL().attribute("visited", lambda _vs: bit((0, 0))).suffix("pos" @ (Literal((0, 0), "int2"))),
+    }
+
+
+SIZE = 10
+COUNT = 50
+
+
+@pytest.fixture
+def literals():
+    return {"int2": frozenset(filter(is_free, product(range(SIZE), range(SIZE))))}
+
+
+def enumerate_loopfree(synthesizer: Synthesizer) -> list[Tree]:
+    fin = "pos" @ (Literal((SIZE - 1, SIZE - 1), "int2"))
+    solution_space = synthesizer.construct_solution_space(fin).prune()
+    return list(islice(solution_space.enumerate_trees(fin), COUNT))
+
+
+def test_benchmark_maze_loopfree_traversal(component_specifications_traversal, literals, benchmark):
+    synthesizer = Synthesizer(component_specifications_traversal, literals)
+    benchmark(enumerate_loopfree, synthesizer)
+
+
+def test_benchmark_maze_loopfree_attributes(component_specifications_attributes, literals, benchmark):
+    synthesizer = Synthesizer(component_specifications_attributes, literals)
+    benchmark(enumerate_loopfree, synthesizer)
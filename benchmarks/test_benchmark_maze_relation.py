@@ -0,0 +1,49 @@
+from collections.abc import Callable, Mapping
+from itertools import product
+
+import pytest
+from cosy.bottom_up import BottomUpSynthesizer
+from cosy.dsl import DSL
+from cosy.synthesizer import Specification
+from cosy.types import Constructor, Literal, Var
+
+
+def is_free(pos: tuple[int, int]) -> bool:
+    col, row = pos
+    seed = 0
+    if row == col:
+        return True
+    return pow(11, (row + col + seed) * (row + col + seed) + col + 7, 1000003) % 5 > 0
+
+
+SIZE = 20
+POSITIONS = list(filter(is_free, product(range(SIZE), range(SIZE))))
+MOVES: dict[str, Callable[[tuple[int, int]], tuple[int, int]]] = {
+    "UP": lambda b: (b[0], b[1] + 1),
+    "DOWN": lambda b: (b[0], b[1] - 1),
+    "LEFT": lambda b: (b[0] + 1, b[1]),
+    "RIGHT": lambda b: (b[0] - 1, b[1]),
+}
+
+
+def component_specifications(use_relations: bool) -> Mapping[str, Specification]:
+    # neighboring positions as a relation or as a constraint filtering all pairs of positions
+    specifications: dict[str, Specification] = {"START": Constructor("pos", Literal((0, 0), "int2"))}
+    for name, move in MOVES.items():
+        dsl = DSL().parameter("b", "int2").parameter("a", "int2")
+        if use_relations:
+            dsl = dsl.relation(("b", "a"), ((b, move(b)) for b in POSITIONS))
+        else:
+            dsl = dsl.parameter_constraint(lambda vs, move=move: vs["a"] == move(vs["b"]))
+        specifications[name] = dsl.argument("pos", Constructor("pos", Var("a"))).suffix(Constructor("pos", Var("b")))
+    return specifications
+
+
+def solve(use_relations: bool) -> None:
+    synthesizer = BottomUpSynthesizer(component_specifications(use_relations), {"int2": POSITIONS})
+    synthesizer.construct_solution_space(Constructor("pos", Literal((SIZE - 1, SIZE - 1), "int2")))
+
+
+@pytest.mark.parametrize("use_relations", [True, False])
+def test_benchmark_maze_relation(use_relations, benchmark):
+    benchmark(solve, use_relations)
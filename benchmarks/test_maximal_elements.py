@@ -3,7 +3,7 @@
 from random import Random
 
 import pytest
-from cosy.combinatorics import maximal_elements
+from cosy.combinatorics import componentwise_dominance, maximal_elements, maximal_elements_skyline
 
 
 @pytest.fixture
@@ -26,3 +26,26 @@ def test_benchmark_maximal_elements(elements, benchmark):
         return all(a <= b for a, b in zip(x, y, strict=False))
 
     benchmark(maximal_elements, elements, compare)
+
+
+def compare(x, y):
+    return all(a <= b for a, b in zip(x, y, strict=False))
+
+
+def test_benchmark_maximal_elements_skyline(elements, benchmark):
+    """Benchmark maximal_elements_skyline function without key."""
+
+    benchmark(maximal_elements_skyline, elements, compare)
+
+
+def test_benchmark_maximal_elements_skyline_key(elements, benchmark):
+    """Benchmark maximal_elements_skyline function with monotone key."""
+
+    benchmark(maximal_elements_skyline, elements, compare, sum)
+
+
+def test_benchmark_maximal_elements_skyline_vectorized(elements, benchmark):
+    """Benchmark maximal_elements_skyline function with monotone key and vectorized dominance test."""
+
+    pytest.importorskip("numpy")
+    benchmark(maximal_elements_skyline, elements, compare, sum, componentwise_dominance)
@@ -0,0 +1,77 @@
+# benchmark for the minimal_covers function (bitmasks) against a reference implementation (sets of indices)
+
+from collections import deque
+from collections.abc import Callable, Iterable, Sequence
+from random import Random
+from typing import TypeVar
+
+import pytest
+from cosy.combinatorics import minimal_covers, partition
+
+S = TypeVar("S")
+E = TypeVar("E")
+
+
+def minimal_covers_sets(sets: Sequence[S], to_cover: Iterable[E], contains: Callable[[S, E], bool]) -> list[list[S]]:
+    necessary_sets: set[int] = set()
+    relevant_sets: deque[set[int]] = deque()
+
+    for e in to_cover:
+        covering_sets = {j for j in range(len(sets)) if contains(sets[j], e)}
+        if len(covering_sets) == 0:
+            return []
+        if len(covering_sets) == 1:
+            necessary_sets.add(covering_sets.pop())
+        else:
+            relevant_sets.append(covering_sets)
+
+    covers: deque[set[int]] = deque()
+    covers.appendleft(necessary_sets)
+    for r in relevant_sets:
+        partitioning = partition(r.isdisjoint, covers)
+        covers = partitioning[0].copy()
+        for c1 in partitioning[1]:
+            js: set[int] = r.copy()
+            for c2 in partitioning[0]:
+                missing = c2.difference(c1)
+                if len(missing) == 1:
+                    js.discard(missing.pop())
+            for j in js:
+                new_c = c1.copy()
+                new_c.add(j)
+                covers.append(new_c)
+    return [[sets[j] for j in sorted(c)] for c in covers]
+
+
+def random_instance(rand: Random, set_count: int, element_count: int) -> tuple[list[frozenset[int]], list[int]]:
+    sets = [frozenset(e for e in range(element_count) if rand.random() < 0.3) for _ in range(set_count)]
+    return sets, list(range(element_count))
+
+
+@pytest.fixture
+def instance() -> tuple[list[frozenset[int]], list[int]]:
+    return random_instance(Random(0), 22, 26)
+
+
+def contains(s: frozenset[int], e: int) -> bool:
+    return e in s
+
+
+def test_minimal_covers_identical() -> None:
+    # covers agree up to the order of sets with more than one choice (set iteration order is not sorted)
+    def canonical(covers: list[list[frozenset[int]]], sets: list[frozenset[int]]) -> list[list[int]]:
+        return sorted(sorted(sets.index(s) for s in cover) for cover in covers)
+
+    rand = Random(1)
+    for _ in range(200):
+        sets, elements = random_instance(rand, rand.randint(1, 10), rand.randint(0, 10))
+        sets = list(dict.fromkeys(sets))
+        covers = minimal_covers(sets, elements, contains)
+        assert canonical(covers, sets) == canonical(minimal_covers_sets(sets, elements, contains), sets)
+        assert all(sorted(sets.index(s) for s in cover) == [sets.index(s) for s in cover] for cover in covers)
+
+
+@pytest.mark.parametrize("implementation", [minimal_covers, minimal_covers_sets])
+def test_benchmark_minimal_covers(implementation, instance, benchmark):
+    sets, elements = instance
+    benchmark(implementation, sets, elements, contains)
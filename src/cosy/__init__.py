@@ -2,6 +2,7 @@ from collections.abc import Hashable, Iterable, Mapping
 from typing import Any, Generic, TypeVar
 
 from cosy.dsl import DSL
+from cosy.literals import Interval
 from cosy.solution_space import SolutionSpace
 from cosy.subtypes import Subtypes, Taxonomy
 from cosy.synthesizer import ParameterSpace, Specification, Synthesizer
@@ -9,6 +10,7 @@ from cosy.types import Arrow, Constructor, Intersection, Literal, Omega, Type, V
 
 __all__ = [
     "DSL",
+    "Interval",
     "Literal",
     "Var",
     "Subtypes",
@@ -0,0 +1,310 @@
+"""Bottom-up synthesizer, which saturates the set of inhabited types once and answers queries by lookup.
+
+In contrast to the backward construction of `Synthesizer`, which infers substitutions for each target,
+`BottomUpSynthesizer` instantiates every combinator once for all literals of the (finite) parameter space.
+Starting from nullary combinators, it computes the least fixpoint of inhabited instantiated types.
+Queries are answered by looking up instantiated combinators whose targets are indexed by paths,
+and rules are memoized across queries. The constructed `SolutionSpace` contains only productive rules.
+After taxonomy updates, facts are saturated again, but only memoized rules depending on affected concepts are dropped.
+After repository updates, only added components are instantiated, and only memoized rules of targets
+covered by changed components are dropped (unless the inhabited types changed)."""
+
+from collections import defaultdict, deque
+from collections.abc import Collection, Generator, Hashable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from itertools import chain, combinations
+from typing import Generic
+
+from cosy.solution_space import Argument, NonTerminalArgument, RHSRule, SolutionSpace
+from cosy.subtypes import Taxonomy
+from cosy.synthesizer import (
+    C,
+    CombinatorInfo,
+    MultiArrow,
+    ParameterSpace,
+    Specification,
+    Synthesizer,
+)
+from cosy.types import LiteralParameter, Type
+
+
+@dataclass(frozen=True)
+class GroundCombinator(Generic[C]):
+    # combinator instantiated for a particular substitution
+    combinator: C
+    info: CombinatorInfo
+    named_arguments: tuple[Argument, ...]
+    type: list[list[MultiArrow]]
+
+
+@dataclass(frozen=True)
+class Fact:
+    # applying a ground combinator to arguments of the given types results in the given target
+    target: Type
+    arguments: tuple[Type, ...]
+
+
+class BottomUpSynthesizer(Synthesizer[C]):
+    def __init__(
+        self,
+        component_specifications: Mapping[C, Specification],
+        parameter_space: ParameterSpace | None = None,
+        taxonomy: Taxonomy | None = None,
+    ):
+        super().__init__(component_specifications, parameter_space, taxonomy)
+        self._ground_combinators: list[GroundCombinator[C]] | None = None
+        # ground combinators indexed by keys of the paths of their targets
+        self._combinator_index: defaultdict[Hashable, set[int]] = defaultdict(set)
+        # targets of inhabited facts indexed by keys of their paths
+        self._inhabited_index: defaultdict[Hashable, deque[Type]] = defaultdict(deque)
+        self._inhabited: set[Type] = set()
+        self._rules: dict[Type, tuple[RHSRule[Type, C, str], ...]] = {}
+        # constructor names of all types consulted while computing the memoized rules for a target
+        self._rule_dependencies: dict[Type, set[str]] = {}
+
+    def _ground(self, repository: Iterable[tuple[C, CombinatorInfo]] | None = None) -> list[GroundCombinator[C]]:
+        """Instantiate each combinator (of the repository, by default) for all substitutions."""
+
+        ground_combinators: list[GroundCombinator[C]] = []
+        for combinator, combinator_info in self.repository if repository is None else repository:
+            for param in combinator_info.prefix:
+                if (
+                    isinstance(param, LiteralParameter)
+                    and param.values is None
+                    and not isinstance(self.literals[param.group], Iterable)
+                ):
+                    msg = f"Group {param.group} is not iterable, which is required for bottom-up synthesis."
+                    raise ValueError(msg)
+            for instantiation in self._enumerate_substitutions(combinator_info.prefix, {}):
+                ground_combinators.append(
+                    GroundCombinator(
+                        combinator,
+                        combinator_info,
+                        self._named_arguments(combinator_info, instantiation),
+                        [
+                            [
+                                MultiArrow(
+                                    tuple(self._subst(arg, combinator_info.groups, instantiation) for arg in m.args),
+                                    self._subst(m.target, combinator_info.groups, instantiation),
+                                )
+                                for m in nary_types
+                            ]
+                            for nary_types in combinator_info.type
+                        ],
+                    )
+                )
+        return ground_combinators
+
+    @staticmethod
+    def _facts(ground_combinator: GroundCombinator[C]) -> Iterable[Fact]:
+        """Facts of a ground combinator given by non-empty sets of multi-arrows of the same arity."""
+
+        named_types = tuple(
+            argument.origin
+            for argument in ground_combinator.named_arguments
+            if isinstance(argument, NonTerminalArgument)
+        )
+        for nary_types in ground_combinator.type:
+            for size in range(1, len(nary_types) + 1):
+                for ms in combinations(nary_types, size):
+                    yield Fact(
+                        Type.intersect([m.target for m in ms]),
+                        (
+                            *named_types,
+                            *(Type.intersect(args) for args in zip(*(m.args for m in ms), strict=True)),
+                        ),
+                    )
+
+    def _key(self, ty: Type) -> tuple[Hashable, ...] | None:
+        """Key of some path of `ty` (preferably of a path containing a literal), or None if `ty` is omega."""
+
+        keys = [self.subtypes.path_key(path) for path in ty.organized]
+        return max(keys, key=len, default=None)
+
+    def _is_inhabited(self, ty: Type) -> bool:
+        """Decides whether a closed type is inhabited with respect to the currently inhabited facts."""
+
+        if ty in self._inhabited:
+            return True
+        key = self._key(ty)
+        if key is None or any(self.subtypes.check_subtype(t, ty, {}, {}) for t in self._inhabited_index[key]):
+            self._inhabited.add(ty)
+            return True
+        return False
+
+    def _taxonomy_changed(self, names: set[str]) -> None:
+        super()._taxonomy_changed(names)
+        if self._ground_combinators is None:
+            return
+        inhabited = set(chain.from_iterable(self._inhabited_index.values()))
+        self._saturate()
+        if inhabited != set(chain.from_iterable(self._inhabited_index.values())):
+            self._rules.clear()
+            self._rule_dependencies.clear()
+            return
+        # subtyping between types, which do not contain affected concepts, did not change
+        for target, dependencies in list(self._rule_dependencies.items()):
+            if not dependencies.isdisjoint(names):
+                del self._rules[target]
+                del self._rule_dependencies[target]
+
+    def _repository_changed(self, combinators: set[C]) -> None:
+        super()._repository_changed(combinators)
+        if self._ground_combinators is None:
+            return
+        # only added components are instantiated
+        changed = [g for g in self._ground_combinators if g.combinator in combinators]
+        self._ground_combinators = [g for g in self._ground_combinators if g.combinator not in combinators]
+        added = self._ground((c, info) for c, info in self.repository if c in combinators)
+        self._ground_combinators.extend(added)
+        changed.extend(added)
+
+        inhabited = set(chain.from_iterable(self._inhabited_index.values()))
+        self._saturate()
+        if inhabited != set(chain.from_iterable(self._inhabited_index.values())):
+            self._rules.clear()
+            self._rule_dependencies.clear()
+            return
+        # memoized rules of targets, whose paths are not covered by changed ground combinators, did not change
+        keys = {
+            key
+            for ground_combinator in changed
+            for nary_types in ground_combinator.type
+            for m in nary_types
+            for path in m.target.organized
+            for key in self.subtypes.subtype_path_keys(path)
+        }
+        for target in list(self._rules):
+            if any(self.subtypes.path_key(path) in keys for path in target.organized):
+                del self._rules[target]
+                del self._rule_dependencies[target]
+
+    def _update_rules(self, solution_space: SolutionSpace[Type, C, str], targets: Iterable[Type]) -> set[Type]:
+        """Replace the rules of the targets and non-terminals of a solution space, whose productive rules changed,
+        and add the rules of new non-terminals in their arguments."""
+
+        nonterminals = self._occurring_nonterminals(solution_space, targets)
+        changed = {nt for nt in nonterminals if tuple(solution_space.get(nt) or ()) != self._rules_for(nt)}
+        solution_space.remove_rules(lambda nt, _: nt in changed)
+        for nt, rule in self._lookup_rules([nt for nt in nonterminals if nt in changed], nonterminals):
+            solution_space.add_rule(nt, rule.terminal, rule.arguments, rule.predicates, rule.attributes)
+            changed.add(nt)
+        return changed
+
+    def _add_component_rules(
+        self,
+        solution_space: SolutionSpace[Type, C, str],
+        targets: Iterable[Type],
+        combinator: C,
+        combinator_info: CombinatorInfo,
+    ) -> set[Type]:
+        # rules of other combinators may become productive
+        return self._update_rules(solution_space, targets)
+
+    def _remove_component_rules(
+        self, solution_space: SolutionSpace[Type, C, str], targets: Iterable[Type], combinator: C
+    ) -> set[Type]:
+        # rules of other combinators may become unproductive
+        return self._update_rules(solution_space, targets)
+
+    def _saturate(self) -> None:
+        """Compute the least fixpoint of inhabited facts starting from nullary combinators."""
+
+        if self._ground_combinators is None:
+            self._ground_combinators = self._ground()
+        self._combinator_index.clear()
+        self._inhabited_index.clear()
+        self._inhabited.clear()
+
+        # facts waiting for an argument type (indexed by its key) to become inhabited
+        waiting: defaultdict[Hashable, deque[Fact]] = defaultdict(deque)
+        worklist: deque[Fact] = deque()
+        for index, ground_combinator in enumerate(self._ground_combinators):
+            for nary_types in ground_combinator.type:
+                for m in nary_types:
+                    for path in m.target.organized:
+                        for key in self.subtypes.subtype_path_keys(path):
+                            self._combinator_index[key].add(index)
+            worklist.extend(self._facts(ground_combinator))
+
+        while worklist:
+            fact = worklist.pop()
+            missing = next((arg for arg in fact.arguments if not self._is_inhabited(arg)), None)
+            if missing is not None:
+                waiting[self._key(missing)].append(fact)
+                continue
+            # the target of the fact is inhabited
+            keys = {key for path in fact.target.organized for key in self.subtypes.subtype_path_keys(path)}
+            for key in keys:
+                self._inhabited_index[key].append(fact.target)
+                worklist.extend(waiting.pop(key, ()))
+
+    def _rules_for(self, target: Type) -> tuple[RHSRule[Type, C, str], ...]:
+        """Productive rules for the given target (memoized across queries)."""
+
+        if target in self._rules:
+            return self._rules[target]
+        rules: deque[RHSRule[Type, C, str]] = deque()
+        dependencies = set(self._constructor_names(target))
+        if self._ground_combinators is not None and self._is_inhabited(target):
+            candidates: set[int] | None = None
+            for path in target.organized:
+                indices = self._combinator_index.get(self.subtypes.path_key(path), set())
+                candidates = indices if candidates is None else candidates.intersection(indices)
+            for index in sorted(candidates or ()):
+                ground_combinator = self._ground_combinators[index]
+                for argument in ground_combinator.named_arguments:
+                    if isinstance(argument, NonTerminalArgument):
+                        dependencies.update(self._constructor_names(argument.origin))
+                if not all(
+                    self._is_inhabited(argument.origin)
+                    for argument in ground_combinator.named_arguments
+                    if isinstance(argument, NonTerminalArgument)
+                ):
+                    continue
+                for nary_types in ground_combinator.type:
+                    for subquery in self._subqueries(nary_types, target.organized, ground_combinator.info.groups, {}):
+                        dependencies.update(chain.from_iterable(map(self._constructor_names, subquery)))
+                        if all(self._is_inhabited(ty) for ty in subquery):
+                            rules.append(
+                                RHSRule[Type, C, str](
+                                    (
+                                        *ground_combinator.named_arguments,
+                                        *(NonTerminalArgument(None, ty) for ty in subquery),
+                                    ),
+                                    ground_combinator.info.term_predicates,
+                                    ground_combinator.combinator,
+                                    ground_combinator.info.attributes,
+                                )
+                            )
+        self._rules[target] = tuple(rules)
+        self._rule_dependencies[target] = dependencies
+        return self._rules[target]
+
+    def construct_solution_space_rules(self, *targets: Type) -> Generator[tuple[Type, RHSRule]]:
+        """Generate productive logic program rules for the given target types by lookup."""
+
+        yield from self._lookup_rules(targets)
+
+    def _lookup_rules(self, targets: Sequence[Type], known: Collection[Type] = ()) -> Generator[tuple[Type, RHSRule]]:
+        """Generate productive logic program rules for the given target types by lookup.
+        Rules of `known` targets other than the given ones are not generated."""
+
+        if self._ground_combinators is None:
+            self._saturate()
+
+        stack: deque[Type] = deque(targets)
+        seen: set[Type] = set(known).difference(targets)
+        while stack:
+            current_target = stack.pop()
+            if current_target.is_omega:
+                msg = f"Target type {current_target} is omega."
+                raise ValueError(msg)
+            if current_target in seen:
+                continue
+            seen.add(current_target)
+            for rule in self._rules_for(current_target):
+                yield (current_target, rule)
+                stack.extendleft(
+                    argument.origin for argument in rule.arguments if isinstance(argument, NonTerminalArgument)
+                )
@@ -0,0 +1,68 @@
+"""
+This module provides a bounded least-recently-used `Cache` with hit statistics (similar to `functools.lru_cache`).
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)  # Type of Keys
+V = TypeVar("V")  # Type of Values
+
+
+def typed_key(value: Any) -> Hashable:
+    """Key of a value, which distinguishes equal values of different types (e.g. `1`, `1.0` and `True`),
+    also as elements of tuples."""
+
+    if isinstance(value, tuple):
+        return (type(value), tuple(map(typed_key, value)))
+    return (type(value), value)
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+class Cache(Generic[K, V]):
+    def __init__(self, maxsize: int | None = 2**16):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def lookup(self, key: K, compute: Callable[[], V]) -> V:
+        """Cached value for the key, which is computed if necessary.
+        If the cache is full, the least recently used entry is evicted."""
+
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self._misses += 1
+            value = compute()
+            if self.maxsize is None or self.maxsize > 0:
+                self._entries[key] = value
+                if self.maxsize is not None and len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            return value
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def discard(self, predicate: Callable[[K], bool]) -> None:
+        """Remove all entries whose keys satisfy the predicate."""
+
+        for key in [key for key in self._entries if predicate(key)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove all entries (statistics are kept)."""
+
+        self._entries.clear()
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self._hits, self._misses, self.maxsize, len(self._entries))
@@ -1,6 +1,6 @@
 from collections import deque
 from collections.abc import Callable, Iterable, Sequence
-from typing import TypeVar
+from typing import Any, TypeVar
 
 S = TypeVar("S")  # Type of Sets
 E = TypeVar("E")  # Type of Elements
@@ -47,6 +47,53 @@ def maximal_elements(elements: Iterable[E], compare: Callable[[E, E], bool]) ->
     return result
 
 
+def maximal_elements_skyline(
+    elements: Iterable[E],
+    compare: Callable[[E, E], bool],
+    key: Callable[[E], Any] | None = None,
+    dominance: Callable[[Sequence[E]], Callable[[int, Sequence[int]], bool]] | None = None,
+) -> list[E]:
+    """Enumerate maximal elements with respect to compare (in the order of `elements`).
+
+    `compare(e1, e2) == True` iff `e1` smaller or equal to `e2`.
+
+    Elements are added to a skyline of maximal elements, unless they are dominated by some element of the skyline.
+    If `key` is monotone (`compare(e1, e2)` implies `key(e1) <= key(e2)`), elements are processed in descending key
+    order, and an element can only dominate skyline elements of the same key.
+    `dominance(elements)` may provide a (vectorized) test, whether the element at the first index is
+    smaller or equal to some element at the given indices (see `componentwise_dominance`).
+    """
+
+    items = list(elements)
+    keys = None if key is None else [key(e) for e in items]
+    order: Iterable[int] = (
+        range(len(items)) if keys is None else sorted(range(len(items)), key=keys.__getitem__, reverse=True)
+    )
+    is_dominated = None if dominance is None else dominance(items)
+
+    skyline: list[int] = []
+    for i in order:
+        if is_dominated is not None:
+            if skyline and is_dominated(i, skyline):
+                continue
+        elif any(compare(items[i], items[j]) for j in skyline):
+            continue
+        # remove elements of the skyline, which are dominated by the new element
+        skyline = [j for j in skyline if (keys is not None and keys[j] != keys[i]) or not compare(items[j], items[i])]
+        skyline.append(i)
+    return [items[i] for i in sorted(skyline)]
+
+
+def componentwise_dominance(elements: Sequence[Sequence[float]]) -> Callable[[int, Sequence[int]], bool]:
+    """Vectorized test for `maximal_elements_skyline`, whether a numeric tuple is componentwise smaller or equal
+    to some of the tuples at the given indices (requires numpy)."""
+
+    import numpy as np
+
+    array = np.asarray(elements)
+    return lambda i, js: bool((array[i] <= array[js]).all(axis=1).any())
+
+
 def minimal_covers(sets: Sequence[S], to_cover: Iterable[E], contains: Callable[[S, E], bool]) -> list[list[S]]:
     """List minimal covers of elements in to_cover using given sets.
 
@@ -55,35 +102,52 @@ def minimal_covers(sets: Sequence[S], to_cover: Iterable[E], contains: Callable[
       `contains(s, e) == True`
     - no `s: S` can be removed from `cover`
     """
+    # sets are identified by their indices, and collections of sets are represented by bitmasks of indices
+
     # sets necessarily included in any cover
-    necessary_sets: set[int] = set()
+    necessary_sets = 0
     # for each element e: sets containing e
-    relevant_sets: deque[set[int]] = deque()
+    relevant_sets: list[int] = []
 
     for e in to_cover:
-        covering_sets = {j for j in range(len(sets)) if contains(sets[j], e)}
-        if len(covering_sets) == 0:  # at least one element cannot be covered
+        covering_sets = 0
+        for j, s in enumerate(sets):
+            if contains(s, e):
+                covering_sets |= 1 << j
+        if covering_sets == 0:  # at least one element cannot be covered
             return []
-        if len(covering_sets) == 1:  # exactly one set is relevant
-            necessary_sets.add(covering_sets.pop())
+        if covering_sets & (covering_sets - 1) == 0:  # exactly one set is relevant
+            necessary_sets |= covering_sets
         else:  # more than one set is relevant
             relevant_sets.append(covering_sets)
 
     # collect minimal covers (there is no smaller or equivalent cover)
-    covers: deque[set[int]] = deque()
-    covers.appendleft(necessary_sets)
+    covers: list[int] = [necessary_sets]
     for r in relevant_sets:
-        partitioning = partition(r.isdisjoint, covers)
-        covers = partitioning[0].copy()
-        for c1 in partitioning[1]:
-            js: set[int] = r.copy()
-            for c2 in partitioning[0]:
-                missing = c2.difference(c1)
-                if len(missing) == 1:
+        covering = [c for c in covers if c & r]
+        not_covering = [c for c in covers if not c & r]
+        covers = covering.copy()
+        for c1 in not_covering:
+            js = r
+            for c2 in covering:
+                missing = c2 & ~c1
+                if missing & (missing - 1) == 0:
                     # c2 is a subset of c1 + {one missing element}
-                    js.discard(missing.pop())
-            for j in js:
-                new_c = c1.copy()
-                new_c.add(j)
-                covers.append(new_c)
-    return [[sets[j] for j in c] for c in covers]
+                    js &= ~missing
+            covers.extend(c1 | j for j in _bits(js))
+    return [[sets[j] for j in _indices(c)] for c in covers]
+
+
+def _bits(mask: int) -> Iterable[int]:
+    """Single bits of a bitmask in ascending order."""
+
+    while mask:
+        bit = mask & -mask
+        yield bit
+        mask ^= bit
+
+
+def _indices(mask: int) -> Iterable[int]:
+    """Indices of the bits of a bitmask in ascending order."""
+
+    return (bit.bit_length() - 1 for bit in _bits(mask))
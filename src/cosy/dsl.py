@@ -9,7 +9,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Mapping, Sequence
+    from collections.abc import Callable, Iterable, Mapping, Sequence
 
     from cosy.synthesizer import Specification
 
@@ -17,9 +17,12 @@ from typing import Any
 
 from cosy.types import (
     Abstraction,
+    Attribute,
+    Attribution,
     Implication,
     LiteralParameter,
     Predicate,
+    Relation,
     TermParameter,
     Type,
 )
@@ -110,38 +113,106 @@ class DSL:
         self._result = new_result
         return self
 
-    def parameter_constraint(self, constraint: Callable[[Mapping[str, Any]], bool]) -> DSL:
+    def parameter_constraint(self, constraint: Callable[[Mapping[str, Any]], Any], vectorized: bool = False) -> DSL:
         """
         Constraint on the previously defined parameter variables.
 
+        A vectorized constraint is evaluated for all candidate values of the last defined parameter variable at once.
+        It receives a NumPy array of these values (and the values of the other parameter variables)
+        and returns a boolean mask, e.g. `lambda vs: vs["x"] % vs["y"] == 0`.
+        If NumPy is not available, the constraint is evaluated for each value separately.
+
         :param constraint: A constraint deciding, if the currently chosen parameter values are valid.
             The values of variables are passed by a dictionary, where the keys are the names of the
             parameter variables and the values are the corresponding values.
-        :type constraint: Callable[[Mapping[str, Any]], bool]
+        :type constraint: Callable[[Mapping[str, Any]], Any]
+        :param vectorized: Whether the constraint is evaluated for an array of values of the last parameter variable.
+        :type vectorized: bool
+        :return: The DSL object.
+        :rtype: DSL
+        """
+
+        def new_result(suffix: Specification, result=self._result) -> Specification:
+            return result(Implication(Predicate(constraint, True, vectorized=vectorized), suffix))
+
+        self._result = new_result
+        return self
+
+    def relation(self, names: Sequence[str], rows: Iterable[Sequence[Any]]) -> DSL:
+        """
+        Relation over the previously defined parameter variables.
+
+        The relation is given by the tuples of values of the parameter variables (in the order of `names`),
+        e.g. all pairs of neighboring positions. Instead of enumerating all combinations of values and filtering them,
+        the values of each parameter variable are looked up in an index of the relation
+        by the values of the already chosen parameter variables.
+
+        :param names: The names of the parameter variables.
+        :type names: Sequence[str]
+        :param rows: The tuples of values of the parameter variables, which are in the relation.
+        :type rows: Iterable[Sequence[Any]]
         :return: The DSL object.
         :rtype: DSL
         """
+        relation = Relation(tuple(names), tuple(tuple(row) for row in rows))
 
         def new_result(suffix: Specification, result=self._result) -> Specification:
-            return result(Implication(Predicate(constraint, True), suffix))
+            return result(Implication(relation, suffix))
 
         self._result = new_result
         return self
 
-    def constraint(self, constraint: Callable[[Mapping[str, Any]], bool]) -> DSL:
+    def constraint(
+        self,
+        constraint: Callable[[Mapping[str, Any]], bool],
+        dependencies: Iterable[str] | None = None,
+    ) -> DSL:
         """
         Constraint on the previously defined parameter variables and argument variables.
 
+        Optionally, you can declare the names of the variables the constraint depends on.
+        During enumeration, such a constraint is checked as soon as all of these variables are bound,
+        instead of after all argument variables are chosen. This prunes combinations of arguments early.
+
         :param constraint: A constraint deciding, if the currently chosen values are valid.
             The values of variables are passed by a dictionary, where the keys are the names of the
             variables and the values are the corresponding values.
         :type constraint: Callable[[Mapping[str, Any]], bool]
+        :param dependencies: Names of the variables the constraint depends on.
+        :type dependencies: Iterable[str] | None
+        :return: The DSL object.
+        :rtype: DSL
+        """
+        frozen_dependencies = None if dependencies is None else frozenset(dependencies)
+
+        def new_result(suffix: Specification, result=self._result) -> Specification:
+            return result(Implication(Predicate(constraint, False, frozen_dependencies), suffix))
+
+        self._result = new_result
+        return self
+
+    def attribute(self, name: str, function: Callable[[Mapping[str, Any]], Any]) -> DSL:
+        """
+        Synthesized attribute of the trees constructed by the combinator.
+
+        Whenever a tree is constructed during enumeration, its attributes are computed once
+        and stored in `tree.attributes`. Since the values of argument variables are trees,
+        an attribute function can build on the (already computed) attributes of the arguments,
+        e.g. `lambda vs: vs["p"].attributes["length"] + 1`. Constraints can read attributes
+        of arguments instead of traversing them.
+
+        :param name: The name of the attribute.
+        :type name: str
+        :param function: A function computing the value of the attribute.
+            The values of variables are passed by a dictionary, where the keys are the names of the
+            variables and the values are the corresponding values.
+        :type function: Callable[[Mapping[str, Any]], Any]
         :return: The DSL object.
         :rtype: DSL
         """
 
         def new_result(suffix: Specification, result=self._result) -> Specification:
-            return result(Implication(Predicate(constraint, False), suffix))
+            return result(Attribution(Attribute(name, function), suffix))
 
         self._result = new_result
         return self
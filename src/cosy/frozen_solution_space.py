@@ -0,0 +1,385 @@
+"""Compact, immutable representation of a solution space (see `SolutionSpace.freeze`).
+
+Non-terminals, terminals, constants, names, predicates and attributes are mapped to integer ids.
+Rules are stored in flat arrays in compressed sparse row (CSR) format:
+- the rules of the non-terminal `i` are `rule_offsets[i]`, ..., `rule_offsets[i + 1] - 1`
+- the arguments of the rule `r` are `argument_offsets[r]`, ..., `argument_offsets[r + 1] - 1`
+- an argument `a` is the non-terminal `arguments[a]` if it is non-negative,
+  and the constant `-arguments[a] - 1` otherwise
+
+Rules are decoded into `RHSRule`s only on access (for one non-terminal at a time),
+so that `enumerate_trees` and `contains_tree` of `SolutionSpace` run against the frozen representation.
+`prune` computes productive non-terminals and copies the remaining rules on the arrays.
+
+`save` writes the arrays and the pickled tables to a file, which is memory-mapped by `load`,
+so that processes loading the same file share the pages of its arrays.
+The tables are unpickled completely by each process (non-terminals are needed to look up their rules).
+Functions, which cannot be pickled by reference (e.g. lambdas in predicates and attributes),
+are stored by their names in a registry, which is given to both `save` and `load`."""
+
+from __future__ import annotations
+
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
+from io import BytesIO
+from os import PathLike
+from types import FunctionType
+from typing import IO, Any
+
+from cosy.cache import typed_key
+from cosy.solution_space import (
+    NT,
+    Argument,
+    ConstantArgument,
+    G,
+    MinimizationStatistics,
+    NonTerminalArgument,
+    RHSRule,
+    SolutionSpace,
+    T,
+)
+from cosy.types import Attribute
+
+# format of saved solution spaces
+_MAGIC = b"COSYSS\x00\x01"
+# magic, byte order of the arrays (1 if big-endian), and lengths of the seven arrays
+_HEADER = struct.Struct("<8sQ7Q")
+
+
+class _Ids:
+    """Assigns consecutive integer ids to hashable values (identified by their keys)."""
+
+    def __init__(self, key: Callable[[Any], Hashable] | None = None) -> None:
+        self.ids: dict[Any, int] = {}
+        self.values: list[Any] = []
+        self._key = key
+
+    def __call__(self, value: Any) -> int:
+        key = value if self._key is None else self._key(value)
+        index = self.ids.get(key)
+        if index is None:
+            index = len(self.values)
+            self.ids[key] = index
+            self.values.append(value)
+        return index
+
+
+class FrozenSolutionSpace(SolutionSpace[NT, T, G]):
+    def __init__(self, rules: Iterable[tuple[NT, Iterable[RHSRule[NT, T, G]]]]) -> None:
+        super().__init__()
+        rules = [(nonterminal, list(rhss)) for nonterminal, rhss in rules]
+        nonterminals = _Ids()
+        # non-terminals with rules have the smallest ids
+        for nonterminal, _ in rules:
+            nonterminals(nonterminal)
+        # terminals and constants are roots of trees, they are not merged with equal values of other types
+        terminals = _Ids(typed_key)
+        constants = _Ids(typed_key)
+        names = _Ids()
+        predicates = _Ids()
+        attributes = _Ids()
+
+        rule_offsets = array("q", [0])
+        terminal_ids = array("q")
+        predicate_ids = array("q")
+        attribute_ids = array("q")
+        argument_offsets = array("q", [0])
+        argument_ids = array("q")
+        name_ids = array("q")
+        for _, rhss in rules:
+            for rule in rhss:
+                terminal_ids.append(terminals(rule.terminal))
+                predicate_ids.append(predicates(rule.predicates))
+                attribute_ids.append(attributes(rule.attributes))
+                for argument in rule.arguments:
+                    if isinstance(argument, ConstantArgument):
+                        argument_ids.append(-constants((argument.value, argument.origin)) - 1)
+                    else:
+                        argument_ids.append(nonterminals(argument.origin))
+                    name_ids.append(names(argument.name))
+                argument_offsets.append(len(argument_ids))
+            rule_offsets.append(len(terminal_ids))
+
+        self._assign(
+            (rule_offsets, terminal_ids, predicate_ids, attribute_ids, argument_offsets, argument_ids, name_ids),
+            (
+                nonterminals.values,
+                terminals.values,
+                constants.values,
+                names.values,
+                predicates.values,
+                attributes.values,
+            ),
+        )
+
+    def _assign(self, arrays: Sequence[Sequence[int]], tables: Sequence[Sequence[Any]]) -> None:
+        self._rule_offsets, self._terminals, self._predicates, self._attributes = arrays[:4]
+        self._argument_offsets, self._arguments, self._argument_names = arrays[4:]
+        self._nonterminal_table: tuple[NT, ...] = tuple(tables[0])
+        self._terminal_table: tuple[T, ...] = tuple(tables[1])
+        self._constant_table: tuple[tuple[Any, G], ...] = tuple(tables[2])
+        self._name_table: tuple[str | None, ...] = tuple(tables[3])
+        self._predicate_table: tuple[tuple[Callable[[dict[str, Any]], bool], ...], ...] = tuple(tables[4])
+        self._attribute_table: tuple[tuple[Attribute, ...], ...] = tuple(tables[5])
+        # non-terminals with rules have the smallest ids
+        self._ids: dict[NT, int] = {
+            self._nonterminal_table[index]: index for index in range(len(self._rule_offsets) - 1)
+        }
+
+    @property
+    def _arrays(self) -> tuple[Sequence[int], ...]:
+        return (
+            self._rule_offsets,
+            self._terminals,
+            self._predicates,
+            self._attributes,
+            self._argument_offsets,
+            self._arguments,
+            self._argument_names,
+        )
+
+    @property
+    def _tables(self) -> tuple[tuple[Any, ...], ...]:
+        return (
+            self._nonterminal_table,
+            self._terminal_table,
+            self._constant_table,
+            self._name_table,
+            self._predicate_table,
+            self._attribute_table,
+        )
+
+    @classmethod
+    def _from_arrays(
+        cls, arrays: Sequence[Sequence[int]], tables: Sequence[Sequence[Any]]
+    ) -> FrozenSolutionSpace[NT, T, G]:
+        frozen = cls.__new__(cls)
+        SolutionSpace.__init__(frozen)
+        frozen._assign(arrays, tables)
+        return frozen
+
+    def _decode(self, rule: int) -> RHSRule[NT, T, G]:
+        arguments: list[Argument] = []
+        for index in range(self._argument_offsets[rule], self._argument_offsets[rule + 1]):
+            argument = self._arguments[index]
+            name = self._name_table[self._argument_names[index]]
+            if argument >= 0:
+                arguments.append(NonTerminalArgument(name, self._nonterminal_table[argument]))
+            else:
+                value, group = self._constant_table[-argument - 1]
+                # constant arguments are always named
+                arguments.append(ConstantArgument(name or "", value, group))
+        return RHSRule(
+            tuple(arguments),
+            self._predicate_table[self._predicates[rule]],
+            self._terminal_table[self._terminals[rule]],
+            self._attribute_table[self._attributes[rule]],
+        )
+
+    def _rule_range(self, nonterminal_id: int) -> range:
+        return range(self._rule_offsets[nonterminal_id], self._rule_offsets[nonterminal_id + 1])
+
+    def get(self, nonterminal: NT) -> deque[RHSRule[NT, T, G]] | None:
+        nonterminal_id = self._ids.get(nonterminal)
+        if nonterminal_id is None:
+            return None
+        return deque(map(self._decode, self._rule_range(nonterminal_id)))
+
+    def __getitem__(self, nonterminal: NT) -> deque[RHSRule[NT, T, G]]:
+        rules = self.get(nonterminal)
+        return deque() if rules is None else rules
+
+    def nonterminals(self) -> Iterable[NT]:
+        return self._ids.keys()
+
+    def as_tuples(self) -> Iterable[tuple[NT, deque[RHSRule[NT, T, G]]]]:
+        for nonterminal, nonterminal_id in self._ids.items():
+            yield nonterminal, deque(map(self._decode, self._rule_range(nonterminal_id)))
+
+    def check_modifiable(self) -> None:
+        msg = "A frozen solution space cannot be modified."
+        raise ValueError(msg)
+
+    def add_rule(
+        self,
+        nonterminal: NT,
+        terminal: T,
+        arguments: tuple[Argument, ...],
+        predicates: tuple[Callable[[dict[str, Any]], bool], ...],
+        attributes: tuple[Attribute, ...] = (),
+    ) -> None:
+        self.check_modifiable()
+
+    def remove_rules(self, condition: Callable[[NT, RHSRule[NT, T, G]], bool]) -> set[NT]:
+        self.check_modifiable()
+        return set()
+
+    def freeze(self) -> FrozenSolutionSpace[NT, T, G]:
+        return self
+
+    def thaw(self) -> SolutionSpace[NT, T, G]:
+        """Mutable copy of the solution space."""
+
+        solution_space: SolutionSpace[NT, T, G] = SolutionSpace()
+        for nonterminal, rules in self.as_tuples():
+            solution_space[nonterminal].extend(rules)
+        return solution_space
+
+    @property
+    def rule_count(self) -> int:
+        return len(self._terminals)
+
+    def _body(self, rule: int) -> Sequence[int]:
+        """Ids of the non-terminals in the body of a rule."""
+
+        return [
+            argument
+            for argument in self._arguments[self._argument_offsets[rule] : self._argument_offsets[rule + 1]]
+            if argument >= 0
+        ]
+
+    def prune(self) -> FrozenSolutionSpace[NT, T, G]:
+        """Keep only productive rules."""
+
+        # number of distinct non-terminals in the body of each rule, which are not known to be productive
+        missing = array("q", (len(set(self._body(rule))) for rule in range(self.rule_count)))
+        # rules and their heads (indexed by the non-terminals in their bodies)
+        occurrences: dict[int, list[tuple[int, int]]] = {}
+        queue: deque[int] = deque()
+        for head in self._ids.values():
+            for rule in self._rule_range(head):
+                for nonterminal in set(self._body(rule)):
+                    occurrences.setdefault(nonterminal, []).append((head, rule))
+                if missing[rule] == 0:
+                    queue.append(head)
+
+        productive: set[int] = set()
+        while queue:
+            nonterminal = queue.popleft()
+            if nonterminal in productive:
+                continue
+            productive.add(nonterminal)
+            for head, rule in occurrences.get(nonterminal, ()):
+                missing[rule] -= 1
+                if missing[rule] == 0 and head not in productive:
+                    queue.append(head)
+
+        return self._restrict(
+            [nonterminal_id for nonterminal_id in self._ids.values() if nonterminal_id in productive], missing
+        )
+
+    def minimize(
+        self, keep: Iterable[NT] | None = None, statistics: MinimizationStatistics | None = None
+    ) -> FrozenSolutionSpace[NT, T, G]:
+        return super().minimize(keep, statistics).freeze()
+
+    def _restrict(self, nonterminal_ids: Sequence[int], missing: Sequence[int]) -> FrozenSolutionSpace[NT, T, G]:
+        """Frozen solution space of the given non-terminals and their rules without missing non-terminals.
+        The arrays are copied without decoding rules, and the tables of values are shared."""
+
+        renumbered = {old: new for new, old in enumerate(nonterminal_ids)}
+        rule_offsets = array("q", [0])
+        terminal_ids = array("q")
+        predicate_ids = array("q")
+        attribute_ids = array("q")
+        argument_offsets = array("q", [0])
+        argument_ids = array("q")
+        name_ids = array("q")
+        for nonterminal_id in nonterminal_ids:
+            for rule in self._rule_range(nonterminal_id):
+                if missing[rule] != 0:
+                    continue
+                terminal_ids.append(self._terminals[rule])
+                predicate_ids.append(self._predicates[rule])
+                attribute_ids.append(self._attributes[rule])
+                for index in range(self._argument_offsets[rule], self._argument_offsets[rule + 1]):
+                    argument = self._arguments[index]
+                    argument_ids.append(renumbered[argument] if argument >= 0 else argument)
+                    name_ids.append(self._argument_names[index])
+                argument_offsets.append(len(argument_ids))
+            rule_offsets.append(len(terminal_ids))
+
+        nonterminal_table = [self._nonterminal_table[nonterminal_id] for nonterminal_id in nonterminal_ids]
+        return FrozenSolutionSpace._from_arrays(
+            (rule_offsets, terminal_ids, predicate_ids, attribute_ids, argument_offsets, argument_ids, name_ids),
+            (nonterminal_table, *self._tables[1:]),
+        )
+
+
+class _Pickler(pickle.Pickler):
+    """Pickles registered functions by their names."""
+
+    def __init__(self, file: IO[bytes], registry: Mapping[str, Callable[..., Any]]) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._names = {id(function): name for name, function in registry.items()}
+
+    def persistent_id(self, obj: Any) -> str | None:
+        name = self._names.get(id(obj))
+        if name is None and isinstance(obj, FunctionType) and "<" in obj.__qualname__:
+            # lambdas and local functions cannot be pickled by reference
+            msg = f"Function {obj.__qualname__} is not registered."
+            raise ValueError(msg)
+        return name
+
+
+class _Unpickler(pickle.Unpickler):
+    """Unpickles registered functions by their names."""
+
+    def __init__(self, file: IO[bytes], registry: Mapping[str, Callable[..., Any]]) -> None:
+        super().__init__(file)
+        self._registry = registry
+
+    def persistent_load(self, pid: Any) -> Any:
+        if pid not in self._registry:
+            msg = f"Function {pid} is not registered."
+            raise ValueError(msg)
+        return self._registry[pid]
+
+
+def save(
+    solution_space: FrozenSolutionSpace[Any, Any, Any],
+    path: str | PathLike[str],
+    registry: Mapping[str, Callable[..., Any]] | None = None,
+) -> None:
+    """Write a frozen solution space to a file (see `SolutionSpace.save`)."""
+
+    tables = BytesIO()
+    _Pickler(tables, registry or {}).dump(solution_space._tables)
+    arrays = solution_space._arrays
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, sys.byteorder == "big", *map(len, arrays)))
+        file.writelines(values if isinstance(values, array | memoryview) else array("q", values) for values in arrays)
+        file.write(tables.getbuffer())
+
+
+def load(
+    path: str | PathLike[str], registry: Mapping[str, Callable[..., Any]] | None = None
+) -> FrozenSolutionSpace[Any, Any, Any]:
+    """Memory-map a solution space written by `save` (see `SolutionSpace.load`)."""
+
+    with open(path, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(buffer)
+    if len(view) < _HEADER.size or view[: len(_MAGIC)] != _MAGIC:
+        msg = f"File {path} does not contain a saved solution space."
+        raise ValueError(msg)
+    _, big_endian, *lengths = _HEADER.unpack_from(view)
+    offset = _HEADER.size
+    arrays: list[Sequence[int]] = []
+    for length in lengths:
+        values = view[offset : offset + length * 8].cast("q")
+        if big_endian != (sys.byteorder == "big"):
+            # arrays saved with a different byte order are copied
+            swapped = array("q", values.tobytes())
+            swapped.byteswap()
+            arrays.append(swapped)
+        else:
+            arrays.append(values)
+        offset += length * 8
+    tables = _Unpickler(BytesIO(view[offset:]), registry or {}).load()
+    return FrozenSolutionSpace._from_arrays(arrays, tables)
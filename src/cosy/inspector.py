@@ -13,6 +13,7 @@ from cosy.synthesizer import ParameterSpace, Specification, Taxonomy
 from cosy.types import (
     Abstraction,
     Arrow,
+    Attribution,
     Constructor,
     Implication,
     Intersection,
@@ -126,7 +127,7 @@ class Inspector:
                         parameter_names.update(param.group.free_vars)
                         constructors.update(Inspector._constructors(param.group))
                     parameterized_type = parameterized_type.body
-                elif isinstance(parameterized_type, Implication):
+                elif isinstance(parameterized_type, Implication | Attribution):
                     parameterized_type = parameterized_type.body
 
             parameter_names.update(parameterized_type.free_vars)
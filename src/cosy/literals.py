@@ -0,0 +1,113 @@
+"""Literal groups of a parameter space.
+
+Groups are normalized by `normalize_group` when a synthesizer is constructed:
+- finite iterable groups (e.g. lists) become an `IndexedGroup` (ordered values and a hash set for membership)
+- `range` groups are kept as they are (constant time membership without materialization)
+- bounded `Interval` groups become a `range`, unbounded ones are enumerated lazily
+- strings and bytes are kept as they are (membership tests for substrings)
+- other containers (e.g. user-defined membership tests) become a `CachedContainer`"""
+
+from collections.abc import Container, Iterable, Iterator, Sequence, Sized
+from dataclasses import dataclass
+from itertools import count
+from typing import Any, overload
+
+from cosy.cache import Cache, CacheInfo, typed_key
+
+
+class IndexedGroup(Sequence[Any]):
+    """Finite group of literals, which is enumerated in the given order.
+    Membership is tested via a hash set (by comparison if some values are not hashable)."""
+
+    def __init__(self, values: Iterable[Any]):
+        self.values: tuple[Any, ...] = tuple(values)
+        try:
+            self._members: frozenset[Any] | None = frozenset(self.values)
+        except TypeError:
+            self._members = None
+
+    def __contains__(self, value: object) -> bool:
+        if self._members is not None:
+            try:
+                return value in self._members
+            except TypeError:
+                # unhashable values are not members of a group of hashable values
+                return False
+        return value in self.values
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Any]: ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        return self.values[index]
+
+    def __repr__(self) -> str:
+        return f"IndexedGroup({list(self.values)!r})"
+
+
+@dataclass(frozen=True)
+class Interval(Iterable[int], Container[int]):
+    """Integers from `lower` to `upper` (both inclusive). The interval is unbounded if `upper` is None.
+    As for a `range`, booleans are members (as the integers 0 and 1)."""
+
+    lower: int
+    upper: int | None = None
+
+    def __contains__(self, value: object) -> bool:
+        return isinstance(value, int) and self.lower <= value and (self.upper is None or value <= self.upper)
+
+    def __iter__(self) -> Iterator[int]:
+        if self.upper is None:
+            return count(self.lower)
+        return iter(range(self.lower, self.upper + 1))
+
+
+class CachedContainer(Container[Any]):
+    """Container, whose membership tests are cached (for hashable values).
+    Equal values of different types (e.g. `1` and `True`) are cached separately."""
+
+    def __init__(self, container: Container[Any], maxsize: int | None = 2**16):
+        self.container = container
+        self._cache: Cache[Any, bool] = Cache(maxsize)
+
+    def __contains__(self, value: object) -> bool:
+        key = typed_key(value)
+        try:
+            hash(key)
+        except TypeError:
+            return value in self.container
+        return self._cache.lookup(key, lambda: value in self.container)
+
+    def cache_info(self) -> CacheInfo:
+        return self._cache.cache_info()
+
+    def __repr__(self) -> str:
+        return f"CachedContainer({self.container!r})"
+
+
+def normalize_group(values: Iterable[Any] | Container[Any]) -> Iterable[Any] | Container[Any]:
+    """Normalized representation of a group of literals."""
+
+    match values:
+        case IndexedGroup() | range() | CachedContainer():
+            return values
+        case Interval(lower, upper) if upper is not None:
+            return range(lower, upper + 1)
+        case Interval():
+            return values
+        case Iterable() if isinstance(values, Sized) and not isinstance(values, str | bytes):
+            return IndexedGroup(values)
+        case Iterable():
+            # possibly infinite iterable groups are enumerated lazily
+            return values
+        case _:
+            return CachedContainer(values)
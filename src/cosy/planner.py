@@ -0,0 +1,141 @@
+"""Planning the evaluation order of literal parameters and literal predicates of a prefix.
+
+The order of a `DSL` chain fixes the order of arguments of a combinator, but not the order,
+in which values of literal parameters are enumerated. `plan_prefix` reorders literal parameters
+by the estimated number of their values and evaluates each predicate as soon as its variables are bound.
+Dependencies of candidate functions and predicates are declared or introspected by `introspect_dependencies`.
+If they are unknown, a function may depend on all literal parameters introduced before it."""
+
+import dis
+import math
+from collections.abc import Callable, Container, Iterable, Mapping, Sequence
+from types import FunctionType
+from typing import Any
+
+from cosy.types import LiteralParameter, Predicate, TermParameter
+
+# instructions loading a local variable
+_LOAD_FAST = frozenset({"LOAD_FAST", "LOAD_FAST_CHECK", "LOAD_FAST_BORROW"})
+# instructions subscripting a value
+_SUBSCRIPT = frozenset({"BINARY_SUBSCR", "BINARY_OP"})
+
+
+def introspect_dependencies(function: Callable[..., Any]) -> frozenset[str] | None:
+    """Names of variables a function reads from the substitution (its first argument) by constant keys,
+    e.g. `{"x", "y"}` for `lambda vs: vs["x"] < vs.get("y")`.
+    Returns None if the function uses the substitution otherwise, or if it is not a plain function
+    (e.g. a bound method or a `functools.partial` object, whose first parameter is bound)."""
+
+    if not isinstance(function, FunctionType):
+        return None
+    code = function.__code__
+    if code.co_argcount < 1 or len(function.__defaults__ or ()) >= code.co_argcount:
+        return None
+    name = code.co_varnames[0]
+    if name in code.co_cellvars:
+        # the substitution is used by a nested function
+        return None
+    instructions = list(dis.get_instructions(code))
+    dependencies: set[str] = set()
+    for index, instruction in enumerate(instructions):
+        if instruction.opname in _LOAD_FAST and instruction.argval == name:
+            following = instructions[index + 1 : index + 3]
+            if len(following) < 2:
+                return None
+            first, second = following
+            if (
+                first.opname == "LOAD_CONST"
+                and isinstance(first.argval, str)
+                and second.opname in _SUBSCRIPT
+                and (second.opname == "BINARY_SUBSCR" or "[" in second.argrepr)
+            ):
+                dependencies.add(first.argval)
+            elif (
+                first.opname in {"LOAD_ATTR", "LOAD_METHOD"}
+                and first.argval == "get"
+                and second.opname == "LOAD_CONST"
+                and isinstance(second.argval, str)
+            ):
+                dependencies.add(second.argval)
+            else:
+                return None
+        elif instruction.opname != "LOAD_CONST" and (
+            instruction.argval == name or (isinstance(instruction.argval, tuple) and name in instruction.argval)
+        ):
+            # the substitution is stored, deleted, or loaded by a combined instruction
+            return None
+    return frozenset(dependencies)
+
+
+def _dependencies(
+    function: Callable[..., Any], declared: frozenset[str] | None, earlier: Sequence[str]
+) -> frozenset[str]:
+    """Literal parameters a function depends on (all earlier literal parameters, if unknown)."""
+
+    dependencies = declared if declared is not None else introspect_dependencies(function)
+    if dependencies is None:
+        return frozenset(earlier)
+    return dependencies.intersection(earlier)
+
+
+def plan_prefix(
+    prefix: Iterable[LiteralParameter | TermParameter | Predicate],
+    group_sizes: Mapping[str, float],
+    bound: Container[str] = (),
+    restricted: Container[str] = (),
+) -> list[LiteralParameter | Predicate]:
+    """Evaluation order of the literal parameters and literal predicates of a prefix.
+
+    Among the literal parameters, whose dependencies are bound, the next parameter is chosen by the estimated
+    number of its values: bound parameters, then parameters with restricted or computed values,
+    then parameters of groups (preferring parameters many predicates and parameters depend on,
+    and then small groups). Ties are broken by the order in the prefix.
+    Each predicate follows the last parameter it depends on. A vectorized predicate follows
+    the last literal parameter before it in the prefix, which is evaluated after its other dependencies."""
+
+    parameters: list[LiteralParameter] = []
+    predicates: list[tuple[Predicate, frozenset[str]]] = []
+    dependencies: dict[str, set[str]] = {}
+    for item in prefix:
+        earlier = [parameter.name for parameter in parameters]
+        if isinstance(item, LiteralParameter):
+            parameters.append(item)
+            dependencies[item.name] = set() if item.values is None else set(_dependencies(item.values, None, earlier))
+        elif isinstance(item, Predicate) and item.only_literals:
+            predicate_dependencies = _dependencies(item.constraint, item.dependencies, earlier)
+            if item.vectorized and parameters:
+                # the values of the last parameter are passed as an array
+                batch = parameters[-1].name
+                dependencies[batch].update(predicate_dependencies - {batch})
+                predicate_dependencies |= {batch}
+            predicates.append((item, predicate_dependencies))
+
+    # number of predicates and parameters depending on a parameter
+    dependents = {
+        parameter.name: sum(parameter.name in deps for _, deps in predicates)
+        + sum(parameter.name in deps for deps in dependencies.values())
+        for parameter in parameters
+    }
+
+    def estimate(parameter: LiteralParameter) -> tuple[int, int, float]:
+        if parameter.name in bound:
+            return (0, 0, 1)
+        if parameter.name in restricted or parameter.values is not None:
+            return (1, 0, 1)
+        return (2, -dependents[parameter.name], group_sizes.get(parameter.group, math.inf))
+
+    plan: list[LiteralParameter | Predicate] = []
+    placed: set[str] = set()
+    # predicates without dependencies are evaluated first
+    pending = [(predicate, deps) for predicate, deps in predicates if deps]
+    plan.extend(predicate for predicate, deps in predicates if not deps)
+    remaining = list(parameters)
+    while remaining:
+        ready = [parameter for parameter in remaining if dependencies[parameter.name] <= placed]
+        parameter = min(ready, key=estimate)
+        remaining.remove(parameter)
+        plan.append(parameter)
+        placed.add(parameter.name)
+        plan.extend(predicate for predicate, deps in pending if deps <= placed)
+        pending = [(predicate, deps) for predicate, deps in pending if not deps <= placed]
+    return plan
@@ -3,14 +3,20 @@
 from __future__ import annotations
 
 from collections import defaultdict, deque
-from collections.abc import Callable, Generator, Hashable, Iterable, Mapping, Sequence
+from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
 from dataclasses import dataclass
 from itertools import product
+from os import PathLike
 from queue import PriorityQueue
 from types import FunctionType
-from typing import Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
+from cosy.cache import typed_key
 from cosy.tree import Tree
+from cosy.types import Attribute, Predicate
+
+if TYPE_CHECKING:
+    from cosy.frozen_solution_space import FrozenSolutionSpace
 
 NT = TypeVar("NT", bound=Hashable)  # type of non-terminals
 T = TypeVar("T", bound=Hashable)  # type of terminals
@@ -38,6 +44,7 @@ class RHSRule(Generic[NT, T, G]):
     arguments: tuple[Argument, ...]
     predicates: tuple[Callable[[dict[str, Any]], bool], ...]
     terminal: T
+    attributes: tuple[Attribute, ...] = ()
 
     @property
     def non_terminals(self) -> frozenset[NT]:
@@ -49,6 +56,46 @@ class RHSRule(Generic[NT, T, G]):
         return {n.name: n.value for n in self.arguments if isinstance(n, ConstantArgument)}
 
 
+@dataclass
+class EnumerationStatistics:
+    """Statistics of observational equivalence pruning during enumeration."""
+
+    observed: int = 0
+    pruned: int = 0
+
+    @property
+    def pruning_ratio(self) -> float:
+        """Fraction of observed terms, which were pruned."""
+        return self.pruned / self.observed if self.observed > 0 else 0.0
+
+
+@dataclass
+class MinimizationStatistics:
+    """Statistics of solution space minimization (see `SolutionSpace.minimize`)."""
+
+    nonterminals_before: int = 0
+    nonterminals_after: int = 0
+    rules_before: int = 0
+    rules_after: int = 0
+    duplicate_rules: int = 0
+    unreachable_nonterminals: int = 0
+    merged_nonterminals: int = 0
+    refinement_rounds: int = 0
+
+    @property
+    def reduction(self) -> float:
+        """Fraction of rules, which were removed."""
+        return 1 - self.rules_after / self.rules_before if self.rules_before > 0 else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"non-terminals: {self.nonterminals_before} -> {self.nonterminals_after}, "
+            f"rules: {self.rules_before} -> {self.rules_after} ({self.reduction:.1%} removed; "
+            f"{self.duplicate_rules} duplicate rules, {self.unreachable_nonterminals} unreachable "
+            f"and {self.merged_nonterminals} merged non-terminals, {self.refinement_rounds} refinement rounds)"
+        )
+
+
 class SolutionSpace(Generic[NT, T, G]):
     _rules: defaultdict[NT, deque[RHSRule[NT, T, G]]]
 
@@ -69,33 +116,91 @@ class SolutionSpace(Generic[NT, T, G]):
     def as_tuples(self) -> Iterable[tuple[NT, deque[RHSRule[NT, T, G]]]]:
         return self._rules.items()
 
+    def check_modifiable(self) -> None:
+        """Raise a ValueError if rules cannot be added to or removed from the solution space."""
+
     def add_rule(
         self,
         nonterminal: NT,
         terminal: T,
         arguments: tuple[Argument, ...],
         predicates: tuple[Callable[[dict[str, Any]], bool], ...],
+        attributes: tuple[Attribute, ...] = (),
     ) -> None:
-        self._rules[nonterminal].append(RHSRule(arguments, predicates, terminal))
+        self._rules[nonterminal].append(RHSRule(arguments, predicates, terminal, attributes))
+
+    def remove_rules(self, condition: Callable[[NT, RHSRule[NT, T, G]], bool]) -> set[NT]:
+        """Remove the rules satisfying the condition (for their non-terminal).
+        Returns the non-terminals, whose rules changed."""
+
+        changed: set[NT] = set()
+        for nonterminal, rules in list(self._rules.items()):
+            kept = deque(rule for rule in rules if not condition(nonterminal, rule))
+            if len(kept) < len(rules):
+                changed.add(nonterminal)
+                if kept:
+                    self._rules[nonterminal] = kept
+                else:
+                    del self._rules[nonterminal]
+        return changed
+
+    def add_rules(self, rules: Iterable[tuple[NT, RHSRule[NT, T, G]]]) -> None:
+        """Add rules given as pairs of non-terminals and right-hand sides (e.g. `construct_solution_space_rules`)."""
+
+        for nonterminal, rule in rules:
+            self.add_rule(nonterminal, rule.terminal, rule.arguments, rule.predicates, rule.attributes)
+
+    def freeze(self) -> FrozenSolutionSpace[NT, T, G]:
+        """Compact, immutable representation of the solution space, where rules are stored in flat arrays."""
+
+        from cosy.frozen_solution_space import FrozenSolutionSpace
+
+        return FrozenSolutionSpace(self.as_tuples())
+
+    def save(self, path: str | PathLike[str], registry: Mapping[str, Callable[..., Any]] | None = None) -> None:
+        """Write the frozen solution space to a file in a compact binary format.
+
+        Rules are stored as arrays of integer ids, followed by the pickled tables of non-terminals, terminals,
+        constants, predicates and attributes. Functions, which cannot be pickled (e.g. lambdas),
+        are stored by their names in `registry`."""
+
+        from cosy.frozen_solution_space import save
+
+        save(self.freeze(), path, registry)
+
+    @staticmethod
+    def load(
+        path: str | PathLike[str], registry: Mapping[str, Callable[..., Any]] | None = None
+    ) -> FrozenSolutionSpace[Any, Any, Any]:
+        """Read a solution space written by `save`, where `registry` maps names to functions.
+
+        The file is memory-mapped read-only and rules are decoded on access,
+        so processes loading the same file share its arrays instead of deserializing them.
+        The tables of values (non-terminals, terminals, constants, names, predicates and attributes)
+        are not shared: each process unpickles them completely when loading.
+        Unpickling can execute arbitrary code, so it must only be used on trusted files."""
+
+        from cosy.frozen_solution_space import load
+
+        return load(path, registry)
 
     def show(self) -> str:
-        return "\n".join(
-            f"{nt!s} ~> {' | '.join([str(subrule) for subrule in rule])}" for nt, rule in self._rules.items()
-        )
+        return "\n".join(f"{nt!s} ~> {' | '.join([str(subrule) for subrule in rule])}" for nt, rule in self.as_tuples())
 
-    def prune(self) -> SolutionSpace[NT, T, G]:
-        """Keep only productive rules."""
+    @staticmethod
+    def _productive(rules: Iterable[tuple[NT, Iterable[RHSRule[NT, T, G]]]], ground_types: set[NT]) -> set[NT]:
+        """Extend the set of productive non-terminals `ground_types` by productive heads of the given rules."""
 
-        ground_types: set[NT] = set()
+        ground_types = set(ground_types)
         queue: set[NT] = set()
         inverse_grammar: dict[NT, set[tuple[NT, frozenset[NT]]]] = defaultdict(set)
 
-        for n, exprs in self._rules.items():
+        for n, exprs in rules:
             for expr in exprs:
                 non_terminals = expr.non_terminals
                 for m in non_terminals:
                     inverse_grammar[m].add((n, non_terminals))
-                if not non_terminals:
+                if all(m in ground_types for m in non_terminals):
                     queue.add(n)
 
         while queue:
@@ -105,6 +210,12 @@ class SolutionSpace(Generic[NT, T, G]):
                 for m, non_terminals in inverse_grammar[n]:
                     if m not in ground_types and all(t in ground_types for t in non_terminals):
                         queue.add(m)
+        return ground_types
+
+    def prune(self) -> SolutionSpace[NT, T, G]:
+        """Keep only productive rules."""
+
+        ground_types = self._productive(self.as_tuples(), set())
 
         return SolutionSpace[NT, T, G](
             defaultdict(
@@ -112,7 +223,7 @@ class SolutionSpace(Generic[NT, T, G]):
                 {
                     target: deque(
                         possibility
-                        for possibility in self._rules[target]
+                        for possibility in self[target]
                         if all(t in ground_types for t in possibility.non_terminals)
                     )
                     for target in ground_types
@@ -120,24 +231,204 @@ class SolutionSpace(Generic[NT, T, G]):
             )
         )
 
-    def _enumerate_tree_vectors(
-        self,
+    def reprune(self, pruned: SolutionSpace[NT, T, G], changed: Iterable[NT]) -> SolutionSpace[NT, T, G]:
+        """Keep only productive rules after the rules of the `changed` non-terminals were modified,
+        where `pruned` is the result of `prune` before the modification.
+
+        Only non-terminals, which (transitively) depend on changed non-terminals, are examined again.
+        The rules of the remaining productive non-terminals are taken from `pruned`."""
+
+        # heads of rules using each non-terminal
+        users: dict[NT, set[NT]] = defaultdict(set)
+        for n, exprs in self.as_tuples():
+            for expr in exprs:
+                for m in expr.non_terminals:
+                    users[m].add(n)
+        affected = set(changed)
+        stack = list(affected)
+        while stack:
+            for n in users[stack.pop()]:
+                if n not in affected:
+                    affected.add(n)
+                    stack.append(n)
+
+        unaffected = {n for n in pruned.nonterminals() if n not in affected}
+        ground_types = self._productive(((n, self.get(n) or ()) for n in affected), unaffected)
+
+        return SolutionSpace[NT, T, G](
+            defaultdict(
+                deque,
+                {
+                    target: deque(pruned[target])
+                    if target in unaffected
+                    else deque(
+                        possibility
+                        for possibility in self[target]
+                        if all(t in ground_types for t in possibility.non_terminals)
+                    )
+                    for target in ground_types
+                },
+            )
+        )
+
+    def minimize(
+        self, keep: Iterable[NT] | None = None, statistics: MinimizationStatistics | None = None
+    ) -> SolutionSpace[NT, T, G]:
+        """Solution space deriving the same trees with fewer non-terminals and rules.
+
+        Duplicate rules are removed. Non-terminals, whose rules coincide up to equivalent non-terminals
+        in their bodies, derive the same trees. They are found by partition refinement
+        and merged into one representative non-terminal.
+        Non-terminals in `keep` (e.g. start symbols of enumeration) are preserved. If `keep` is given,
+        non-terminals, which are not reachable from them, are removed.
+        The numbers of removed rules and non-terminals are reported in `statistics` (if given)."""
+
+        if statistics is None:
+            statistics = MinimizationStatistics()
+
+        # terminals and constants are compared with their types (as in `freeze`), e.g. `1` is not `True`
+        def argument_key(argument: Argument) -> Hashable:
+            if isinstance(argument, ConstantArgument):
+                return (argument.name, typed_key(argument.value), argument.origin)
+            return argument
+
+        def unique(rhss: Iterable[RHSRule[NT, T, G]]) -> list[RHSRule[NT, T, G]]:
+            keys: dict[Hashable, RHSRule[NT, T, G]] = {}
+            for rhs in rhss:
+                key = (typed_key(rhs.terminal), tuple(map(argument_key, rhs.arguments)), rhs.predicates, rhs.attributes)
+                keys.setdefault(key, rhs)
+            return list(keys.values())
+
+        rules: dict[NT, list[RHSRule[NT, T, G]]] = {}
+        for nt, exprs in self.as_tuples():
+            statistics.nonterminals_before += 1
+            statistics.rules_before += len(exprs)
+            rules[nt] = unique(exprs)
+            statistics.duplicate_rules += len(exprs) - len(rules[nt])
+
+        kept: list[NT] = [] if keep is None else [nt for nt in keep if nt in rules]
+        if keep is not None:
+            reachable: set[NT] = set(kept)
+            stack = list(kept)
+            while stack:
+                for rhs in rules[stack.pop()]:
+                    for m in rhs.non_terminals:
+                        if m in rules and m not in reachable:
+                            reachable.add(m)
+                            stack.append(m)
+            statistics.unreachable_nonterminals = len(rules) - len(reachable)
+            rules = {nt: rhss for nt, rhss in rules.items() if nt in reachable}
+
+        # partition of non-terminals into blocks, refined by the rules up to blocks of non-terminals in their bodies
+        # non-terminals without rules are not part of the partition
+        block: dict[NT, int] = dict.fromkeys(rules, 0)
+        block_count = 1 if rules else 0
+
+        def signature(rhs: RHSRule[NT, T, G]) -> Hashable:
+            arguments = tuple(
+                (argument.name, block[argument.origin])
+                if isinstance(argument, NonTerminalArgument) and argument.origin in block
+                else argument_key(argument)
+                for argument in rhs.arguments
+            )
+            return (typed_key(rhs.terminal), arguments, rhs.predicates, rhs.attributes)
+
+        while True:
+            statistics.refinement_rounds += 1
+            blocks: dict[Hashable, int] = {}
+            refined = {
+                nt: blocks.setdefault((block[nt], frozenset(map(signature, rhss))), len(blocks))
+                for nt, rhss in rules.items()
+            }
+            if len(blocks) == block_count:
+                break
+            block, block_count = refined, len(blocks)
+
+        # kept non-terminals are preferred as representatives
+        representatives: dict[int, NT] = {}
+        for nt in (*kept, *rules):
+            representatives.setdefault(block[nt], nt)
+        preserved = set(kept)
+
+        def rename(argument: Argument) -> Argument:
+            if isinstance(argument, NonTerminalArgument) and argument.origin in block:
+                return NonTerminalArgument(argument.name, representatives[block[argument.origin]])
+            return argument
+
+        minimized: SolutionSpace[NT, T, G] = SolutionSpace()
+        for nt, rhss in rules.items():
+            if nt in preserved or representatives[block[nt]] == nt:
+                minimized[nt].extend(
+                    unique(
+                        RHSRule(tuple(map(rename, rhs.arguments)), rhs.predicates, rhs.terminal, rhs.attributes)
+                        for rhs in rhss
+                    )
+                )
+                statistics.nonterminals_after += 1
+                statistics.rules_after += len(minimized[nt])
+        statistics.merged_nonterminals = len(rules) - statistics.nonterminals_after
+        return minimized
+
+    @staticmethod
+    def _candidate_lists(
         non_terminals: Sequence[NT | None],
         existing_terms: Mapping[NT, set[Tree[T]]],
         nt_term: tuple[NT, Tree[T]] | None = None,
-    ) -> Iterable[tuple[Tree[T] | None, ...]]:
-        """Enumerate possible term vectors for a given list of non-terminals and existing terms. Use nt_term at least once (if given)."""
+    ) -> Iterable[list[tuple[Tree[T] | None, ...]]]:
+        """Enumerate lists of candidate terms for each position. Use nt_term at least once (if given)."""
         if nt_term is None:
-            yield from product(*([n] if n is None else existing_terms[n] for n in non_terminals))
+            yield [(None,) if n is None else tuple(existing_terms[n]) for n in non_terminals]
         else:
             nt, term = nt_term
             for i, n in enumerate(non_terminals):
                 if n == nt:
-                    arg_lists: Iterable[Iterable[Tree[T] | None]] = (
-                        [None] if m is None else [term] if i == j else existing_terms[m]
+                    yield [
+                        (None,) if m is None else (term,) if i == j else tuple(existing_terms[m])
                         for j, m in enumerate(non_terminals)
-                    )
-                    yield from product(*arg_lists)
+                    ]
+
+    def _enumerate_tree_vectors(
+        self,
+        non_terminals: Sequence[NT | None],
+        existing_terms: Mapping[NT, set[Tree[T]]],
+        nt_term: tuple[NT, Tree[T]] | None = None,
+    ) -> Iterable[tuple[Tree[T] | None, ...]]:
+        """Enumerate possible term vectors for a given list of non-terminals and existing terms. Use nt_term at least once (if given)."""
+        for candidate_lists in self._candidate_lists(non_terminals, existing_terms, nt_term):
+            yield from product(*candidate_lists)
+
+    @staticmethod
+    def _predicate_schedule(
+        rule: RHSRule[NT, T, G],
+    ) -> list[list[Callable[[dict[str, Any]], bool]]]:
+        """Assign each predicate of the rule to the earliest position, at which its dependencies are bound.
+
+        Position 0 is before any argument is chosen, position i + 1 is after the i-th argument is chosen.
+        Predicates without declared dependencies are checked after all arguments are chosen."""
+
+        schedule: list[list[Callable[[dict[str, Any]], bool]]] = [[] for _ in range(len(rule.arguments) + 1)]
+        pending: deque[tuple[frozenset[str], Callable[[dict[str, Any]], bool]]] = deque()
+        for predicate in rule.predicates:
+            if isinstance(predicate, Predicate) and predicate.dependencies is not None:
+                pending.append((predicate.dependencies, predicate))
+            else:
+                schedule[-1].append(predicate)
+
+        bound: set[str] = {a.name for a in rule.arguments if isinstance(a, ConstantArgument)}
+        for position in range(len(rule.arguments) + 1):
+            if position > 0:
+                argument = rule.arguments[position - 1]
+                if isinstance(argument, NonTerminalArgument) and argument.name is not None:
+                    bound.add(argument.name)
+            for _ in range(len(pending)):
+                dependencies, predicate = pending.popleft()
+                if dependencies.issubset(bound):
+                    schedule[position].append(predicate)
+                else:
+                    pending.append((dependencies, predicate))
+        # dependencies which are never bound are reported by the predicate itself
+        schedule[-1].extend(predicate for _, predicate in pending)
+        return schedule
 
     def _generate_new_trees(
         self,
@@ -160,6 +451,8 @@ class SolutionSpace(Generic[NT, T, G]):
             a.origin if isinstance(a, NonTerminalArgument) and a.name is None else None for a in rule.arguments
         ]
         literal_arguments = [Tree(a.value, ()) if isinstance(a, ConstantArgument) else None for a in rule.arguments]
+        literal_substitution = rule.literal_substitution
+        schedule = self._predicate_schedule(rule)
 
         def interleave(
             parameters: Sequence[Tree[T] | None],
@@ -181,43 +474,55 @@ class SolutionSpace(Generic[NT, T, G]):
         def construct_tree(
             rule: RHSRule[NT, T, G],
             parameters: Sequence[Tree[T] | None],
+            substitution: dict[str, Any],
             literal_arguments: Sequence[Tree[T] | None],
             arguments: Sequence[Tree[T] | None],
         ) -> Tree[T]:
             """Construct a new tree from the rule and the given specific arguments."""
+            attributes = {attribute.name: attribute.function(substitution) for attribute in rule.attributes}
             return Tree(
                 rule.terminal,
                 tuple(interleave(parameters, literal_arguments, arguments)),
+                attributes,
             )
 
-        def specific_substitution(parameters):
-            return {
-                a.name: p
-                for p, a in zip(parameters, rule.arguments, strict=True)
-                if isinstance(a, NonTerminalArgument) and a.name is not None
-            } | rule.literal_substitution
+        def extend_parameters(
+            candidate_lists: list[tuple[Tree[T] | None, ...]],
+            index: int,
+            parameters: tuple[Tree[T] | None, ...],
+            substitution: dict[str, Any],
+        ) -> Iterable[tuple[tuple[Tree[T] | None, ...], dict[str, Any]]]:
+            """Extend a valid prefix of parameters, checking each predicate as soon as possible."""
+            if index == len(candidate_lists):
+                yield parameters, substitution
+                return
+            name = rule.arguments[index].name
+            for candidate in candidate_lists[index]:
+                extended = substitution if candidate is None or name is None else {**substitution, name: candidate}
+                if all(predicate(extended) for predicate in schedule[index + 1]):
+                    yield from extend_parameters(candidate_lists, index + 1, (*parameters, candidate), extended)
 
         def valid_parameters(
             nt_term: tuple[NT, Tree[T]] | None,
-        ) -> Iterable[tuple[Tree[T] | None, ...]]:
-            """Enumerate all valid parameters for the rule."""
-            for parameters in self._enumerate_tree_vectors(named_non_terminals, existing_terms, nt_term):
-                substitution = specific_substitution(parameters)
-                if all(predicate(substitution) for predicate in rule.predicates):
-                    yield parameters
-
-        for parameters in valid_parameters(nt_old_term):
+        ) -> Iterable[tuple[tuple[Tree[T] | None, ...], dict[str, Any]]]:
+            """Enumerate all valid parameters for the rule together with the corresponding substitution."""
+            if not all(predicate(literal_substitution) for predicate in schedule[0]):
+                return
+            for candidate_lists in self._candidate_lists(named_non_terminals, existing_terms, nt_term):
+                yield from extend_parameters(candidate_lists, 0, (), literal_substitution)
+
+        for parameters, substitution in valid_parameters(nt_old_term):
             for arguments in self._enumerate_tree_vectors(unnamed_non_terminals, existing_terms):
-                output_set.add(construct_tree(rule, parameters, literal_arguments, arguments))
+                output_set.add(construct_tree(rule, parameters, substitution, literal_arguments, arguments))
                 if max_count is not None and len(output_set) >= max_count:
                     return output_set
 
         if nt_old_term is not None:
-            all_parameters: deque[tuple[Tree[T] | None, ...]] | None = None
+            all_parameters: deque[tuple[tuple[Tree[T] | None, ...], dict[str, Any]]] | None = None
             for arguments in self._enumerate_tree_vectors(unnamed_non_terminals, existing_terms):
                 all_parameters = all_parameters if all_parameters is not None else deque(valid_parameters(None))
-                for parameters in all_parameters:
-                    output_set.add(construct_tree(rule, parameters, literal_arguments, arguments))
+                for parameters, substitution in all_parameters:
+                    output_set.add(construct_tree(rule, parameters, substitution, literal_arguments, arguments))
                     if max_count is not None and len(output_set) >= max_count:
                         return output_set
         return output_set
@@ -227,26 +532,51 @@ class SolutionSpace(Generic[NT, T, G]):
         start: NT,
         max_count: int | None = None,
         max_bucket_size: int | None = None,
+        equivalence: Mapping[NT, Callable[[Tree[T]], Hashable]] | None = None,
+        statistics: EnumerationStatistics | None = None,
     ) -> Iterable[Tree[T]]:
         """
         Enumerate terms as an iterator efficiently - all terms are enumerated, no guaranteed term order.
+
+        Optionally, `equivalence` maps selected non-terminals to a fingerprint function (e.g. an interpretation).
+        For these non-terminals, only one representative term per observed fingerprint is kept,
+        and terms with an already observed fingerprint are neither yielded nor used to construct larger terms.
+        The numbers of observed and pruned terms are reported in `statistics` (if given).
         """
         if start not in self.nonterminals():
             return
 
+        if statistics is None:
+            statistics = EnumerationStatistics()
+        representatives: dict[NT, dict[Hashable, Tree[T]]] = defaultdict(dict)
+        decisions: dict[NT, dict[Tree[T], bool]] = defaultdict(dict)
+
+        def is_representative(n: NT, term: Tree[T]) -> bool:
+            """Decide (once per term) whether the term represents its observed fingerprint for `n`."""
+            if equivalence is None or n not in equivalence:
+                return True
+            decided = decisions[n]
+            if term not in decided:
+                representative = representatives[n].setdefault(equivalence[n](term), term)
+                decided[term] = representative == term
+                statistics.observed += 1
+                if not decided[term]:
+                    statistics.pruned += 1
+            return decided[term]
+
         queues: dict[NT, PriorityQueue[Tree[T]]] = {n: PriorityQueue() for n in self.nonterminals()}
         existing_terms: dict[NT, set[Tree[T]]] = {n: set() for n in self.nonterminals()}
         inverse_grammar: dict[NT, deque[tuple[NT, RHSRule[NT, T, G]]]] = {n: deque() for n in self.nonterminals()}
         all_results: set[Tree[T]] = set()
 
-        for n, exprs in self._rules.items():
+        for n, exprs in self.as_tuples():
             for expr in exprs:
                 if all(m in self.nonterminals() for m in expr.non_terminals):
                     for m in expr.non_terminals:
                         inverse_grammar[m].append((n, expr))
                     for new_term in self._generate_new_trees(expr, existing_terms):
                         queues[n].put(new_term)
-                        if n == start and new_term not in all_results:
+                        if n == start and new_term not in all_results and is_representative(start, new_term):
                             if max_count is not None and len(all_results) >= max_count:
                                 return
                             yield new_term
@@ -264,7 +594,7 @@ class SolutionSpace(Generic[NT, T, G]):
                 results = existing_terms[n]
                 while len(results) < current_bucket_size and not queues[n].empty():
                     term = queues[n].get()
-                    if term in results:
+                    if term in results or not is_representative(n, term):
                         continue
                     results.add(term)
                     for m, expr in inverse_grammar[n]:
@@ -272,7 +602,7 @@ class SolutionSpace(Generic[NT, T, G]):
                             non_terminals.add(m)
                         if m == start:
                             for new_term in self._generate_new_trees(expr, existing_terms, max_count, (n, term)):
-                                if new_term not in all_results:
+                                if new_term not in all_results and is_representative(start, new_term):
                                     if max_count is not None and len(all_results) >= max_count:
                                         return
                                     yield new_term
@@ -285,17 +615,19 @@ class SolutionSpace(Generic[NT, T, G]):
         return
 
     def contains_tree(self, start: NT, tree: Tree[T]) -> bool:
-        """Check if the solution space contains a given `tree` derivable from `start`."""
+        """Check if the solution space contains a given `tree` derivable from `start`.
+
+        Attributes of `tree` and its subtrees are computed bottom-up (as during enumeration),
+        before predicates which may depend on them are checked."""
         if start not in self.nonterminals():
             return False
 
         stack: deque[tuple | Callable] = deque([(start, tree)])
         results: deque[bool] = deque()
 
-        def get_inputs(count: int) -> Generator[bool]:
-            for _ in range(count):
-                yield results.pop()
-            return
+        def get_inputs(count: int) -> list[bool]:
+            # all inputs are removed, even if the result is decided by a prefix
+            return [results.pop() for _ in range(count)]
 
         while stack:
             task = stack.pop()
@@ -303,7 +635,7 @@ class SolutionSpace(Generic[NT, T, G]):
                 nt, tree = task
                 relevant_rhss = [
                     rhs
-                    for rhs in self._rules[nt]
+                    for rhs in self[nt]
                     if len(rhs.arguments) == len(tree.children)
                     and rhs.terminal == tree.root
                     and all(
@@ -314,9 +646,24 @@ class SolutionSpace(Generic[NT, T, G]):
                 ]
 
                 # if there is a relevant rule containing only TerminalArgument which are equal to the children of the tree
-                if any(
-                    all(isinstance(argument, ConstantArgument) for argument in rhs.arguments) for rhs in relevant_rhss
-                ):
+                constant_rhs = next(
+                    (
+                        rhs
+                        for rhs in relevant_rhss
+                        if all(isinstance(argument, ConstantArgument) for argument in rhs.arguments)
+                    ),
+                    None,
+                )
+                if constant_rhs is not None:
+                    if constant_rhs.attributes:
+                        constants = {
+                            argument.name: argument.value
+                            for argument in constant_rhs.arguments
+                            if isinstance(argument, ConstantArgument) and argument.name is not None
+                        }
+                        tree.attributes = {
+                            attribute.name: attribute.function(constants) for attribute in constant_rhs.attributes
+                        }
                     results.append(True)
                     continue
 
@@ -337,11 +684,15 @@ class SolutionSpace(Generic[NT, T, G]):
                     def and_inputs(
                         count: int = sum(1 for argument in rhs.arguments if isinstance(argument, NonTerminalArgument)),
                         substitution: dict[str, Any] = substitution,
-                        predicates=rhs.predicates,
+                        rhs: RHSRule[NT, T, G] = rhs,
+                        tree: Tree[T] = tree,
                     ) -> None:
-                        results.append(
-                            all(get_inputs(count)) and all(predicate(substitution) for predicate in predicates)
-                        )
+                        result = all(get_inputs(count)) and all(predicate(substitution) for predicate in rhs.predicates)
+                        if result and rhs.attributes:
+                            tree.attributes = {
+                                attribute.name: attribute.function(substitution) for attribute in rhs.attributes
+                            }
+                        results.append(result)
 
                     stack.append(and_inputs)
                     for argument, child in zip(rhs.arguments, tree.children, strict=True):
@@ -0,0 +1,370 @@
+"""Solution space stored in an SQLite database (see `SQLiteSolutionSpace`).
+
+Values (non-terminals, terminals, constants, argument names, predicates and attributes) are pickled
+into the table `symbols`, where functions, which cannot be pickled by reference, are stored by their names
+in a registry (as in `SolutionSpace.save`). Rules and their arguments refer to symbols by their ids:
+- `rules(id, head, terminal, predicates, attributes)`, indexed by `head`
+- `arguments(rule, position, name, nonterminal, constant)`, indexed by `rule` and by `nonterminal`
+
+Rules are added in batched transactions and read by indexed queries for one non-terminal at a time.
+Symbols are found by their hashes in the temporary table `symbol_hashes`, which is indexed by `hash`
+(hashes of values differ between processes, so they are recomputed when an existing database is opened).
+Decoded symbols and the ids of recently used symbols are kept in bounded caches."""
+
+from __future__ import annotations
+
+import sqlite3
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+from io import BytesIO
+from itertools import groupby
+from os import PathLike
+from typing import Any
+
+from cosy.cache import Cache, CacheInfo, typed_key
+from cosy.frozen_solution_space import _Pickler, _Unpickler
+from cosy.solution_space import (
+    NT,
+    Argument,
+    ConstantArgument,
+    EnumerationStatistics,
+    G,
+    NonTerminalArgument,
+    RHSRule,
+    SolutionSpace,
+    T,
+)
+from cosy.tree import Tree
+from cosy.types import Attribute
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS symbols (id INTEGER PRIMARY KEY, value BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS rules (
+    id INTEGER PRIMARY KEY, head INTEGER NOT NULL, terminal INTEGER NOT NULL,
+    predicates INTEGER NOT NULL, attributes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rules_head ON rules (head);
+CREATE TABLE IF NOT EXISTS arguments (
+    rule INTEGER NOT NULL, position INTEGER NOT NULL, name INTEGER NOT NULL,
+    nonterminal INTEGER, constant INTEGER, PRIMARY KEY (rule, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS arguments_nonterminal ON arguments (nonterminal) WHERE nonterminal IS NOT NULL;
+CREATE TEMP TABLE symbol_hashes (id INTEGER PRIMARY KEY, hash INTEGER NOT NULL);
+CREATE INDEX temp.symbol_hashes_hash ON symbol_hashes (hash);
+"""
+
+
+class _NonTerminals(Iterable[NT]):
+    """Non-terminals with rules, whose membership is tested by an indexed query."""
+
+    def __init__(self, solution_space: SQLiteSolutionSpace[NT, Any, Any]) -> None:
+        self._solution_space = solution_space
+
+    def __contains__(self, nonterminal: object) -> bool:
+        return self._solution_space._head_id(nonterminal) is not None
+
+    def __iter__(self) -> Iterator[NT]:
+        solution_space = self._solution_space
+        solution_space._flush()
+        # in the order of their first rules
+        heads = solution_space._connection.execute("SELECT head FROM rules GROUP BY head ORDER BY MIN(id)")
+        return (solution_space._symbol(head) for (head,) in heads)
+
+    def __len__(self) -> int:
+        self._solution_space._flush()
+        return self._solution_space._connection.execute("SELECT COUNT(DISTINCT head) FROM rules").fetchone()[0]
+
+
+class SQLiteSolutionSpace(SolutionSpace[NT, T, G]):
+    """Solution space, whose rules are stored in an SQLite database (by default a temporary file).
+
+    Rules are read by indexed queries, so that `contains_tree` and `get` do not load the whole solution space,
+    and `prune` computes productive non-terminals in the database.
+    `enumerate_trees` loads the rules reachable from the start non-terminal into memory,
+    because enumeration keeps the rules using each non-terminal."""
+
+    def __init__(
+        self,
+        path: str | PathLike[str] = "",
+        registry: Mapping[str, Callable[..., Any]] | None = None,
+        batch_size: int = 10_000,
+        cache_size: int | None = 2**16,
+    ) -> None:
+        """:param path: The database file (existing rules are kept). An empty path is a temporary database.
+        :param registry: Names of functions, which cannot be pickled (e.g. lambdas in predicates).
+        :param batch_size: The number of rules added in one transaction.
+        :param cache_size: The maximal number of decoded symbols (and of ids of symbols) kept in memory."""
+
+        super().__init__()
+        self._registry = registry or {}
+        self._batch_size = batch_size
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+        self._pending: list[tuple[NT, RHSRule[NT, T, G]]] = []
+        self._symbol_cache: Cache[int, Any] = Cache(cache_size)
+        # ids of recently used symbols (by their types and values)
+        self._symbol_ids: Cache[Hashable, int] = Cache(cache_size)
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO symbol_hashes VALUES (?, ?)",
+                (
+                    (symbol_id, hash(self._loads(value)))
+                    for symbol_id, value in self._connection.execute("SELECT id, value FROM symbols")
+                ),
+            )
+        (self._next_symbol_id,) = self._connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM symbols").fetchone()
+
+    def _dumps(self, value: Any) -> bytes:
+        data = BytesIO()
+        _Pickler(data, self._registry).dump(value)
+        return data.getvalue()
+
+    def _loads(self, data: bytes) -> Any:
+        return _Unpickler(BytesIO(data), self._registry).load()
+
+    def _find_symbol(self, value: Any) -> int | None:
+        """Id of a stored symbol, which has the same type and value (if any)."""
+
+        key = typed_key(value)
+        for (symbol_id,) in self._connection.execute(
+            "SELECT id FROM symbol_hashes WHERE hash = ?", (hash(value),)
+        ).fetchall():
+            if typed_key(self._symbol(symbol_id)) == key:
+                return symbol_id
+        return None
+
+    def _symbol_id(self, value: Any) -> int:
+        def find_or_insert() -> int:
+            symbol_id = self._find_symbol(value)
+            if symbol_id is None:
+                symbol_id = self._next_symbol_id
+                self._connection.execute("INSERT INTO symbols VALUES (?, ?)", (symbol_id, self._dumps(value)))
+                self._connection.execute("INSERT INTO symbol_hashes VALUES (?, ?)", (symbol_id, hash(value)))
+                self._next_symbol_id += 1
+            return symbol_id
+
+        return self._symbol_ids.lookup(typed_key(value), find_or_insert)
+
+    def _symbol(self, symbol_id: int) -> Any:
+        def load() -> Any:
+            (value,) = self._connection.execute("SELECT value FROM symbols WHERE id = ?", (symbol_id,)).fetchone()
+            return self._loads(value)
+
+        return self._symbol_cache.lookup(symbol_id, load)
+
+    def _head_id(self, nonterminal: object) -> int | None:
+        """Id of a non-terminal with rules."""
+
+        self._flush()
+        symbol_id = self._find_symbol(nonterminal)
+        if symbol_id is None:
+            return None
+        cursor = self._connection.execute("SELECT 1 FROM rules WHERE head = ? LIMIT 1", (symbol_id,))
+        return symbol_id if cursor.fetchone() is not None else None
+
+    def symbol_cache_info(self) -> CacheInfo:
+        return self._symbol_cache.cache_info()
+
+    def add_rule(
+        self,
+        nonterminal: NT,
+        terminal: T,
+        arguments: tuple[Argument, ...],
+        predicates: tuple[Callable[[dict[str, Any]], bool], ...],
+        attributes: tuple[Attribute, ...] = (),
+    ) -> None:
+        self._pending.append((nonterminal, RHSRule(arguments, predicates, terminal, attributes)))
+        if len(self._pending) >= self._batch_size:
+            self._flush()
+
+    def add_rules(self, rules: Iterable[tuple[NT, RHSRule[NT, T, G]]]) -> None:
+        for nonterminal, rule in rules:
+            self.add_rule(nonterminal, rule.terminal, rule.arguments, rule.predicates, rule.attributes)
+        self._flush()
+
+    def _flush(self) -> None:
+        """Insert pending rules in one transaction."""
+
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        with self._connection:
+            (next_id,) = self._connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM rules").fetchone()
+            rule_rows: list[tuple[int, int, int, int, int]] = []
+            argument_rows: list[tuple[int, int, int, int | None, int | None]] = []
+            for rule_id, (nonterminal, rule) in enumerate(pending, start=next_id):
+                rule_rows.append(
+                    (
+                        rule_id,
+                        self._symbol_id(nonterminal),
+                        self._symbol_id(rule.terminal),
+                        self._symbol_id(rule.predicates),
+                        self._symbol_id(rule.attributes),
+                    )
+                )
+                for position, argument in enumerate(rule.arguments):
+                    if isinstance(argument, ConstantArgument):
+                        symbol_id = self._symbol_id((argument.value, argument.origin))
+                        argument_rows.append((rule_id, position, self._symbol_id(argument.name), None, symbol_id))
+                    else:
+                        symbol_id = self._symbol_id(argument.origin)
+                        argument_rows.append((rule_id, position, self._symbol_id(argument.name), symbol_id, None))
+            self._connection.executemany("INSERT INTO rules VALUES (?, ?, ?, ?, ?)", rule_rows)
+            self._connection.executemany("INSERT INTO arguments VALUES (?, ?, ?, ?, ?)", argument_rows)
+
+    def _decode_rules(self, head: int) -> Iterator[tuple[int, RHSRule[NT, T, G]]]:
+        """Ids and decoded rules of a non-terminal (given by its id)."""
+
+        rows = self._connection.execute(
+            "SELECT r.id, r.terminal, r.predicates, r.attributes, a.name, a.nonterminal, a.constant "
+            "FROM rules r LEFT JOIN arguments a ON a.rule = r.id WHERE r.head = ? ORDER BY r.id, a.position",
+            (head,),
+        ).fetchall()
+        for rule_id, group in groupby(rows, key=lambda row: row[0]):
+            arguments: list[Argument] = []
+            for _, terminal, predicates, attributes, name, nonterminal, constant in group:
+                if nonterminal is not None:
+                    arguments.append(NonTerminalArgument(self._symbol(name), self._symbol(nonterminal)))
+                elif constant is not None:
+                    value, origin = self._symbol(constant)
+                    arguments.append(ConstantArgument(self._symbol(name), value, origin))
+            yield (
+                rule_id,
+                RHSRule(tuple(arguments), self._symbol(predicates), self._symbol(terminal), self._symbol(attributes)),
+            )
+
+    def _rules_of(self, head: int) -> deque[RHSRule[NT, T, G]]:
+        return deque(rule for _, rule in self._decode_rules(head))
+
+    def get(self, nonterminal: NT) -> deque[RHSRule[NT, T, G]] | None:
+        head = self._head_id(nonterminal)
+        return None if head is None else self._rules_of(head)
+
+    def __getitem__(self, nonterminal: NT) -> deque[RHSRule[NT, T, G]]:
+        rules = self.get(nonterminal)
+        return deque() if rules is None else rules
+
+    def nonterminals(self) -> _NonTerminals[NT]:
+        return _NonTerminals(self)
+
+    def as_tuples(self) -> Iterable[tuple[NT, deque[RHSRule[NT, T, G]]]]:
+        self._flush()
+        heads = self._connection.execute("SELECT head FROM rules GROUP BY head ORDER BY MIN(id)").fetchall()
+        for (head,) in heads:
+            yield self._symbol(head), self._rules_of(head)
+
+    def remove_rules(self, condition: Callable[[NT, RHSRule[NT, T, G]], bool]) -> set[NT]:
+        self._flush()
+        changed: set[NT] = set()
+        heads = self._connection.execute("SELECT head FROM rules GROUP BY head ORDER BY MIN(id)").fetchall()
+        with self._connection:
+            for (head,) in heads:
+                nonterminal = self._symbol(head)
+                removed = [(rule_id,) for rule_id, rule in self._decode_rules(head) if condition(nonterminal, rule)]
+                if removed:
+                    changed.add(nonterminal)
+                    self._connection.executemany("DELETE FROM rules WHERE id = ?", removed)
+                    self._connection.executemany("DELETE FROM arguments WHERE rule = ?", removed)
+        return changed
+
+    @property
+    def rule_count(self) -> int:
+        self._flush()
+        return self._connection.execute("SELECT COUNT(*) FROM rules").fetchone()[0]
+
+    def close(self) -> None:
+        self._flush()
+        self._connection.close()
+
+    def prune(self) -> SQLiteSolutionSpace[NT, T, G]:
+        """Keep only productive rules (in a new temporary database).
+
+        Productive non-terminals are computed in the database, where each round marks the heads of rules
+        without missing non-terminals and decrements the counters of rules using them."""
+
+        self._flush()
+        connection = self._connection
+        with connection:
+            connection.executescript(
+                """
+                DROP TABLE IF EXISTS temp.missing;
+                DROP TABLE IF EXISTS temp.productive;
+                DROP TABLE IF EXISTS temp.frontier;
+                CREATE TEMP TABLE missing (rule INTEGER PRIMARY KEY, head INTEGER NOT NULL, count INTEGER NOT NULL);
+                INSERT INTO missing
+                    SELECT r.id, r.head, COUNT(DISTINCT a.nonterminal)
+                    FROM rules r LEFT JOIN arguments a ON a.rule = r.id GROUP BY r.id;
+                CREATE INDEX temp.missing_count ON missing (count, head);
+                CREATE TEMP TABLE productive (id INTEGER PRIMARY KEY);
+                CREATE TEMP TABLE frontier (id INTEGER PRIMARY KEY);
+                """
+            )
+            while True:
+                connection.execute("DELETE FROM frontier")
+                connection.execute(
+                    "INSERT INTO frontier SELECT DISTINCT head FROM missing "
+                    "WHERE count = 0 AND head NOT IN (SELECT id FROM productive)"
+                )
+                if connection.execute("SELECT COUNT(*) FROM frontier").fetchone()[0] == 0:
+                    break
+                connection.execute("INSERT INTO productive SELECT id FROM frontier")
+                # each rule counts each distinct non-terminal in its body once
+                connection.execute(
+                    "UPDATE missing SET count = count - ("
+                    "SELECT COUNT(DISTINCT a.nonterminal) FROM arguments a JOIN frontier f ON f.id = a.nonterminal "
+                    "WHERE a.rule = missing.rule"
+                    ") WHERE rule IN (SELECT a.rule FROM arguments a JOIN frontier f ON f.id = a.nonterminal)"
+                )
+
+        pruned: SQLiteSolutionSpace[NT, T, G] = SQLiteSolutionSpace(
+            registry=self._registry, batch_size=self._batch_size, cache_size=self._symbol_cache.maxsize
+        )
+        # symbols are copied with their ids
+        with pruned._connection:
+            pruned._connection.executemany(
+                "INSERT INTO symbols VALUES (?, ?)", connection.execute("SELECT id, value FROM symbols")
+            )
+            pruned._connection.executemany(
+                "INSERT INTO symbol_hashes VALUES (?, ?)", connection.execute("SELECT id, hash FROM symbol_hashes")
+            )
+            pruned._connection.executemany(
+                "INSERT INTO rules VALUES (?, ?, ?, ?, ?)",
+                connection.execute(
+                    "SELECT r.* FROM rules r JOIN missing m ON m.rule = r.id WHERE m.count = 0 ORDER BY r.id"
+                ),
+            )
+            pruned._connection.executemany(
+                "INSERT INTO arguments VALUES (?, ?, ?, ?, ?)",
+                connection.execute("SELECT a.* FROM arguments a JOIN missing m ON m.rule = a.rule WHERE m.count = 0"),
+            )
+        pruned._next_symbol_id = self._next_symbol_id
+        return pruned
+
+    def _reachable(self, start: NT) -> SolutionSpace[NT, T, G]:
+        """In-memory solution space of the rules reachable from `start`."""
+
+        solution_space: SolutionSpace[NT, T, G] = SolutionSpace()
+        stack = [start]
+        visited = {start}
+        while stack:
+            nonterminal = stack.pop()
+            rules = self.get(nonterminal)
+            if rules is None:
+                continue
+            solution_space[nonterminal].extend(rules)
+            for rule in rules:
+                for other in rule.non_terminals:
+                    if other not in visited:
+                        visited.add(other)
+                        stack.append(other)
+        return solution_space
+
+    def enumerate_trees(
+        self,
+        start: NT,
+        max_count: int | None = None,
+        max_bucket_size: int | None = None,
+        equivalence: Mapping[NT, Callable[[Tree[T]], Hashable]] | None = None,
+        statistics: EnumerationStatistics | None = None,
+    ) -> Iterable[Tree[T]]:
+        return self._reachable(start).enumerate_trees(start, max_count, max_bucket_size, equivalence, statistics)
@@ -3,8 +3,8 @@ This module provides a `Subtypes` class, which is used to check subtyping relati
 between types in the intersection type system.
 """
 
-from collections import deque
-from collections.abc import Mapping
+import warnings
+from collections.abc import Callable, Hashable, Iterable, Mapping
 from typing import Any
 
 from cosy.types import Arrow, Constructor, Intersection, Literal, Type, Var
@@ -12,68 +12,262 @@ from cosy.types import Arrow, Constructor, Intersection, Literal, Type, Var
 # a mapping from a concept to the set it its subconcepts
 Taxonomy = Mapping[str, set[str]]
 
+# decides subtype <= supertype for a fixed supertype, given a subtype, groups, and a substitution
+SubtypeChecker = Callable[[Type, Mapping[str, str], Mapping[str, Literal]], bool]
+
 
 class Subtypes:
     def __init__(self, taxonomy: Taxonomy):
-        self.taxonomy = self._transitive_closure(self._reflexive_closure(taxonomy))
+        # concepts are identified by integer ids
+        self._ids: dict[str, int] = {}
+        self._names: list[str] = []
+        # direct edges of the taxonomy between ids
+        self._edges: list[set[int]] = []
+        # reflexive-transitive closure, bit j of _closure[i] is set iff concept j is reachable from concept i
+        self._closure: list[int] = []
+        for name, names in taxonomy.items():
+            i = self._id(name)
+            self._edges[i].update(self._id(other) for other in names)
+        self._compute_closure(range(len(self._names)))
+        self._taxonomy: dict[str, set[str]] | None = None
+        self._subconcepts: dict[str, frozenset[str]] = {}
+        # callbacks, which are notified about concepts affected by taxonomy updates
+        self._listeners: list[Callable[[set[str]], None]] = []
+
+    def _id(self, name: str) -> int:
+        """Id of a concept, which is registered if necessary."""
+
+        i = self._ids.get(name)
+        if i is None:
+            i = len(self._names)
+            self._ids[name] = i
+            self._names.append(name)
+            self._edges.append(set())
+            self._closure.append(1 << i)
+        return i
+
+    def _compute_closure(self, nodes: Iterable[int]) -> None:
+        """Compute the closure of the given nodes from the closure of all other nodes.
+
+        Strongly connected components are computed by (iterative) Tarjan's algorithm,
+        which finishes each component after all components reachable from it."""
+
+        pending = set(nodes)
+        index: dict[int, int] = {}
+        lowlink: dict[int, int] = {}
+        component_stack: list[int] = []
+        on_stack: set[int] = set()
+        for root in sorted(pending):
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            component_stack.append(root)
+            on_stack.add(root)
+            call_stack = [(root, iter(self._edges[root]))]
+            while call_stack:
+                node, successors = call_stack[-1]
+                for successor in successors:
+                    if successor not in pending:
+                        continue
+                    if successor not in index:
+                        index[successor] = lowlink[successor] = len(index)
+                        component_stack.append(successor)
+                        on_stack.add(successor)
+                        call_stack.append((successor, iter(self._edges[successor])))
+                        break
+                    if successor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[successor])
+                else:
+                    call_stack.pop()
+                    if call_stack:
+                        parent = call_stack[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        # node is the root of a strongly connected component
+                        component: list[int] = []
+                        while True:
+                            member = component_stack.pop()
+                            on_stack.discard(member)
+                            pending.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        closure = 0
+                        for member in component:
+                            closure |= 1 << member
+                            for successor in self._edges[member]:
+                                closure |= self._closure[successor]
+                        for member in component:
+                            self._closure[member] = closure
+
+    def add_listener(self, listener: Callable[[set[str]], None]) -> None:
+        """Register a callback, which is called with the names of all concepts affected by a taxonomy update,
+        i.e. concepts whose superconcepts changed, and the gained or lost superconcepts."""
+
+        self._listeners.append(listener)
+
+    def add_edges(self, taxonomy: Taxonomy) -> None:
+        """Add the given edges (from concepts to their superconcepts) to the taxonomy."""
+
+        old_closure = self._closure.copy()
+        for name, names in taxonomy.items():
+            i = self._id(name)
+            for j in map(self._id, names):
+                if j in self._edges[i]:
+                    continue
+                self._edges[i].add(j)
+                # every concept reaching i reaches everything reachable from j
+                for k, closure in enumerate(self._closure):
+                    if (closure >> i) & 1:
+                        self._closure[k] = closure | self._closure[j]
+        self._notify(old_closure)
 
-    def _check_subtype_rec(
+    def remove_edges(self, taxonomy: Taxonomy) -> None:
+        """Remove the given edges (from concepts to their superconcepts) from the taxonomy."""
+
+        old_closure = self._closure.copy()
+        removed = 0
+        for name, names in taxonomy.items():
+            i = self._ids.get(name)
+            if i is None:
+                continue
+            for j in (self._ids[other] for other in names if other in self._ids):
+                if j in self._edges[i]:
+                    self._edges[i].discard(j)
+                    removed |= 1 << i
+        if removed:
+            # only the closure of concepts reaching the source of a removed edge is recomputed
+            affected = [k for k, closure in enumerate(self._closure) if closure & removed]
+            for k in affected:
+                self._closure[k] = 1 << k
+            self._compute_closure(affected)
+        self._notify(old_closure)
+
+    def _notify(self, old_closure: list[int]) -> None:
+        changed = 0
+        for i, closure in enumerate(self._closure):
+            difference = closure ^ (old_closure[i] if i < len(old_closure) else 1 << i)
+            if difference:
+                changed |= difference | (1 << i)
+        if not changed:
+            return
+        self._taxonomy = None
+        self._subconcepts.clear()
+        names = {self._names[i] for i in range(changed.bit_length()) if (changed >> i) & 1}
+        for listener in self._listeners:
+            listener(names)
+
+    @property
+    def taxonomy(self) -> dict[str, set[str]]:
+        """Reflexive-transitive closure of the taxonomy."""
+
+        if self._taxonomy is None:
+            self._taxonomy = {name: set(self.supertypes(name)) for name in self._names}
+        return self._taxonomy
+
+    def is_subconcept(self, name1: str, name2: str) -> bool:
+        """Decides whether the concept name1 is a subconcept of name2 (reflexive-transitive closure)."""
+
+        if name1 == name2:
+            return True
+        i = self._ids.get(name1)
+        j = self._ids.get(name2)
+        return i is not None and j is not None and (self._closure[i] >> j) & 1 == 1
+
+    def subconcepts(self, name: str) -> frozenset[str]:
+        """All concepts, which are subconcepts of the concept `name` (including `name`)."""
+
+        result = self._subconcepts.get(name)
+        if result is None:
+            j = self._ids.get(name)
+            if j is None:
+                result = frozenset((name,))
+            else:
+                result = frozenset(self._names[i] for i, closure in enumerate(self._closure) if (closure >> j) & 1)
+            self._subconcepts[name] = result
+        return result
+
+    def supertypes(self, name: str) -> Iterable[str]:
+        """All concepts, which the concept `name` is a subconcept of (including `name`)."""
+
+        i = self._ids.get(name)
+        if i is None:
+            yield name
+            return
+        closure = self._closure[i]
+        while closure:
+            lowest = closure & -closure
+            yield self._names[lowest.bit_length() - 1]
+            closure ^= lowest
+
+    @staticmethod
+    def _index_paths(paths: Iterable[Type]) -> dict[Hashable, list[Type]]:
+        """Index paths by their heads: arguments of constructor paths by name,
+        arrow paths under `Arrow`, and literals and variables under `Literal`."""
+
+        index: dict[Hashable, list[Type]] = {}
+        for path in paths:
+            match path:
+                case Constructor(name, arg):
+                    index.setdefault(name, []).append(arg)
+                case Arrow():
+                    index.setdefault(Arrow, []).append(path)
+                case Literal() | Var():
+                    index.setdefault(Literal, []).append(path)
+        return index
+
+    def _check_path(
         self,
-        subtypes: deque[Type],
-        supertype: Type,
+        index: dict[Hashable, list[Type]],
+        path: Type,
         groups: Mapping[str, str],
         substitutions: Mapping[str, Literal],
     ) -> bool:
-        if supertype.is_omega:
-            return True
-        match supertype:
+        """Decides whether the intersection of indexed paths is a subtype of the given path."""
+
+        match path:
+            case Constructor(name2, arg2):
+                names = self.subconcepts(name2)
+                if len(names) < len(index):
+                    heads = [name for name in names if name in index]
+                else:
+                    heads = [head for head in index if head in names]
+                if not heads:
+                    return False
+                if arg2.is_omega:
+                    return True
+                arg_index = self._index_paths(p for head in heads for arg in index[head] for p in arg.organized)
+                return all(self._check_path(arg_index, p, groups, substitutions) for p in arg2.organized)
+            case Arrow(src2, tgt2):
+                tgts = [
+                    p
+                    for arrow in index.get(Arrow, ())
+                    if isinstance(arrow, Arrow) and self.check_subtype(src2, arrow.source, groups, substitutions)
+                    for p in arrow.target.organized
+                ]
+                if not tgts:
+                    return False
+                tgt_index = self._index_paths(tgts)
+                return all(self._check_path(tgt_index, p, groups, substitutions) for p in tgt2.organized)
             case Literal(value2, group2):
-                while subtypes:
-                    match subtypes.pop():
+                for literal in index.get(Literal, ()):
+                    match literal:
                         case Literal(value1, group1):
-                            if value2 == value1 and group1 == group2:
+                            if value1 == value2 and group1 == group2:
                                 return True
                         case Var(name1):
-                            if groups[name1] == supertype.group and substitutions[name1] == supertype.value:
+                            if groups[name1] == group2 and substitutions[name1] == value2:
                                 return True
-                        case Intersection(l, r):
-                            subtypes.extend((l, r))
                 return False
-            case Constructor(name2, arg2):
-                casted_constr: deque[Type] = deque()
-                while subtypes:
-                    match subtypes.pop():
-                        case Constructor(name1, arg1):
-                            if name2 == name1 or name2 in self.taxonomy.get(name1, {}):
-                                casted_constr.append(arg1)
-                        case Intersection(l, r):
-                            subtypes.extend((l, r))
-                return len(casted_constr) != 0 and self._check_subtype_rec(casted_constr, arg2, groups, substitutions)
-            case Arrow(src2, tgt2):
-                casted_arr: deque[Type] = deque()
-                while subtypes:
-                    match subtypes.pop():
-                        case Arrow(src1, tgt1):
-                            if self._check_subtype_rec(deque((src2,)), src1, groups, substitutions):
-                                casted_arr.append(tgt1)
-                        case Intersection(l, r):
-                            subtypes.extend((l, r))
-                return len(casted_arr) != 0 and self._check_subtype_rec(casted_arr, tgt2, groups, substitutions)
-            case Intersection(l, r):
-                return self._check_subtype_rec(subtypes.copy(), l, groups, substitutions) and self._check_subtype_rec(
-                    subtypes, r, groups, substitutions
-                )
             case Var(name):
-                while subtypes:
-                    match subtypes.pop():
-                        case Literal(value, group):
-                            if groups[name] == group and substitutions[name] == value:
-                                return True
-                        case Intersection(l, r):
-                            subtypes.extend((l, r))
-                return False
+                return any(
+                    isinstance(literal, Literal)
+                    and groups[name] == literal.group
+                    and substitutions[name] == literal.value
+                    for literal in index.get(Literal, ())
+                )
             case _:
-                msg = f"Unsupported type in check_subtype: {supertype}"
+                msg = f"Unsupported type in check_subtype: {path}"
                 raise TypeError(msg)
 
     def check_subtype(
@@ -83,12 +277,128 @@ class Subtypes:
         groups: Mapping[str, str],
         substitutions: Mapping[str, Literal],
     ) -> bool:
-        """Decides whether subtype <= supertype with respect to intersection type subtyping."""
+        """Decides whether subtype <= supertype with respect to intersection type subtyping.
+
+        Each path of the supertype is compared only against paths of the subtype with a compatible head."""
+
+        if supertype.is_omega:
+            return True
+        index = self._index_paths(subtype.organized)
+        return all(self._check_path(index, path, groups, substitutions) for path in supertype.organized)
+
+    @staticmethod
+    def _flatten(types: Iterable[Type]) -> list[Type]:
+        """Components of the intersections of the given types."""
+
+        # exact class checks avoid the overhead of isinstance for abstract base classes
+        components: list[Type] = []
+        stack = list(types)
+        while stack:
+            ty = stack.pop()
+            if type(ty) is Intersection:
+                stack.extend((ty.right, ty.left))
+            else:
+                components.append(ty)
+        return components
+
+    def compile_checker(self, supertype: Type) -> SubtypeChecker:
+        """Compiles a reusable checker `checker(subtype, groups, substitutions)`,
+        which decides subtype <= supertype (see `check_subtype`).
+
+        The supertype is dispatched once, and its constructor names are resolved to sets of subconcepts.
+        Subtypes are flattened once into their intersection components.
+        Variables are instantiated by the substitution given to the checker, so that checkers for
+        closed supertypes can be reused for different substitutions."""
 
-        return self._check_subtype_rec(deque((subtype,)), supertype, groups, substitutions)
+        check = self._compile(supertype)
+        flatten = self._flatten
+        return lambda subtype, groups, substitutions: check(
+            flatten((subtype,)) if type(subtype) is Intersection else [subtype], groups, substitutions
+        )
+
+    def _compile(self, supertype: Type) -> Callable[[list[Type], Mapping[str, str], Mapping[str, Literal]], bool]:
+        if supertype.is_omega:
+            return lambda _components, _groups, _substitutions: True
+        match supertype:
+            case Literal(value, group):
+
+                def check_literal(
+                    components: list[Type], groups: Mapping[str, str], substitutions: Mapping[str, Literal]
+                ) -> bool:
+                    for c in components:
+                        if type(c) is Literal:
+                            if value == c.value and group == c.group:
+                                return True
+                        elif type(c) is Var and groups[c.name] == group and substitutions[c.name] == value:
+                            return True
+                    return False
+
+                return check_literal
+            case Constructor(name, arg):
+                names = self.subconcepts(name)
+                check_arg = self._compile(arg)
+
+                def check_constructor(
+                    components: list[Type], groups: Mapping[str, str], substitutions: Mapping[str, Literal]
+                ) -> bool:
+                    args = [c.arg for c in components if type(c) is Constructor and c.name in names]
+                    return len(args) != 0 and check_arg(self._flatten(args), groups, substitutions)
+
+                return check_constructor
+            case Arrow(src, tgt):
+                check_tgt = self._compile(tgt)
+
+                def check_arrow(
+                    components: list[Type], groups: Mapping[str, str], substitutions: Mapping[str, Literal]
+                ) -> bool:
+                    tgts = [
+                        c.target
+                        for c in components
+                        if type(c) is Arrow and self.check_subtype(src, c.source, groups, substitutions)
+                    ]
+                    return len(tgts) != 0 and check_tgt(self._flatten(tgts), groups, substitutions)
+
+                return check_arrow
+            case Intersection():
+                checks = [self._compile(component) for component in self._flatten((supertype,))]
+                return lambda components, groups, substitutions: all(
+                    check(components, groups, substitutions) for check in checks
+                )
+            case Var(name):
+
+                def check_var(
+                    components: list[Type], groups: Mapping[str, str], substitutions: Mapping[str, Literal]
+                ) -> bool:
+                    return any(
+                        type(c) is Literal and groups[name] == c.group and substitutions[name] == c.value
+                        for c in components
+                    )
+
+                return check_var
+            case _:
+                msg = f"Unsupported type in compile_checker: {supertype}"
+                raise TypeError(msg)
 
     def infer_substitution(self, subtype: Type, path: Type, groups: Mapping[str, str]) -> dict[str, Any] | None:
-        """Infers a unique substitution S such that S(subtype) <= path where path is closed. Returns None or Ambiguous is no solution exists or multiple solutions exist respectively."""
+        """Infers the values of variables, which are the same for every substitution S such that
+        S(subtype) <= path where path is closed. Returns None if no such substitution exists.
+
+        Deprecated: use `infer_candidates`, which also returns the candidates of the other variables."""
+
+        warnings.warn(
+            "Subtypes.infer_substitution is deprecated, use Subtypes.infer_candidates instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        candidates = self.infer_candidates(subtype, path, groups)
+        if candidates is None:
+            return None
+        return {name: next(iter(values)) for name, values in candidates.items() if len(values) == 1}
+
+    def infer_candidates(self, subtype: Type, path: Type, groups: Mapping[str, str]) -> dict[str, set[Any]] | None:
+        """Infers finite sets of candidate values for variables, such that every substitution S with
+        S(subtype) <= path (where path is closed) maps each variable to one of its candidates.
+        Variables without candidates are not constrained. Returns None if no such substitution exists."""
 
         if subtype.is_omega:
             return None
@@ -102,69 +412,75 @@ class Subtypes:
             case Constructor(name1, arg1):
                 match path:
                     case Constructor(name2, arg2):
-                        if name2 == name1 or name2 in self.taxonomy.get(name1, {}):
+                        if self.is_subconcept(name1, name2):
                             if arg2.is_omega:
                                 return {}
-                            return self.infer_substitution(arg1, arg2, groups)
+                            return self.infer_candidates(arg1, arg2, groups)
             case Arrow(src1, tgt1):
                 match path:
                     case Arrow(src2, tgt2):
-                        substitution = self.infer_substitution(tgt1, tgt2, groups)
-                        if substitution is None:
+                        candidates = self.infer_candidates(tgt1, tgt2, groups)
+                        if candidates is None:
                             return None
-                        if all(name in substitution for name in src1.free_vars):
-                            if self.check_subtype(src2, src1, groups, substitution):
-                                return substitution
-                            return None
-                        return {}  # there are actual non-Ambiguous cases (relevant in practice?)
+                        if all(name in candidates and len(candidates[name]) == 1 for name in src1.free_vars):
+                            substitution = {name: next(iter(candidates[name])) for name in src1.free_vars}
+                            if not self.check_subtype(src2, src1, groups, substitution):
+                                return None
+                        return candidates
             case Intersection(l, r):
-                substitution1 = self.infer_substitution(l, path, groups)
-                substitution2 = self.infer_substitution(r, path, groups)
-                if substitution1 is None:
-                    return substitution2
-                if substitution2 is None:
-                    return substitution1
-                if all(
-                    (name in substitution2 and substitution2[name] == value for name, value in substitution1.items())
-                ):
-                    return substitution1  # substitution1 included in substitution2
-                if all(
-                    (name in substitution1 and substitution1[name] == value for name, value in substitution2.items())
-                ):
-                    return substitution2  # substitution2 included in substitution1
-                return {}
+                # S(l & r) <= path if S(l) <= path or S(r) <= path
+                candidates1 = self.infer_candidates(l, path, groups)
+                candidates2 = self.infer_candidates(r, path, groups)
+                if candidates1 is None:
+                    return candidates2
+                if candidates2 is None:
+                    return candidates1
+                return {
+                    name: values.union(candidates2[name]) for name, values in candidates1.items() if name in candidates2
+                }
             case Var(name):
                 match path:
                     case Literal(value2, group2):
                         if groups[name] == group2:
-                            return {name: value2}
+                            return {name: {value2}}
             case _:
-                msg = f"Unsupported type in infer_substitution: {subtype}"
+                msg = f"Unsupported type in infer_candidates: {subtype}"
                 raise TypeError(msg)
         return None
 
     @staticmethod
-    def _reflexive_closure(env: Mapping[str, set[str]]) -> dict[str, set[str]]:
-        all_types: set[str] = set(env.keys())
-        for v in env.values():
-            all_types.update(v)
-        result: dict[str, set[str]] = {subtype: {subtype}.union(env.get(subtype, set())) for subtype in all_types}
-        return result
+    def path_key(path: Type) -> tuple[Hashable, ...]:
+        """Key of a path, such that a closed type is a subtype of `path` only if
+        one of its paths is indexed under this key (see `subtype_path_keys`)."""
 
-    @staticmethod
-    def _transitive_closure(env: Mapping[str, set[str]]) -> dict[str, set[str]]:
-        result: dict[str, set[str]] = {subtype: supertypes.copy() for (subtype, supertypes) in env.items()}
-        has_changed = True
-
-        while has_changed:
-            has_changed = False
-            for known_supertypes in result.values():
-                for supertype in known_supertypes.copy():
-                    to_add: set[str] = {
-                        new_supertype for new_supertype in result[supertype] if new_supertype not in known_supertypes
-                    }
-                    if to_add:
-                        has_changed = True
-                    known_supertypes.update(to_add)
+        match path:
+            case Constructor(name, arg):
+                match tuple(arg.organized):
+                    case (Literal(value, group),):
+                        return (Constructor, name, value, group)
+                return (Constructor, name)
+            case Literal(value, group):
+                return (Literal, value, group)
+            case Arrow():
+                return (Arrow,)
+            case _:
+                msg = f"Unsupported type in path_key: {path}"
+                raise TypeError(msg)
 
-        return result
+    def subtype_path_keys(self, path: Type) -> Iterable[tuple[Hashable, ...]]:
+        """Keys of all paths, which `path` is a subtype of (see `path_key`)."""
+
+        match path:
+            case Constructor(name, arg):
+                literals = [p for p in arg.organized if isinstance(p, Literal)] if len(arg.organized) == 1 else []
+                for supertype in self.supertypes(name):
+                    yield (Constructor, supertype)
+                    for literal in literals:
+                        yield (Constructor, supertype, literal.value, literal.group)
+            case Literal(value, group):
+                yield (Literal, value, group)
+            case Arrow():
+                yield (Arrow,)
+            case _:
+                msg = f"Unsupported type in subtype_path_keys: {path}"
+                raise TypeError(msg)
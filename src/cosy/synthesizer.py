@@ -8,6 +8,7 @@ It constructs a logic program via `constructSolutionSpace` from the following in
 from collections import deque
 from collections.abc import (
     Callable,
+    Collection,
     Container,
     Generator,
     Hashable,
@@ -15,16 +16,22 @@ from collections.abc import (
     Iterator,
     Mapping,
     Sequence,
+    Sized,
 )
 from dataclasses import dataclass
-from functools import reduce
+from functools import partial, reduce
+from itertools import compress, product
 from typing import (
     Any,
     Generic,
     TypeVar,
+    overload,
 )
 
+from cosy.cache import Cache, CacheInfo
 from cosy.combinatorics import maximal_elements, minimal_covers
+from cosy.literals import normalize_group
+from cosy.planner import plan_prefix
 from cosy.solution_space import (
     Argument,
     ConstantArgument,
@@ -32,15 +39,21 @@ from cosy.solution_space import (
     RHSRule,
     SolutionSpace,
 )
-from cosy.subtypes import Subtypes, Taxonomy
+from cosy.subtypes import SubtypeChecker, Subtypes, Taxonomy
+from cosy.tree import Tree
 from cosy.types import (
     Abstraction,
     Arrow,
+    Attribute,
+    Attribution,
+    Constructor,
     Implication,
     Intersection,
+    Literal,
     LiteralParameter,
     Parameter,
     Predicate,
+    Relation,
     TermParameter,
     Type,
 )
@@ -49,11 +62,17 @@ from cosy.types import (
 C = TypeVar("C", bound=Hashable)
 
 # type of component specifications
-Specification = Abstraction | Implication | Type
+Specification = Abstraction | Implication | Attribution | Type
 
 # type of parameter space
 ParameterSpace = Mapping[str, Iterable | Container]
 
+# values of a parameter for a partial substitution, candidates, and names of inferred parameters
+InstantiationStep = Callable[[dict[str, Any], Mapping[str, set[Any]] | None, Container[str]], Iterable[Any]]
+
+# substitutions for an initial substitution and candidates
+Instantiator = Callable[[dict[str, Any], Mapping[str, set[Any]] | None], Iterator[dict[str, Any]]]
+
 
 @dataclass(frozen=True)
 class MultiArrow:
@@ -67,6 +86,93 @@ class MultiArrow:
         return str(self.target)
 
 
+class MultiArrows(Sequence[list[MultiArrow]]):
+    """Lazily expanded 0-ary, 1-ary, ..., n-ary function types of a type (as lists of multi-arrows).
+    Each arity is indexed by the heads of the paths of its targets."""
+
+    def __init__(self, ty: Type):
+        self._levels: list[list[MultiArrow]] = []
+        self._heads: list[frozenset[Hashable]] = []
+        self._next: list[MultiArrow] = [MultiArrow((), ty)]
+
+    @staticmethod
+    def _unary_function_types(ty: Type) -> Iterable[tuple[Type, Type]]:
+        tys: deque[Type] = deque((ty,))
+        while tys:
+            match tys.pop():
+                case Arrow(src, tgt) if not tgt.is_omega:
+                    yield (src, tgt)
+                case Intersection(sigma, tau):
+                    tys.extend((sigma, tau))
+
+    @staticmethod
+    def head(path: Type) -> Hashable:
+        """Head of a path: a constructor name, `Arrow`, or `Literal` (for literals and variables)."""
+
+        match path:
+            case Constructor(name, _):
+                return name
+            case Arrow():
+                return Arrow
+        return Literal
+
+    def _expand(self, arity: int) -> bool:
+        """Expand arities up to the given arity, returns whether the arity exists."""
+
+        while len(self._levels) <= arity and len(self._next) != 0:
+            current = self._next
+            self._levels.append(current)
+            self._heads.append(frozenset(self.head(path) for m in current for path in m.target.organized))
+            self._next = [
+                MultiArrow((*c.args, new_arg), new_tgt)
+                for c in current
+                for (new_arg, new_tgt) in self._unary_function_types(c.target)
+            ]
+        return arity < len(self._levels)
+
+    def __iter__(self) -> Iterator[list[MultiArrow]]:
+        arity = 0
+        while self._expand(arity):
+            yield self._levels[arity]
+            arity += 1
+
+    @overload
+    def __getitem__(self, arity: int) -> list[MultiArrow]: ...
+
+    @overload
+    def __getitem__(self, arity: slice) -> list[list[MultiArrow]]: ...
+
+    def __getitem__(self, arity: int | slice) -> list[MultiArrow] | list[list[MultiArrow]]:
+        if isinstance(arity, slice) or arity < 0:
+            return list(self)[arity]
+        if not self._expand(arity):
+            raise IndexError(arity)
+        return self._levels[arity]
+
+    def __len__(self) -> int:
+        while self._expand(len(self._levels)):
+            pass
+        return len(self._levels)
+
+    def covering(self, paths: Iterable[Type], subtypes: Subtypes) -> Iterator[list[MultiArrow]]:
+        """Arities, for which each of the given paths has a target path with a compatible head."""
+
+        heads = {self.head(path) for path in paths}
+        arity = 0
+        while self._expand(arity):
+            level_heads = self._heads[arity]
+            if all(
+                head in level_heads
+                or (
+                    isinstance(head, str)
+                    and any(isinstance(h, str) and subtypes.is_subconcept(h, head) for h in level_heads)
+                )
+                for head in heads
+            ):
+                yield self._levels[arity]
+            arity += 1
+
+
 @dataclass()
 class CombinatorInfo:
     # container for auxiliary information about a combinator
@@ -74,7 +180,34 @@ class CombinatorInfo:
     groups: dict[str, str]
     term_predicates: tuple[Callable[[dict[str, Any]], bool], ...]
     instantiations: deque[dict[str, Any]] | None
-    type: list[list[MultiArrow]]
+    type: MultiArrows
+    attributes: tuple[Attribute, ...] = ()
+
+
+@dataclass(frozen=True)
+class SolutionSpaceTemplate(Generic[C]):
+    """Solution space shared by all instances of a query template."""
+
+    template: Type
+    groups: dict[str, str]
+    solution_space: SolutionSpace[Type, C, str]
+
+    def instantiate(self, substitution: Mapping[str, Any]) -> Type:
+        """Instance of the query template for the given values of its variables."""
+        return self.template.subst(self.groups, dict(substitution))
+
+    def prune(self) -> "SolutionSpaceTemplate[C]":
+        """Keep only productive rules."""
+        return SolutionSpaceTemplate(self.template, self.groups, self.solution_space.prune())
+
+    def enumerate_trees(
+        self,
+        substitution: Mapping[str, Any],
+        max_count: int | None = None,
+        max_bucket_size: int | None = None,
+    ) -> Iterable[Tree[C]]:
+        """Enumerate terms for the instance of the query template for the given values of its variables."""
+        return self.solution_space.enumerate_trees(self.instantiate(substitution), max_count, max_bucket_size)
 
 
 class Synthesizer(Generic[C]):
@@ -83,12 +216,202 @@ class Synthesizer(Generic[C]):
         component_specifications: Mapping[C, Specification],
         parameter_space: ParameterSpace | None = None,
         taxonomy: Taxonomy | None = None,
+        path_cache_size: int | None = 2**16,
+        subst_cache_size: int | None = 2**16,
     ):
-        self.literals: ParameterSpace = {} if parameter_space is None else dict(parameter_space.items())
+        # groups are indexed for enumeration and membership tests
+        self.literals: ParameterSpace = (
+            {}
+            if parameter_space is None
+            else {group: normalize_group(values) for group, values in parameter_space.items()}
+        )
         self.repository: tuple[tuple[C, CombinatorInfo], ...] = tuple(
             (c, Synthesizer._function_types(self.literals, ty)) for c, ty in component_specifications.items()
         )
         self.subtypes = Subtypes(taxonomy if taxonomy is not None else {})
+        self._path_checkers: dict[Type, SubtypeChecker] = {}
+        # candidates (or non-applicability) for each combinator and target path
+        self._path_candidates_cache: Cache[tuple[C, Type], dict[str, set[Any]] | None] = Cache(path_cache_size)
+        # instances of argument types (indexed by the identity of the type and groups, and values of its variables)
+        self._subst_cache: Cache[tuple[int, int, tuple[Any, ...]], tuple[Type, dict[str, str], Type]] = Cache(
+            subst_cache_size
+        )
+        # shared representatives of equal instances
+        self._instances: Cache[Type, Type] = Cache(subst_cache_size)
+        # compiled prefixes (indexed by the identity of the prefix, inferred parameters, and parameters with candidates)
+        self._instantiators: dict[
+            tuple[int, frozenset[str], frozenset[str]],
+            tuple[list[LiteralParameter | TermParameter | Predicate], Instantiator | None],
+        ] = {}
+        self.subtypes.add_listener(self._taxonomy_changed)
+
+    @staticmethod
+    def _constructor_names(ty: Type) -> Iterable[str]:
+        types: deque[Type] = deque((ty,))
+        while types:
+            match types.pop():
+                case Constructor(name, arg):
+                    yield name
+                    types.append(arg)
+                case Arrow(src, tgt):
+                    types.extend((src, tgt))
+                case Intersection(l, r):
+                    types.extend((l, r))
+
+    def _taxonomy_changed(self, names: set[str]) -> None:
+        """Invalidate cached results depending on the given concepts after a taxonomy update.
+        Subtyping between types, which do not contain affected concepts, did not change."""
+
+        def affected(ty: Type) -> bool:
+            return not names.isdisjoint(self._constructor_names(ty))
+
+        for path in [path for path in self._path_checkers if affected(path)]:
+            del self._path_checkers[path]
+        # the type of a combinator is the target of its 0-ary multi-arrow
+        combinators = {c for c, combinator_info in self.repository if affected(combinator_info.type[0][0].target)}
+        self._path_candidates_cache.discard(lambda key: key[0] in combinators or affected(key[1]))
+
+    def _repository_changed(self, combinators: set[C]) -> None:
+        """Invalidate cached results depending on the given combinators after a repository update."""
+
+        self._path_candidates_cache.discard(lambda key: key[0] in combinators)
+        # compiled prefixes of removed combinators
+        prefixes = {id(combinator_info.prefix) for _, combinator_info in self.repository}
+        for key in [key for key, (prefix, _) in self._instantiators.items() if id(prefix) not in prefixes]:
+            del self._instantiators[key]
+
+    def add_component(
+        self,
+        combinator: C,
+        specification: Specification,
+        solution_space: SolutionSpace[Type, C, str] | None = None,
+        targets: Iterable[Type] = (),
+    ) -> set[Type]:
+        """Add a component to the repository.
+
+        If a solution space (constructed by this synthesizer before pruning) is given, it is updated in place.
+        The rules of the new component for its query `targets` and the non-terminals occurring in it are added,
+        together with the rules of new non-terminals in their arguments.
+        Returns the non-terminals, whose rules changed (see `SolutionSpace.reprune`)."""
+
+        if any(c == combinator for c, _ in self.repository):
+            msg = f"Component {combinator} is already in the repository."
+            raise ValueError(msg)
+        combinator_info = Synthesizer._function_types(self.literals, specification)
+        # the repository is only changed if the solution space can be updated
+        if solution_space is not None:
+            solution_space.check_modifiable()
+        self.repository = (*self.repository, (combinator, combinator_info))
+        self._repository_changed({combinator})
+        if solution_space is None:
+            return set()
+        return self._add_component_rules(solution_space, targets, combinator, combinator_info)
+
+    def remove_component(
+        self,
+        combinator: C,
+        solution_space: SolutionSpace[Type, C, str] | None = None,
+        targets: Iterable[Type] = (),
+    ) -> set[Type]:
+        """Remove a component from the repository.
+
+        If a solution space (constructed by this synthesizer before pruning for the query `targets`) is given,
+        it is updated in place by removing the rules of the component.
+        Returns the non-terminals, whose rules changed (see `SolutionSpace.reprune`)."""
+
+        if all(c != combinator for c, _ in self.repository):
+            msg = f"Component {combinator} is not in the repository."
+            raise ValueError(msg)
+        if solution_space is not None:
+            solution_space.check_modifiable()
+        self.repository = tuple((c, info) for c, info in self.repository if c != combinator)
+        self._repository_changed({combinator})
+        if solution_space is None:
+            return set()
+        return self._remove_component_rules(solution_space, targets, combinator)
+
+    @staticmethod
+    def _occurring_nonterminals(solution_space: SolutionSpace[Type, C, str], targets: Iterable[Type]) -> list[Type]:
+        """Targets and non-terminals with rules or in arguments of rules."""
+
+        nonterminals: dict[Type, None] = dict.fromkeys(targets)
+        for nt, rules in solution_space.as_tuples():
+            nonterminals[nt] = None
+            for rule in rules:
+                nonterminals.update(dict.fromkeys(rule.non_terminals))
+        return list(nonterminals)
+
+    def _add_component_rules(
+        self,
+        solution_space: SolutionSpace[Type, C, str],
+        targets: Iterable[Type],
+        combinator: C,
+        combinator_info: CombinatorInfo,
+    ) -> set[Type]:
+        """Add the rules of a new component to a solution space."""
+
+        # rules of other combinators do not change
+        nonterminals = self._occurring_nonterminals(solution_space, targets)
+        changed: set[Type] = set()
+        for nt, rule in self._construct_rules(nonterminals, ((combinator, combinator_info),), nonterminals):
+            solution_space.add_rule(nt, rule.terminal, rule.arguments, rule.predicates, rule.attributes)
+            changed.add(nt)
+        return changed
+
+    def _remove_component_rules(
+        self, solution_space: SolutionSpace[Type, C, str], targets: Iterable[Type], combinator: C
+    ) -> set[Type]:
+        """Remove the rules of a retired component from a solution space."""
+
+        return solution_space.remove_rules(lambda _, rule: rule.terminal == combinator)
+
+    def path_cache_info(self) -> CacheInfo:
+        """Statistics of the cache of candidates for each combinator and target path."""
+
+        return self._path_candidates_cache.cache_info()
+
+    def subst_cache_info(self) -> CacheInfo:
+        """Statistics of the cache of instances of argument types."""
+
+        return self._subst_cache.cache_info()
+
+    def _subst(self, ty: Type, groups: dict[str, str], substitution: dict[str, Any]) -> Type:
+        """Instance of a type of a combinator for a substitution.
+        Instances are shared by all substitutions agreeing on the free variables of the type."""
+
+        free_vars = sorted(var for var in ty.free_vars if var in substitution)
+        if not free_vars:
+            return ty
+
+        if type(ty) is Intersection:
+            # intersections of argument types are newly constructed for each subquery,
+            # only their components (types of the combinator) are cached
+            intersection = Intersection(
+                self._subst(ty.left, groups, substitution), self._subst(ty.right, groups, substitution)
+            )
+            return self._instances.lookup(intersection, lambda: intersection)
+
+        def compute() -> tuple[Type, dict[str, str], Type]:
+            instance = ty.subst(groups, substitution)
+            # equal instances of different types are shared
+            return (ty, groups, self._instances.lookup(instance, lambda: instance))
+
+        # entries keep the type and groups alive, so that their identities are not reused while cached
+        key = (id(ty), id(groups), tuple(substitution[var] for var in free_vars))
+        try:
+            return self._subst_cache.lookup(key, compute)[2]
+        except TypeError:
+            # values are not hashable
+            return ty.subst(groups, substitution)
+
+    def _path_checker(self, path: Type) -> SubtypeChecker:
+        """Compiled subtype checker for a (closed) path of a target, which is reused across queries."""
+
+        checker = self._path_checkers.get(path)
+        if checker is None:
+            checker = self.subtypes.compile_checker(path)
+            self._path_checkers[path] = checker
+        return checker
 
     @staticmethod
     def _function_types(
@@ -97,18 +420,10 @@ class Synthesizer(Generic[C]):
     ) -> CombinatorInfo:
         """Presents a type as a list of 0-ary, 1-ary, ..., n-ary function types."""
 
-        def unary_function_types(ty: Type) -> Iterable[tuple[Type, Type]]:
-            tys: deque[Type] = deque((ty,))
-            while tys:
-                match tys.pop():
-                    case Arrow(src, tgt) if not tgt.is_omega:
-                        yield (src, tgt)
-                    case Intersection(sigma, tau):
-                        tys.extend((sigma, tau))
-
         prefix: list[LiteralParameter | TermParameter | Predicate] = []
         variables: set[str] = set()
         groups: dict[str, str] = {}
+        attributes: dict[str, Attribute] = {}
         while not isinstance(parameterized_type, Type):
             if isinstance(parameterized_type, Abstraction):
                 param = parameterized_type.parameter
@@ -133,7 +448,27 @@ class Synthesizer(Generic[C]):
                             raise ValueError(msg)
                 parameterized_type = parameterized_type.body
             elif isinstance(parameterized_type, Implication):
-                prefix.append(parameterized_type.predicate)
+                predicate = parameterized_type.predicate
+                for dependency in predicate.dependencies or ():
+                    if dependency not in variables:
+                        # check if each dependency of a predicate is introduced before the predicate
+                        msg = f"Dependency {dependency} is not abstracted."
+                        raise ValueError(msg)
+                if isinstance(predicate, Relation):
+                    for name in predicate.names:
+                        if name not in groups:
+                            # check if a relation is over literal parameters
+                            msg = f"Parameter {name} of the relation is not a literal parameter."
+                            raise ValueError(msg)
+                prefix.append(predicate)
+                parameterized_type = parameterized_type.body
+            elif isinstance(parameterized_type, Attribution):
+                attribute = parameterized_type.attribute
+                if attribute.name in attributes:
+                    # check if attribute names are unique
+                    msg = f"Duplicate attribute: {attribute.name}"
+                    raise ValueError(msg)
+                attributes[attribute.name] = attribute
                 parameterized_type = parameterized_type.body
 
         for free_var in parameterized_type.free_vars:
@@ -142,29 +477,239 @@ class Synthesizer(Generic[C]):
                 msg = f"Parameter {free_var} is not abstracted."
                 raise ValueError(msg)
 
-        current: list[MultiArrow] = [MultiArrow((), parameterized_type)]
-
-        multiarrows = []
-        while len(current) != 0:
-            multiarrows.append(current)
-            current = [
-                MultiArrow((*c.args, new_arg), new_tgt)
-                for c in current
-                for (new_arg, new_tgt) in unary_function_types(c.target)
-            ]
-
         term_predicates: tuple[Callable[[dict[str, Any]], bool], ...] = tuple(
-            p.constraint for p in prefix if isinstance(p, Predicate) and not p.only_literals
+            p for p in prefix if isinstance(p, Predicate) and not p.only_literals
         )
-        return CombinatorInfo(prefix, groups, term_predicates, None, multiarrows)
+        return CombinatorInfo(
+            prefix, groups, term_predicates, None, MultiArrows(parameterized_type), tuple(attributes.values())
+        )
+
+    def _membership(self, group: str) -> Callable[[Any], bool]:
+        """Membership test for a (normalized) group."""
+
+        concrete_values = self.literals[group]
+        if isinstance(concrete_values, Container):
+            return concrete_values.__contains__
+        return partial(Synthesizer._iterable_contains, concrete_values)
+
+    @staticmethod
+    def _iterable_contains(concrete_values: Iterable[Any], value: Any) -> bool:
+        return any(value == concrete_value for concrete_value in concrete_values)
+
+    def _literal_step(
+        self,
+        parameter: LiteralParameter,
+        relations: Sequence[Relation] = (),
+        vectorized: Sequence[Predicate] = (),
+    ) -> InstantiationStep:
+        """Values of a literal parameter for a partial substitution and candidates.
+        Values are looked up in the indexes of the given relations (over the parameter) by the bound parameters,
+        and filtered by the given vectorized predicates at once."""
+
+        name = parameter.name
+        parameter_values = parameter.values
+        concrete_values = self.literals[parameter.group]
+        contains = self._membership(parameter.group)
+
+        def step(
+            substitution: dict[str, Any], candidates: Mapping[str, set[Any]] | None, inferred: Container[str]
+        ) -> Iterable[Any]:
+            if name in inferred:
+                value = substitution[name]
+                if parameter_values is not None and value not in parameter_values(substitution):
+                    # the inferred value is not in the set of values
+                    return ()
+                # the inferred value may not be in the group
+                return (value,) if contains(value) else ()
+            related = [relation.values(name, substitution) for relation in relations]
+            if candidates is not None and name in candidates:
+                parameter_candidates = candidates[name]
+                if parameter_values is not None:
+                    values: Iterable[Any] = (
+                        value for value in parameter_values(substitution) if value in parameter_candidates
+                    )
+                else:
+                    values = parameter_candidates
+            elif parameter_values is not None:
+                values = parameter_values(substitution)
+            elif related:
+                values = related.pop()
+            else:
+                if not isinstance(concrete_values, Iterable):
+                    msg = f"The value of {name} could not be inferred."
+                    raise RuntimeError(msg)
+                return concrete_values
+            return [value for value in values if contains(value) and all(value in r for r in related)]
+
+        if not vectorized:
+            return step
+        filter_values = Synthesizer._vectorized_filter(name, vectorized)
+
+        def filtered_step(
+            substitution: dict[str, Any], candidates: Mapping[str, set[Any]] | None, inferred: Container[str]
+        ) -> Iterable[Any]:
+            return filter_values(substitution, step(substitution, candidates, inferred))
+
+        return filtered_step
+
+    @staticmethod
+    def _vectorized_filter(
+        name: str, predicates: Sequence[Predicate]
+    ) -> Callable[[dict[str, Any], Iterable[Any]], list[Any]]:
+        """Filter of values of a parameter by vectorized predicates, which are evaluated for a NumPy array of values.
+        If NumPy is not available, predicates are evaluated for each value separately."""
+
+        try:
+            import numpy as np
+        except ImportError:
+
+            def filter_values(substitution: dict[str, Any], values: Iterable[Any]) -> list[Any]:
+                candidate = dict(substitution)
+                result = []
+                for value in values:
+                    candidate[name] = value
+                    if all(predicate.constraint(candidate) for predicate in predicates):
+                        result.append(value)
+                return result
+
+            return filter_values
+
+        def filter_array(substitution: dict[str, Any], values: Iterable[Any]) -> list[Any]:
+            if isinstance(values, range):
+                # integer intervals are not materialized
+                array = np.arange(values.start, values.stop, values.step)
+            else:
+                values = list(values)
+                array = np.asarray(values)
+                if array.ndim != 1:
+                    # values are not scalars (e.g. tuples)
+                    array = np.fromiter(values, dtype=object, count=len(values))
+            candidate = {**substitution, name: array}
+            mask = np.ones(len(array), dtype=bool)
+            for predicate in predicates:
+                mask &= np.broadcast_to(np.asarray(predicate.constraint(candidate), dtype=bool), mask.shape)
+            if isinstance(values, range):
+                return [values[index] for index in np.flatnonzero(mask).tolist()]
+            return list(compress(values, mask))
+
+        return filter_array
+
+    @staticmethod
+    def _predicate_step(predicate: Predicate) -> InstantiationStep:
+        """Single placeholder value if the predicate is satisfied by a partial substitution."""
+
+        constraint = predicate.constraint
+
+        def step(
+            substitution: dict[str, Any], candidates: Mapping[str, set[Any]] | None, inferred: Container[str]
+        ) -> Iterable[Any]:
+            return (None,) if constraint(substitution) else ()
+
+        return step
+
+    def _compile(
+        self,
+        prefix: list[LiteralParameter | TermParameter | Predicate],
+        inferred: frozenset[str] = frozenset(),
+        restricted: frozenset[str] = frozenset(),
+    ) -> Instantiator | None:
+        """Compile a prefix into nested loops over its literal parameters and literal predicates.
+        The loops are ordered by `plan_prefix` taking inferred parameters and parameters with candidates into account.
+        Values of parameters in relations are enumerated via the indexes of the relations.
+        Vectorized predicates filter the values of the last literal parameter before them at once.
+        Term parameters and term predicates are skipped. Substitutions are updated in place and copied when yielded.
+        Returns None if some group is infinite, in which case substitutions are enumerated fairly."""
+
+        group_sizes = {group: len(values) for group, values in self.literals.items() if isinstance(values, Sized)}
+        plan = plan_prefix(prefix, group_sizes, inferred, restricted)
+        steps: list[tuple[str | None, InstantiationStep]] = []
+        relations = [parameter for parameter in prefix if isinstance(parameter, Relation)]
+        # vectorized predicates are evaluated together with the last literal parameter before them
+        vectorized: dict[str, list[Predicate]] = {}
+        last_parameter: str | None = None
+        for parameter in plan:
+            if isinstance(parameter, LiteralParameter):
+                last_parameter = parameter.name
+            elif isinstance(parameter, Predicate) and parameter.vectorized and last_parameter is not None:
+                vectorized.setdefault(last_parameter, []).append(parameter)
+        fused = {id(predicate) for predicates in vectorized.values() for predicate in predicates}
+        for parameter in plan:
+            if isinstance(parameter, LiteralParameter):
+                concrete_values = self.literals[parameter.group]
+                parameter_relations = [relation for relation in relations if parameter.name in relation.names]
+                if (
+                    parameter.values is None
+                    and not parameter_relations
+                    and isinstance(concrete_values, Iterable)
+                    and not isinstance(concrete_values, Sized)
+                ):
+                    return None
+                steps.append(
+                    (
+                        parameter.name,
+                        self._literal_step(parameter, parameter_relations, vectorized.get(parameter.name, ())),
+                    )
+                )
+            elif isinstance(parameter, Predicate) and parameter.only_literals and id(parameter) not in fused:
+                steps.append((None, self._predicate_step(parameter)))
+        depth = len(steps)
+        names = [name for name, _ in steps]
+        exhausted = object()
+
+        def instantiate(
+            initial_substitution: dict[str, Any], candidates: Mapping[str, set[Any]] | None
+        ) -> Iterator[dict[str, Any]]:
+            substitution = dict(initial_substitution)
+            if depth == 0:
+                yield substitution
+                return
+            iterators = [iter(steps[0][1](substitution, candidates, initial_substitution))]
+            while iterators:
+                level = len(iterators) - 1
+                name = names[level]
+                value = next(iterators[level], exhausted)
+                if value is exhausted:
+                    iterators.pop()
+                    if name is not None and name not in initial_substitution:
+                        # deeper parameters are not visible to candidate functions and predicates
+                        substitution.pop(name, None)
+                    continue
+                if name is not None:
+                    substitution[name] = value
+                if level + 1 == depth:
+                    yield dict(substitution)
+                else:
+                    iterators.append(iter(steps[level + 1][1](substitution, candidates, initial_substitution)))
+
+        return instantiate
 
     def _enumerate_substitutions(
         self,
         prefix: list[LiteralParameter | TermParameter | Predicate],
         substitution: dict[str, Any],
+        candidates: Mapping[str, set[Any]] | None = None,
     ) -> Iterable[dict[str, Any]]:
         """Enumerate all substitutions for the given parameters fairly.
-        Take initial_substitution with inferred literals into account."""
+        Take initial_substitution with inferred literals into account.
+        Values of parameters with candidates are restricted to their candidates.
+        For finite groups, the prefix is compiled once into nested loops."""
+
+        key = (id(prefix), frozenset(substitution), frozenset(candidates or ()))
+        compiled = self._instantiators.get(key)
+        if compiled is None or compiled[0] is not prefix:
+            compiled = (prefix, self._compile(prefix, key[1], key[2]))
+            self._instantiators[key] = compiled
+        if compiled[1] is not None:
+            return compiled[1](substitution, candidates)
+        return self._enumerate_substitutions_fairly(prefix, substitution, candidates)
+
+    def _enumerate_substitutions_fairly(
+        self,
+        prefix: list[LiteralParameter | TermParameter | Predicate],
+        substitution: dict[str, Any],
+        candidates: Mapping[str, set[Any]] | None = None,
+    ) -> Iterable[dict[str, Any]]:
+        """Enumerate all substitutions for the given parameters fairly (also for infinite groups)."""
 
         stack: deque[tuple[dict[str, Any], int, Iterator[Any] | None]] = deque([(substitution, 0, None)])
 
@@ -186,6 +731,15 @@ class Synthesizer(Generic[C]):
                             # the inferred value is not in the group
                             continue
                         stack.appendleft((substitution, index + 1, None))
+                    elif candidates is not None and parameter.name in candidates:
+                        parameter_candidates = candidates[parameter.name]
+                        if parameter.values is not None:
+                            values: Iterable[Any] = (
+                                value for value in parameter.values(substitution) if value in parameter_candidates
+                            )
+                        else:
+                            values = parameter_candidates
+                        stack.appendleft((substitution, index, iter(values)))
                     elif parameter.values is not None:
                         stack.appendleft((substitution, index, iter(parameter.values(substitution))))
                     else:
@@ -218,12 +772,14 @@ class Synthesizer(Generic[C]):
         groups: dict[str, str],
         substitution: dict[str, Any],
     ) -> Sequence[list[Type]]:
+        path_checkers = {path: self._path_checker(path) for path in paths}
+
         # does the target of a multi-arrow contain a given type?
         def target_contains(m: MultiArrow, t: Type) -> bool:
-            return self.subtypes.check_subtype(m.target, t, groups, substitution)
+            return path_checkers[t](m.target, groups, substitution)
 
         # cover target using targets of multi-arrows in nary_types
-        covers = minimal_covers(nary_types, paths, target_contains)
+        covers = minimal_covers(nary_types, path_checkers, target_contains)
         if len(covers) == 0:
             return []
 
@@ -233,73 +789,119 @@ class Synthesizer(Generic[C]):
 
         intersected_args: Generator[list[Type]] = (list(reduce(intersect_args, (m.args for m in ms))) for ms in covers)
 
+        # checkers for argument types (identified by id), which are compared against many other arguments
+        arg_checkers: dict[int, tuple[Type, SubtypeChecker]] = {}
+
+        def check_arg(a: Type, b: Type) -> bool:
+            entry = arg_checkers.get(id(b))
+            if entry is None or entry[0] is not b:
+                entry = (b, self.subtypes.compile_checker(b))
+                arg_checkers[id(b)] = entry
+            return entry[1](a, groups, substitution)
+
         # consider only maximal argument vectors
         def compare_args(args1, args2) -> bool:
-            return all(
-                map(
-                    lambda a, b: self.subtypes.check_subtype(a, b, groups, substitution),
-                    args1,
-                    args2,
-                )
-            )
+            return all(map(check_arg, args1, args2))
 
         return maximal_elements(intersected_args, compare_args)
 
+    def _path_candidates(
+        self,
+        path: Type,
+        combinator_type: MultiArrows,
+        groups: dict[str, str],
+    ) -> dict[str, set[Any]] | None:
+        """Candidates for variables such that some multi-arrow of combinator_type covers the path."""
+
+        path_candidates: dict[str, set[Any]] | None = None
+        # only arities with a compatible head can cover the path
+        for nary_types in combinator_type.covering((path,), self.subtypes):
+            for ty in nary_types:
+                candidates = self.subtypes.infer_candidates(ty.target, path, groups)
+                if candidates is None:
+                    continue
+                if path_candidates is None:
+                    path_candidates = candidates
+                else:
+                    path_candidates = {
+                        name: values.union(candidates[name])
+                        for name, values in path_candidates.items()
+                        if name in candidates
+                    }
+        return path_candidates
+
     def _necessary_substitution(
         self,
         paths: Iterable[Type],
-        combinator_type: list[list[MultiArrow]],
-        groups: dict[str, str],
-    ) -> dict[str, Any] | None:
+        combinator: C,
+        combinator_info: CombinatorInfo,
+    ) -> tuple[dict[str, Any], dict[str, set[Any]]] | None:
         """
         Computes a substitution that needs to be part of every substitution S such that
-        S(combinator_type) <= paths.
+        S(combinator_type) <= paths, and finite sets of candidate values for further variables.
 
         If no substitution can make this valid, None is returned.
         """
 
-        result: dict[str, Any] = {}
+        result: dict[str, set[Any]] = {}
 
         for path in paths:
-            unique_substitution: dict[str, Any] | None = None
-            is_unique = True
-
-            for nary_types in combinator_type:
-                for ty in nary_types:
-                    substitution = self.subtypes.infer_substitution(ty.target, path, groups)
-                    if substitution is None:
-                        continue
-                    if unique_substitution is None:
-                        unique_substitution = substitution
-                    else:
-                        is_unique = False
-                        break
-                if not is_unique:
-                    break
-
-            if unique_substitution is None:
+            # some multi-arrow has to cover the path (cached per combinator and path, must not be modified)
+            path_candidates = self._path_candidates_cache.lookup(
+                (combinator, path),
+                partial(self._path_candidates, path, combinator_info.type, combinator_info.groups),
+            )
+            if path_candidates is None:
                 return None  # no substitution for this path
-            if not is_unique:
-                continue  # substitution not unique substitution — skip
 
-            # merge consistent substitution
-            for k, v in unique_substitution.items():
-                if k in result:
-                    if result[k] != v:
+            # every path has to be covered
+            for name, values in path_candidates.items():
+                if name in result:
+                    result[name] = result[name].intersection(values)
+                    if not result[name]:
                         return None  # conflict in necessary substitution
                 else:
-                    result[k] = v
+                    result[name] = values
+
+        substitution = {name: next(iter(values)) for name, values in result.items() if len(values) == 1}
+        return substitution, {name: values for name, values in result.items() if len(values) > 1}
 
-        return result
+    def _named_arguments(self, combinator_info: CombinatorInfo, instantiation: dict[str, Any]) -> tuple[Argument, ...]:
+        """Arguments of a rule corresponding to the parameters of an instantiated combinator."""
+
+        return tuple(
+            ConstantArgument(
+                param.name,
+                instantiation[param.name],
+                combinator_info.groups[param.name],
+            )
+            if isinstance(param, LiteralParameter)
+            else NonTerminalArgument(param.name, self._subst(param.group, combinator_info.groups, instantiation))
+            for param in combinator_info.prefix
+            if isinstance(param, Parameter)
+        )
 
     def construct_solution_space_rules(self, *targets: Type) -> Generator[tuple[Type, RHSRule]]:
         """Generate logic program rules for the given target types."""
 
+        yield from self._construct_rules(targets)
+
+    def _construct_rules(
+        self,
+        targets: Sequence[Type],
+        components: Sequence[tuple[C, CombinatorInfo]] | None = None,
+        known: Collection[Type] = (),
+    ) -> Generator[tuple[Type, RHSRule]]:
+        """Generate logic program rules for the given target types.
+        If `components` are given, only they are tried for the given targets (but all combinators for new targets).
+        Rules of `known` targets other than the given ones are not generated."""
+
         # current target types
-        stack: deque[tuple[Type, tuple[C, CombinatorInfo, Iterator] | None]] = deque(
+        stack: deque[tuple[Type, tuple[C, CombinatorInfo, list[list[MultiArrow]], Iterator] | None]] = deque(
             (target, None) for target in targets
         )
-        seen: set[Type] = set()
+        initial = set(targets)
+        seen: set[Type] = set(known).difference(initial)
 
         while stack:
             current_target, current_target_info = stack.pop()
@@ -313,39 +915,50 @@ class Synthesizer(Generic[C]):
                 if current_target_info is None:
                     seen.add(current_target)
                     # try each combinator
-                    for combinator, combinator_info in self.repository:
+                    for combinator, combinator_info in (
+                        self.repository if components is None or current_target not in initial else components
+                    ):
+                        # Consider only arities whose targets may contain each path
+                        covering_types = list(combinator_info.type.covering(current_target.organized, self.subtypes))
+                        if len(covering_types) == 0:
+                            continue
+
                         # Compute necessary substitutions
-                        substitution = self._necessary_substitution(
+                        necessary_substitution = self._necessary_substitution(
                             current_target.organized,
-                            combinator_info.type,
-                            combinator_info.groups,
+                            combinator,
+                            combinator_info,
                         )
 
                         # If there cannot be a suitable substitution, ignore this combinator
-                        if substitution is None:
+                        if necessary_substitution is None:
                             continue
 
-                        # Keep necessary substitutions and enumerate the rest
-                        selected_instantiations = self._enumerate_substitutions(combinator_info.prefix, substitution)
+                        # Keep necessary substitutions and enumerate the rest (restricted to candidates)
+                        substitution, candidates = necessary_substitution
+                        selected_instantiations = self._enumerate_substitutions(
+                            combinator_info.prefix, substitution, candidates
+                        )
                         stack.appendleft(
                             (
                                 current_target,
                                 (
                                     combinator,
                                     combinator_info,
+                                    covering_types,
                                     iter(selected_instantiations),
                                 ),
                             )
                         )
                 else:
-                    combinator, combinator_info, selected_instantiations = current_target_info
+                    combinator, combinator_info, covering_types, selected_instantiations = current_target_info
                     instantiation = next(selected_instantiations, None)
                     if instantiation is not None:
                         stack.appendleft((current_target, current_target_info))
                         named_arguments: tuple[Argument, ...] | None = None
 
-                        # and every arity of the combinator type
-                        for nary_types in combinator_info.type:
+                        # and every (relevant) arity of the combinator type
+                        for nary_types in covering_types:
                             for subquery in self._subqueries(
                                 nary_types,
                                 current_target.organized,
@@ -353,23 +966,7 @@ class Synthesizer(Generic[C]):
                                 instantiation,
                             ):
                                 if named_arguments is None:  # do this only once for each instantiation
-                                    named_arguments = tuple(
-                                        ConstantArgument(
-                                            param.name,
-                                            instantiation[param.name],
-                                            combinator_info.groups[param.name],
-                                        )
-                                        if isinstance(param, LiteralParameter)
-                                        else NonTerminalArgument(
-                                            param.name,
-                                            param.group.subst(
-                                                combinator_info.groups,
-                                                instantiation,
-                                            ),
-                                        )
-                                        for param in combinator_info.prefix
-                                        if isinstance(param, Parameter)
-                                    )
+                                    named_arguments = self._named_arguments(combinator_info, instantiation)
                                     stack.extendleft(
                                         (argument.origin, None)
                                         for argument in named_arguments
@@ -379,7 +976,7 @@ class Synthesizer(Generic[C]):
                                 anonymous_arguments: tuple[Argument, ...] = tuple(
                                     NonTerminalArgument(
                                         None,
-                                        ty.subst(combinator_info.groups, instantiation),
+                                        self._subst(ty, combinator_info.groups, instantiation),
                                     )
                                     for ty in subquery
                                 )
@@ -389,15 +986,58 @@ class Synthesizer(Generic[C]):
                                         (*named_arguments, *anonymous_arguments),
                                         combinator_info.term_predicates,
                                         combinator,
+                                        combinator_info.attributes,
                                     ),
                                 )
                                 stack.extendleft((q.origin, None) for q in anonymous_arguments)
 
-    def construct_solution_space(self, *targets: Type) -> SolutionSpace[Type, C, str]:
-        """Constructs a logic program in the current environment for the given target types."""
+    def construct_solution_space(
+        self, *targets: Type, solution_space: SolutionSpace[Type, C, str] | None = None
+    ) -> SolutionSpace[Type, C, str]:
+        """Constructs a logic program in the current environment for the given target types.
 
-        solution_space: SolutionSpace[Type, C, str] = SolutionSpace()
-        for nt, rule in self.construct_solution_space_rules(*targets):
-            solution_space.add_rule(nt, rule.terminal, rule.arguments, rule.predicates)
+        Rules are added to the given `solution_space` (e.g. a `SQLiteSolutionSpace`) or to a new one."""
+
+        if solution_space is None:
+            solution_space = SolutionSpace()
+        solution_space.add_rules(self.construct_solution_space_rules(*targets))
 
         return solution_space
+
+    def construct_solution_space_template(
+        self,
+        template: Type,
+        groups: Mapping[str, str],
+        values: Mapping[str, Iterable[Any]] | None = None,
+    ) -> SolutionSpaceTemplate[C]:
+        """Constructs a logic program for all instances of a query template, e.g. `fib & at(<n>)`.
+
+        Each variable of the template ranges over the literals of its group in `groups`
+        (or over the given `values`, which is necessary for non-iterable groups).
+        All instances share common non-terminals, and a particular instance can be enumerated
+        without constructing a new logic program."""
+
+        names = sorted(template.free_vars)
+        domains: list[list[Any]] = []
+        for name in names:
+            if name not in groups:
+                msg = f"Parameter {name} is not abstracted."
+                raise ValueError(msg)
+            group = groups[name]
+            if group not in self.literals:
+                msg = f"Group {group} is not defined in the parameter space."
+                raise ValueError(msg)
+            concrete_values = self.literals[group]
+            if values is not None and name in values:
+                domains.append([value for value in values[name] if value in concrete_values])
+            elif isinstance(concrete_values, Iterable):
+                domains.append(list(concrete_values))
+            else:
+                msg = f"The values of {name} could not be enumerated."
+                raise ValueError(msg)
+
+        targets = [
+            template.subst(dict(groups), dict(zip(names, combination, strict=True)))
+            for combination in product(*domains)
+        ]
+        return SolutionSpaceTemplate(template, dict(groups), self.construct_solution_space(*targets))
@@ -17,12 +17,20 @@ T = TypeVar("T", bound=Hashable)
 class Tree(Generic[T]):
     root: T
     children: tuple["Tree[T]", ...]
+    # synthesized attributes, which are not part of the identity of the tree
+    attributes: dict[str, Any]
     size: int
     _hash: int
 
-    def __init__(self, root: T, children: Sequence["Tree[T]"] = ()) -> None:
+    def __init__(
+        self,
+        root: T,
+        children: Sequence["Tree[T]"] = (),
+        attributes: dict[str, Any] | None = None,
+    ) -> None:
         self.root = root
         self.children = tuple(children)
+        self.attributes = {} if attributes is None else attributes
         self.size = 1 + sum(child.size for child in self.children)
         self._hash = hash((self.root, self.children))
 
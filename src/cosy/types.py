@@ -343,26 +343,102 @@ class TermParameter(Parameter):
 class Predicate:
     constraint: Callable[[dict[str, Any]], bool]
     only_literals: bool
+    #  Names of the variables the constraint depends on (None, if unknown)
+    dependencies: frozenset[str] | None = field(default=None)
+    #  Is the constraint evaluated for an array of values of the last parameter (returning a boolean mask)?
+    vectorized: bool = field(default=False)
+
+    def __call__(self, substitution: dict[str, Any]) -> bool:
+        return self.constraint(substitution)
 
     def __str__(self) -> str:
         return f"[{self.constraint.__name__}, only literals]" if self.only_literals else f"[{self.constraint.__name__}]"
 
 
+@dataclass(frozen=True)
+class Relation(Predicate):
+    """Relation over literal parameters given by the tuples of their values (in the order of `names`).
+    The relation is indexed by the values of bound parameters to enumerate the values of the remaining ones."""
+
+    constraint: Callable[[dict[str, Any]], bool] = field(init=False, repr=False, compare=False)
+    only_literals: bool = field(init=False, default=True)
+    dependencies: frozenset[str] | None = field(init=False, default=None)
+    vectorized: bool = field(init=False, default=False)
+    names: tuple[str, ...] = ()
+    rows: tuple[tuple[Any, ...], ...] = ()
+    # values of a parameter indexed by its position and the values of bound parameters (at given positions)
+    _indexes: dict[tuple[int, tuple[int, ...]], dict[tuple[Any, ...], dict[Any, None]]] = field(
+        init=False, repr=False, compare=False, default_factory=dict
+    )
+    _members: frozenset[tuple[Any, ...]] = field(init=False, repr=False, compare=False, default=frozenset())
+
+    def __post_init__(self) -> None:
+        rows = tuple(dict.fromkeys(tuple(row) for row in self.rows))
+        for row in rows:
+            if len(row) != len(self.names):
+                msg = f"Row {row} does not match the parameters {self.names} of the relation."
+                raise ValueError(msg)
+        object.__setattr__(self, "rows", rows)
+        object.__setattr__(self, "constraint", self._holds)
+        object.__setattr__(self, "dependencies", frozenset(self.names))
+        object.__setattr__(self, "_members", frozenset(rows))
+
+    def _holds(self, substitution: Mapping[str, Any]) -> bool:
+        return tuple(substitution[name] for name in self.names) in self._members
+
+    def values(self, name: str, substitution: Mapping[str, Any]) -> Mapping[Any, None]:
+        """Values of the parameter `name` in rows, which agree with the substitution on the bound parameters.
+        The result is ordered by the first occurrence in rows and supports constant time membership tests."""
+
+        position = self.names.index(name)
+        bound = tuple(i for i, other in enumerate(self.names) if i != position and other in substitution)
+        index = self._indexes.get((position, bound))
+        if index is None:
+            index = {}
+            for row in self.rows:
+                index.setdefault(tuple(row[i] for i in bound), {})[row[position]] = None
+            self._indexes[(position, bound)] = index
+        return index.get(tuple(substitution[self.names[i]] for i in bound), {})
+
+    def __str__(self) -> str:
+        return f"[relation of {', '.join(self.names)}]"
+
+
+@dataclass(frozen=True)
+class Attribute:
+    """Synthesized attribute of trees, computed from the values of parameters and arguments."""
+
+    name: str
+    function: Callable[[dict[str, Any]], Any]
+
+    def __str__(self) -> str:
+        return f"@{self.name}"
+
+
 @dataclass(frozen=True)
 class Implication:
     predicate: Predicate
-    body: Abstraction | Implication | Type
+    body: Abstraction | Implication | Attribution | Type
 
     def __str__(self) -> str:
         return f"{self.predicate} => {self.body}"
 
 
+@dataclass(frozen=True)
+class Attribution:
+    attribute: Attribute
+    body: Abstraction | Implication | Attribution | Type
+
+    def __str__(self) -> str:
+        return f"{self.attribute}.{self.body}"
+
+
 @dataclass(frozen=True)
 class Abstraction:
     """Abstraction of a term parameter or a literal parameter."""
 
     parameter: Parameter
-    body: Abstraction | Implication | Type
+    body: Abstraction | Implication | Attribution | Type
 
     def __str__(self) -> str:
         return f"{self.parameter}.{self.body}"
@@ -0,0 +1,122 @@
+# test for synthesized attributes of trees, which are computed once during enumeration
+
+from collections.abc import Iterable
+from itertools import product
+from typing import Any
+
+import pytest
+from cosy.dsl import DSL
+from cosy.synthesizer import Specification, Synthesizer
+from cosy.tree import Tree
+from cosy.types import Constructor, Literal, Type, Var
+
+SIZE = 3
+
+
+def pos(ab: str) -> Type:
+    return Constructor("pos", Var(ab))
+
+
+def step(b: tuple[int, int], _a: tuple[int, int], p: str) -> str:
+    return f"{p} => {b}"
+
+
+def getpath(path: Tree) -> Iterable[tuple[int, int]]:
+    while path.root != "START":
+        yield path.children[0].root
+        path = path.children[2]
+    yield (0, 0)
+
+
+def neighbors(vs: dict[str, Any]) -> list[tuple[int, int]]:
+    x, y = vs["b"]
+    return [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
+
+
+def loopfree_paths(*, use_attributes: bool) -> set[str]:
+    if use_attributes:
+        step_specification = (
+            DSL()
+            .parameter("b", "int2")
+            .parameter("a", "int2", neighbors)
+            .argument("p", pos("a"))
+            .constraint(lambda vs: vs["b"] not in vs["p"].attributes["visited"])
+            .attribute("visited", lambda vs: vs["p"].attributes["visited"] | {vs["b"]})
+            .suffix(pos("b"))
+        )
+        start_specification = (
+            DSL().attribute("visited", lambda _vs: frozenset({(0, 0)})).suffix("pos" @ Literal((0, 0), "int2"))
+        )
+    else:
+        step_specification = (
+            DSL()
+            .parameter("b", "int2")
+            .parameter("a", "int2", neighbors)
+            .argument("p", pos("a"))
+            .constraint(lambda vs: vs["b"] not in getpath(vs["p"]))
+            .suffix(pos("b"))
+        )
+        start_specification = DSL().suffix("pos" @ Literal((0, 0), "int2"))
+
+    component_specifications: dict[Any, Specification] = {step: step_specification, "START": start_specification}
+    literals = {"int2": frozenset(product(range(SIZE), range(SIZE)))}
+    target = "pos" @ Literal((SIZE - 1, SIZE - 1), "int2")
+    solution_space = Synthesizer(component_specifications, literals).construct_solution_space(target).prune()
+    return {tree.interpret() for tree in solution_space.enumerate_trees(target, max_count=1000)}
+
+
+def test_attributes() -> None:
+    paths = loopfree_paths(use_attributes=True)
+    # there are 12 self-avoiding paths from one corner of a 3x3 grid to the opposite corner
+    assert len(paths) == 12
+    assert paths == loopfree_paths(use_attributes=False)
+
+
+def test_attribute_values() -> None:
+    def leaf() -> int:
+        return 1
+
+    def node(left: int, right: int) -> int:
+        return left + right
+
+    component_specifications: dict[Any, Specification] = {
+        leaf: DSL().attribute("leaves", lambda _vs: 1).suffix(Constructor("tree")),
+        node: DSL()
+        .argument("left", Constructor("tree"))
+        .argument("right", Constructor("tree"))
+        .attribute("leaves", lambda vs: vs["left"].attributes["leaves"] + vs["right"].attributes["leaves"])
+        .suffix(Constructor("tree")),
+    }
+    target = Constructor("tree")
+    solution_space = Synthesizer(component_specifications).construct_solution_space(target)
+    trees = list(solution_space.enumerate_trees(target, max_count=20))
+    assert len(trees) == 20
+    assert all(tree.attributes["leaves"] == tree.interpret() for tree in trees)
+
+
+def test_duplicate_attribute() -> None:
+    component_specifications = {
+        "c": DSL().attribute("a", lambda _vs: 0).attribute("a", lambda _vs: 1).suffix(Constructor("c")),
+    }
+    with pytest.raises(ValueError, match="Duplicate attribute: a"):
+        Synthesizer(component_specifications)
+
+
+def test_contains_tree_attributes() -> None:
+    component_specifications: dict[Any, Specification] = {
+        "zero": DSL().attribute("d", lambda _vs: 0).suffix(Constructor("nat")),
+        "succ": DSL()
+        .argument("n", Constructor("nat"))
+        .constraint(lambda vs: vs["n"].attributes["d"] < 2)
+        .attribute("d", lambda vs: vs["n"].attributes["d"] + 1)
+        .suffix(Constructor("nat")),
+    }
+    nat = Constructor("nat")
+    solution_space = Synthesizer(component_specifications).construct_solution_space(nat)
+    # attributes of trees, which are not enumerated, are computed before checking constraints
+    one = Tree("succ", (Tree("zero"),))
+    assert solution_space.contains_tree(nat, one)
+    assert one.attributes == {"d": 1}
+    assert one.children[0].attributes == {"d": 0}
+    assert solution_space.contains_tree(nat, Tree("succ", (Tree("succ", (Tree("zero"),)),)))
+    assert not solution_space.contains_tree(nat, Tree("succ", (Tree("succ", (Tree("succ", (Tree("zero"),)),)),)))
@@ -0,0 +1,85 @@
+# test that the bottom-up synthesizer agrees with the backward synthesizer
+
+from collections.abc import Container
+from typing import Any
+
+import pytest
+from cosy.bottom_up import BottomUpSynthesizer
+from cosy.dsl import DSL
+from cosy.synthesizer import Specification, Synthesizer
+from cosy.types import Constructor, Literal, Type, Var
+
+
+def trees(synthesizer: Synthesizer, target: Type) -> set[Any]:
+    solution_space = synthesizer.construct_solution_space(target).prune()
+    return set(solution_space.enumerate_trees(target, max_count=100))
+
+
+def fib_specifications() -> dict[Any, Specification]:
+    return {
+        "fib_zero": DSL().suffix(Constructor("fib") & Constructor("at", Literal(0, "int"))),
+        "fib_one": DSL().suffix(Constructor("fib") & Constructor("at", Literal(1, "int"))),
+        "fib_next": DSL()
+        .parameter("z", "int")
+        .parameter("y", "int", lambda vs: [vs["z"] - 1])
+        .parameter("x", "int", lambda vs: [vs["z"] - 2])
+        .argument("f1", Constructor("fib") & Constructor("at", Var("y")))
+        .argument("f2", Constructor("fib") & Constructor("at", Var("x")))
+        .suffix(Constructor("fib") & Constructor("at", Var("z"))),
+    }
+
+
+def test_fibonacci() -> None:
+    parameter_space = {"int": list(range(10))}
+    backward = Synthesizer(fib_specifications(), parameter_space)
+    bottom_up = BottomUpSynthesizer(fib_specifications(), parameter_space)
+    for i in range(12):
+        target = Constructor("fib") & Constructor("at", Literal(i, "int"))
+        expected = trees(backward, target)
+        assert len(expected) == (1 if i < 10 else 0)
+        assert trees(bottom_up, target) == expected
+
+
+def test_intersections_and_taxonomy() -> None:
+    component_specifications: dict[Any, Specification] = {
+        "a": Constructor("A"),
+        "b": Constructor("B"),
+        "f": (Constructor("A") ** Constructor("C")) & (Constructor("B") ** Constructor("D")),
+        "g": DSL()
+        .parameter("x", "bool")
+        .argument("c", Constructor("C"))
+        .suffix((Constructor("D") ** Constructor("E", Var("x"))) & Constructor("F")),
+        "h": Constructor("E", Literal(True, "bool")) ** Constructor("Unreachable") ** Constructor("G"),
+    }
+    taxonomy = {"C": {"Super"}}
+    parameter_space = {"bool": [True, False]}
+    backward = Synthesizer(component_specifications, parameter_space, taxonomy)
+    bottom_up = BottomUpSynthesizer(component_specifications, parameter_space, taxonomy)
+
+    targets = [
+        Constructor("C"),
+        Constructor("Super"),
+        Constructor("C") & Constructor("D"),
+        Constructor("E", Literal(True, "bool")),
+        Constructor("D") ** Constructor("E", Literal(False, "bool")),
+        Constructor("F"),
+        Constructor("G"),
+    ]
+    for target in targets:
+        assert trees(bottom_up, target) == trees(backward, target)
+    assert trees(bottom_up, Constructor("C") & Constructor("D")) == set()
+    assert len(trees(bottom_up, Constructor("E", Literal(True, "bool")))) > 0
+    # the solution space contains only productive rules
+    solution_space = bottom_up.construct_solution_space(Constructor("G"))
+    assert list(solution_space.nonterminals()) == []
+
+
+def test_non_iterable_group() -> None:
+    class Nat(Container):
+        def __contains__(self, value: object) -> bool:
+            return isinstance(value, int) and value >= 0
+
+    component_specifications = {"c": DSL().parameter("x", "nat").suffix(Constructor("c", Var("x")))}
+    synthesizer = BottomUpSynthesizer(component_specifications, {"nat": Nat()})
+    with pytest.raises(ValueError, match="Group nat is not iterable"):
+        synthesizer.construct_solution_space(Constructor("c", Literal(0, "nat")))
@@ -3,7 +3,7 @@ from itertools import combinations
 from random import Random
 
 import pytest
-from cosy.combinatorics import maximal_elements, minimal_covers
+from cosy.combinatorics import componentwise_dominance, maximal_elements, maximal_elements_skyline, minimal_covers
 
 
 @pytest.fixture
@@ -55,6 +55,33 @@ def test_maximal_elements(elements) -> None:
                 assert not compare(x, y), f"Maximal elements {x} and {y} are not incomparable"
 
 
+def test_maximal_elements_skyline(elements) -> None:
+    """Test maximal_elements_skyline function against maximal_elements."""
+
+    def compare(x, y):
+        return all(a <= b for a, b in zip(x, y, strict=False))
+
+    # duplicates are represented once
+    elements = elements + elements[:20]
+    expected = set(maximal_elements(elements, compare))
+    assert set(maximal_elements_skyline(elements, compare)) == expected
+    assert set(maximal_elements_skyline(elements, compare, key=sum)) == expected
+
+
+def test_maximal_elements_skyline_vectorized(elements) -> None:
+    """Test maximal_elements_skyline function with vectorized dominance tests (requires numpy)."""
+    pytest.importorskip("numpy")
+
+    def compare(x, y):
+        return all(a <= b for a, b in zip(x, y, strict=False))
+
+    elements = elements + elements[:20]
+    expected = set(maximal_elements(elements, compare))
+    maximal = maximal_elements_skyline(elements, compare, key=sum, dominance=componentwise_dominance)
+    assert len(maximal) == len(expected)
+    assert set(maximal) == expected
+
+
 def test_minimal_covers(sets, to_cover) -> None:
     """Test minimal_covers function."""
     covers = minimal_covers(
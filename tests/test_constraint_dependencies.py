@@ -0,0 +1,63 @@
+# test for constraints with declared dependencies, which are checked on partial argument assignments
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import pytest
+from cosy.dsl import DSL
+from cosy.synthesizer import Specification, Synthesizer
+from cosy.types import Constructor, Literal, Var
+
+
+def triple(_n: int, x: int, y: int, z: int) -> tuple[int, int, int]:
+    return (x, y, z)
+
+
+def solutions(dependencies: Iterable[str] | None, calls: list[str]) -> set[Any]:
+    def first_two_differ(vs: Mapping[str, Any]) -> bool:
+        calls.append("first_two_differ")
+        return vs["x"].interpret() != vs["y"].interpret()
+
+    def all_below_bound(vs: Mapping[str, Any]) -> bool:
+        calls.append("all_below_bound")
+        return vs["x"].interpret() + vs["y"].interpret() + vs["z"].interpret() < vs["n"]
+
+    component_specifications: dict[Any, Specification] = {
+        **{i: DSL().suffix(Constructor("nat")) for i in range(4)},
+        triple: DSL()
+        .parameter("n", "int")
+        .argument("x", Constructor("nat"))
+        .argument("y", Constructor("nat"))
+        .argument("z", Constructor("nat"))
+        .constraint(first_two_differ, dependencies)
+        .constraint(all_below_bound)
+        .suffix(Constructor("triple", Var("n"))),
+    }
+
+    synthesizer = Synthesizer(component_specifications, {"int": [4]})
+    target = Constructor("triple", Literal(4, "int"))
+    solution_space = synthesizer.construct_solution_space(target).prune()
+    return {tree.interpret() for tree in solution_space.enumerate_trees(target, max_count=1000)}
+
+
+def test_constraint_dependencies() -> None:
+    calls_without: list[str] = []
+    calls_with: list[str] = []
+
+    # the argument x, y, and z range over the constants 0, 1, 2, and 3
+    expected = {(x, y, z) for x in range(4) for y in range(4) for z in range(4) if x != y and x + y + z < 4}
+    assert solutions(None, calls_without) == expected
+    assert solutions(["x", "y"], calls_with) == expected
+    # the constraint on x and y is checked before z is chosen
+    assert calls_with.count("first_two_differ") < calls_without.count("first_two_differ")
+
+
+def test_undeclared_dependency() -> None:
+    component_specifications = {
+        triple: DSL()
+        .argument("x", Constructor("nat"))
+        .constraint(lambda vs: vs["x"] != vs["y"], ["x", "y"])
+        .suffix(Constructor("nat")),
+    }
+    with pytest.raises(ValueError, match="Dependency y is not abstracted."):
+        Synthesizer(component_specifications)
@@ -0,0 +1,76 @@
+# test the frozen (array-backed) representation of solution spaces
+
+from typing import Any
+
+import pytest
+from cosy.dsl import DSL
+from cosy.frozen_solution_space import FrozenSolutionSpace
+from cosy.solution_space import ConstantArgument, SolutionSpace
+from cosy.synthesizer import Specification, Synthesizer
+from cosy.tree import Tree
+from cosy.types import Constructor, Literal, Var
+
+component_specifications: dict[Any, Specification] = {
+    "zero": Constructor("nat", Literal(0, "int")),
+    "succ": DSL()
+    .parameter("x", "int")
+    .parameter("y", "int", lambda vs: [vs["x"] - 1])
+    .argument("n", Constructor("nat", Var("y")))
+    .suffix(Constructor("nat", Var("x"))),
+    "plus": DSL()
+    .parameter("x", "int")
+    .parameter("y", "int")
+    .parameter("z", "int")
+    .parameter_constraint(lambda vs: vs["x"] == vs["y"] + vs["z"])
+    .argument("l", Constructor("nat", Var("y")))
+    .argument("r", Constructor("nat", Var("z")))
+    .constraint(lambda vs: vs["l"].size <= vs["r"].size, dependencies=["l", "r"])
+    .suffix(Constructor("nat", Var("x"))),
+    # unproductive
+    "loop": Constructor("nat", Literal(4, "int")) ** Constructor("nat", Literal(4, "int")),
+}
+
+
+def rules(solution_space: SolutionSpace) -> dict[Any, list[Any]]:
+    return {nt: list(rhss) for nt, rhss in solution_space.as_tuples()}
+
+
+def test_frozen_solution_space() -> None:
+    synthesizer = Synthesizer(component_specifications, {"int": range(5)})
+    target = Constructor("nat", Literal(4, "int"))
+    solution_space = synthesizer.construct_solution_space(target)
+    frozen = solution_space.freeze()
+    assert isinstance(frozen, FrozenSolutionSpace)
+    assert rules(frozen) == rules(solution_space)
+    assert frozen.rule_count == sum(len(rhss) for _, rhss in solution_space.as_tuples())
+    assert rules(frozen.thaw()) == rules(solution_space)
+
+    pruned = frozen.prune()
+    assert isinstance(pruned, FrozenSolutionSpace)
+    assert rules(pruned) == rules(solution_space.prune())
+
+    # there are infinitely many trees (e.g. adding zero)
+    trees = set(pruned.enumerate_trees(target, 50))
+    assert len(trees) == 50
+    assert all(solution_space.contains_tree(target, tree) for tree in trees)
+    assert all(frozen.contains_tree(target, tree) for tree in solution_space.enumerate_trees(target, 50))
+    assert not frozen.contains_tree(target, Tree("zero"))
+
+    with pytest.raises(ValueError, match="cannot be modified"):
+        frozen.add_rule(target, "zero", (), ())
+
+
+def test_constants_of_different_types() -> None:
+    solution_space: SolutionSpace = SolutionSpace()
+    arguments = tuple(ConstantArgument(name, value, "any") for name, value in [("a", 1), ("b", True), ("c", 1.0)])
+    solution_space.add_rule("s", 1, arguments, ())
+    solution_space.add_rule("s", True, (), ())
+    frozen = solution_space.freeze()
+    # equal values of different types are kept apart
+    constants = [
+        argument.value for rule in frozen["s"] for argument in rule.arguments if isinstance(argument, ConstantArgument)
+    ]
+    assert [type(value) for value in constants] == [int, bool, float]
+    assert [type(rule.terminal) for rule in frozen["s"]] == [int, bool]
+    [tree, _] = sorted(frozen.enumerate_trees("s"), key=lambda tree: tree.size, reverse=True)
+    assert [type(child.root) for child in tree.children] == [int, bool, float]
@@ -0,0 +1,46 @@
+# test that compiled prefixes enumerate the same substitutions as the fair enumeration
+
+from typing import Any
+
+from cosy.dsl import DSL
+from cosy.synthesizer import Synthesizer
+from cosy.types import Constructor, Var
+
+
+def canonical(substitutions: Any) -> list[str]:
+    # values of pairs are not hashable
+    return sorted(repr(sorted(substitution.items())) for substitution in substitutions)
+
+
+def test_compiled_prefix() -> None:
+    calls: list[Any] = []
+
+    def values(vs: dict[str, Any]) -> list[int]:
+        calls.append(dict(vs))
+        return [vs["x"] + 1, vs["x"] + 2]
+
+    component_specifications = {
+        "c": DSL()
+        .parameter("x", "int")
+        .parameter_constraint(lambda vs: vs["x"] % 2 == 0)
+        .parameter("y", "int", values)
+        .argument("a", Constructor("a", Var("y")))
+        .parameter("z", "pair")
+        .parameter_constraint(lambda vs: vs["z"][0] < vs["y"])
+        .suffix(Constructor("c", Var("x")))
+    }
+    parameter_space: dict[str, list[Any]] = {"int": list(range(6)), "pair": [[0], [3]]}
+    synthesizer = Synthesizer(component_specifications, parameter_space)
+    prefix = synthesizer.repository[0][1].prefix
+
+    for substitution, candidates in [({}, None), ({"y": 3}, None), ({}, {"x": {0, 1, 2}}), ({"x": 1}, None)]:
+        expected = canonical(synthesizer._enumerate_substitutions_fairly(prefix, substitution, candidates))
+        assert canonical(synthesizer._enumerate_substitutions(prefix, substitution, candidates)) == expected
+    assert canonical(synthesizer._enumerate_substitutions(prefix, {"y": 3}, None)) == canonical(
+        [{"x": 2, "y": 3, "z": [0]}]
+    )
+
+    # candidate functions are called once for each inferred value and see only previous parameters
+    calls.clear()
+    list(synthesizer._enumerate_substitutions(prefix, {"y": 3}, None))
+    assert calls == [{"x": 0, "y": 3}, {"x": 2, "y": 3}, {"x": 4, "y": 3}]
@@ -2,6 +2,8 @@
 
 from collections.abc import Container
 
+import pytest
+
 from cosy.dsl import DSL
 from cosy.synthesizer import Synthesizer
 from cosy.types import Constructor, Literal, Omega, Type, Var
@@ -109,3 +111,45 @@ def test_infinite_values() -> None:
     solution_space = synthesizer.construct_solution_space(target)
 
     assert [tree.interpret() for tree in solution_space.enumerate_trees(target)] == ["C 3 (C 2 (C 1 (ZERO)))"]
+
+
+def test_candidates_of_several_multi_arrows() -> None:
+    # the value of a literal variable is inferred, although several multi-arrows are applicable
+    class Nat(Container):
+        def __contains__(self, value: object) -> bool:
+            return isinstance(value, int) and value >= 0
+
+    def f(x: int, arg: str) -> str:
+        return f"F {x} ({arg})"
+
+    component_specifications = {
+        f: DSL()
+        .parameter("x", "nat")
+        .suffix((Constructor("a") ** ("c" @ Var("x"))) & (Constructor("b") ** ("c" @ Var("x")))),
+        "A": Constructor("a"),
+        "B": Constructor("b"),
+    }
+
+    synthesizer = Synthesizer(component_specifications, {"nat": Nat()})
+    target = "c" @ Literal(3, "nat")
+    solution_space = synthesizer.construct_solution_space(target)
+    assert {tree.interpret() for tree in solution_space.enumerate_trees(target)} == {"F 3 (A)", "F 3 (B)"}
+
+    subtypes = synthesizer.subtypes
+    groups = {"x": "nat", "y": "nat"}
+    # both alternatives constrain x
+    subtype = Constructor("c", Var("x")) & Constructor("c", Var("x") & Var("x"))
+    assert subtypes.infer_candidates(subtype, "c" @ Literal(3, "nat"), groups) == {"x": {3}}
+    # each alternative constrains a different variable
+    subtype = Constructor("c", Var("x")) & Constructor("c", Var("y"))
+    assert subtypes.infer_candidates(subtype, "c" @ Literal(3, "nat"), groups) == {}
+    subtype = Constructor("c", Var("x")) & Constructor("d", Var("y"))
+    assert subtypes.infer_candidates(subtype, "c" @ Literal(3, "nat"), groups) == {"x": {3}}
+    assert subtypes.infer_candidates(subtype, "d" @ Literal(3, "nat"), groups) == {"y": {3}}
+    assert subtypes.infer_candidates(subtype, "e" @ Literal(3, "nat"), groups) is None
+
+    # the deprecated unique substitution is derived from the candidates
+    with pytest.warns(DeprecationWarning, match="infer_candidates"):
+        assert subtypes.infer_substitution(subtype, "c" @ Literal(3, "nat"), groups) == {"x": 3}
+    with pytest.warns(DeprecationWarning):
+        assert subtypes.infer_substitution(subtype, "e" @ Literal(3, "nat"), groups) is None
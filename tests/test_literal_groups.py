@@ -0,0 +1,76 @@
+# test normalization of literal groups
+
+from collections.abc import Container
+from itertools import islice
+
+from cosy.dsl import DSL
+from cosy.literals import CachedContainer, IndexedGroup, Interval, normalize_group
+from cosy.synthesizer import Synthesizer
+from cosy.types import Constructor, Literal, Var
+
+
+def test_normalize_group() -> None:
+    group = normalize_group([3, 1, 2, 1])
+    assert isinstance(group, IndexedGroup)
+    assert list(group) == [3, 1, 2, 1]
+    assert 2 in group and 4 not in group and [2] not in group
+
+    # unhashable values are compared
+    unhashable = normalize_group([[0], [1]])
+    assert isinstance(unhashable, IndexedGroup)
+    assert [1] in unhashable and [2] not in unhashable
+
+    numbers = range(10**12)
+    assert normalize_group(numbers) is numbers
+    assert normalize_group(Interval(-2, 10**12)) == range(-2, 10**12 + 1)
+    nat = Interval(0)
+    assert normalize_group(nat) is nat
+    assert 10**20 in nat and -1 not in nat
+    assert list(islice(nat, 3)) == [0, 1, 2]
+    # booleans are members of bounded and unbounded intervals alike
+    assert True in nat and True in normalize_group(Interval(0, 3)) and True not in Interval(2)
+
+    # strings are not split into characters
+    assert normalize_group("abc") == "abc"
+
+
+def test_cached_container() -> None:
+    calls: list[object] = []
+
+    class Even(Container):
+        def __contains__(self, value: object) -> bool:
+            calls.append(value)
+            return isinstance(value, int) and value % 2 == 0
+
+    group = normalize_group(Even())
+    assert isinstance(group, CachedContainer)
+    assert [0 in group, 1 in group, 0 in group, 1 in group] == [True, False, True, False]
+    assert calls == [0, 1]
+    assert group.cache_info().hits == 2
+
+    class Integers(Container):
+        def __contains__(self, value: object) -> bool:
+            return type(value) is int
+
+    # equal values of different types are cached separately
+    integers = normalize_group(Integers())
+    assert [1 in integers, True in integers, 1.0 in integers, 1 in integers] == [True, False, False, True]
+
+
+def test_interval_groups() -> None:
+    component_specifications = {
+        "c": DSL()
+        .parameter("x", "int")
+        .parameter("y", "int", lambda vs: [vs["x"] * 2])
+        .suffix(Constructor("c", Var("x")) & Constructor("d", Var("y"))),
+    }
+    parameter_space = {"int": Interval(0, 10**15)}
+    synthesizer = Synthesizer(component_specifications, parameter_space)
+    target = Constructor("c", Literal(10**14, "int"))
+    solution_space = synthesizer.construct_solution_space(target).prune()
+    assert [tree.children[1].root for tree in solution_space.enumerate_trees(target)] == [2 * 10**14]
+
+    # unbounded intervals are enumerated lazily
+    synthesizer = Synthesizer({"n": DSL().parameter("x", "nat").suffix(Constructor("n"))}, {"nat": Interval(0)})
+    substitutions = synthesizer._enumerate_substitutions(synthesizer.repository[0][1].prefix, {})
+    assert list(islice(substitutions, 3)) == [{"x": 0}, {"x": 1}, {"x": 2}]
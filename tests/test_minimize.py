@@ -0,0 +1,105 @@
+# test that minimized solution spaces derive the same trees with fewer non-terminals and rules
+
+from typing import Any
+
+from cosy.dsl import DSL
+from cosy.frozen_solution_space import FrozenSolutionSpace
+from cosy.solution_space import ConstantArgument, MinimizationStatistics, NonTerminalArgument, SolutionSpace
+from cosy.synthesizer import Specification, Synthesizer
+from cosy.tree import Tree
+from cosy.types import Constructor, Literal, Var
+
+
+def same_trees(solution_space: SolutionSpace, minimized: SolutionSpace, start: Any, count: int = 50) -> bool:
+    return all(minimized.contains_tree(start, tree) for tree in solution_space.enumerate_trees(start, count)) and all(
+        solution_space.contains_tree(start, tree) for tree in minimized.enumerate_trees(start, count)
+    )
+
+
+def test_merge_intersections() -> None:
+    n, m = Constructor("n"), Constructor("m")
+    component_specifications: dict[Any, Specification] = {
+        "z": n & m,
+        "s": (n**n) & (m**m),
+        "t": (n**n) & (m**m),
+    }
+    solution_space = Synthesizer(component_specifications).construct_solution_space(n, m, n & m)
+
+    statistics = MinimizationStatistics()
+    minimized = solution_space.minimize(statistics=statistics)
+    # n, m and both orders of n & m derive the same trees
+    assert statistics.nonterminals_before == 4
+    assert statistics.merged_nonterminals == 3
+    assert statistics.rules_after == 3
+    assert statistics.reduction == 0.75
+    assert len(list(minimized.nonterminals())) == 1
+
+    # kept non-terminals are representatives, unreachable non-terminals are removed
+    statistics = MinimizationStatistics()
+    minimized = solution_space.minimize(keep=[m], statistics=statistics)
+    assert list(minimized.nonterminals()) == [m]
+    assert statistics.unreachable_nonterminals == 3
+    assert all(rule.non_terminals == {m} for rule in minimized[m] if rule.arguments)
+    assert same_trees(solution_space, minimized, m)
+
+
+def test_duplicate_rules() -> None:
+    solution_space: SolutionSpace[str, str, str] = SolutionSpace()
+    for _ in range(3):
+        solution_space.add_rule("a", "f", (NonTerminalArgument(None, "b"),), ())
+        solution_space.add_rule("b", "x", (), ())
+    solution_space.add_rule("c", "f", (NonTerminalArgument(None, "b"),), ())
+    solution_space.add_rule("c", "f", (NonTerminalArgument(None, "d"),), ())
+    solution_space.add_rule("d", "x", (), ())
+
+    statistics = MinimizationStatistics()
+    minimized = solution_space.minimize(keep=["a", "c"], statistics=statistics)
+    assert statistics.duplicate_rules == 4
+    assert statistics.merged_nonterminals == 1
+    # both kept non-terminals are preserved, b and d are merged
+    assert set(minimized.nonterminals()) == {"a", "b", "c"}
+    assert list(minimized["c"]) == list(minimized["a"])
+    assert set(minimized.enumerate_trees("c")) == {Tree("f", (Tree("x"),))}
+    assert "merged" in str(statistics)
+
+
+def test_typed_duplicates() -> None:
+    # equal terminals and constants of different types are neither duplicates nor merged
+    solution_space: SolutionSpace[str, Any, str] = SolutionSpace()
+    for value in [1, True, 1.0]:
+        solution_space.add_rule("a", value, (), ())
+        solution_space.add_rule("b", "f", (ConstantArgument("x", value, "int"),), ())
+        solution_space.add_rule(f"c {value!r}", value, (), ())
+    solution_space.add_rule("b", "f", (ConstantArgument("x", 1, "int"),), ())
+
+    statistics = MinimizationStatistics()
+    minimized = solution_space.minimize(statistics=statistics)
+    assert statistics.duplicate_rules == 1
+    assert statistics.merged_nonterminals == 0
+    assert [type(rule.terminal) for rule in minimized["a"]] == [int, bool, float]
+    constants = [rule.arguments[0] for rule in minimized["b"]]
+    assert [type(argument.value) for argument in constants if isinstance(argument, ConstantArgument)] == [
+        int,
+        bool,
+        float,
+    ]
+    assert [type(rule.terminal) for nt in ["c 1", "c True", "c 1.0"] for rule in minimized[nt]] == [int, bool, float]
+
+
+def test_minimize_literals() -> None:
+    component_specifications: dict[Any, Specification] = {
+        "zero": Constructor("nat", Literal(0, "int")),
+        "succ": DSL()
+        .parameter("x", "int")
+        .parameter("y", "int", lambda vs: [vs["x"] - 1])
+        .argument("n", Constructor("nat", Var("y")))
+        .suffix(Constructor("nat", Var("x")) & Constructor("even")),
+    }
+    target = Constructor("nat", Literal(3, "int"))
+    solution_space = Synthesizer(component_specifications, {"int": range(4)}).construct_solution_space(target)
+    statistics = MinimizationStatistics()
+    minimized = solution_space.freeze().minimize(keep=[target], statistics=statistics)
+    assert isinstance(minimized, FrozenSolutionSpace)
+    # non-terminals deriving different numbers are not merged
+    assert statistics.merged_nonterminals == 0
+    assert list(minimized.enumerate_trees(target)) == list(solution_space.enumerate_trees(target))
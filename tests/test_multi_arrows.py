@@ -0,0 +1,55 @@
+# test for lazily expanded arities of combinator types
+
+from typing import Any
+
+from cosy.subtypes import Subtypes
+from cosy.synthesizer import MultiArrows, Specification, Synthesizer
+from cosy.types import Constructor, Type
+
+
+def chain(*names: str) -> Type:
+    # A -> B -> ... -> Z
+    result: Type = Constructor(names[-1])
+    for name in reversed(names[:-1]):
+        result = Constructor(name) ** result
+    return result
+
+
+def test_lazy_expansion() -> None:
+    multi_arrows = MultiArrows(chain("A", "B", "C", "D") & chain("E", "F"))
+    assert len(multi_arrows._levels) == 0
+    assert {str(m) for m in multi_arrows[1]} == {"['A'] -> B -> C -> D", "['E'] -> F"}
+    assert len(multi_arrows._levels) == 2
+    assert len(multi_arrows) == 4
+    assert [len(level) for level in multi_arrows] == [1, 2, 1, 1]
+
+
+def test_covering_arities() -> None:
+    subtypes = Subtypes({"D": {"Super"}})
+    multi_arrows = MultiArrows(chain("A", "B", "C", "D") & chain("E", "F"))
+    assert [level[0].args for level in multi_arrows.covering(Constructor("D").organized, subtypes)] == [
+        (Constructor("A"), Constructor("B"), Constructor("C"))
+    ]
+    assert len(list(multi_arrows.covering(Constructor("Super").organized, subtypes))) == 1
+    # every path has to be covered within the same arity
+    assert len(list(multi_arrows.covering((Constructor("D") & Constructor("F")).organized, subtypes))) == 0
+    # arrow paths are covered by arities with arrow targets
+    assert len(list(multi_arrows.covering(chain("C", "D").organized, subtypes))) == 3
+
+
+def test_higher_order_synthesis() -> None:
+    component_specifications: dict[Any, Specification] = {
+        "f": chain("A", "B", "C", "D") & chain("E", "F"),
+        "a": Constructor("A"),
+        "b": Constructor("B"),
+        "c": Constructor("C"),
+        "e": Constructor("E"),
+    }
+    synthesizer = Synthesizer(component_specifications)
+    for target, expected in [
+        (Constructor("D"), {"f a b c"}),
+        (Constructor("F"), {"f e"}),
+        (chain("C", "D"), {"f a b"}),
+    ]:
+        solution_space = synthesizer.construct_solution_space(target).prune()
+        assert {str(tree) for tree in solution_space.enumerate_trees(target)} == expected
@@ -0,0 +1,53 @@
+# test for observational equivalence pruning during enumeration
+
+from itertools import islice
+from typing import Any
+
+from cosy.dsl import DSL
+from cosy.solution_space import EnumerationStatistics
+from cosy.synthesizer import Specification, Synthesizer
+from cosy.types import Constructor
+
+
+def one() -> int:
+    return 1
+
+
+def plus(x: int, y: int) -> int:
+    return x + y
+
+
+def times(x: int, y: int) -> int:
+    return x * y
+
+
+def test_observational_equivalence() -> None:
+    component_specifications: dict[Any, Specification] = {
+        one: DSL().suffix(Constructor("expr")),
+        plus: DSL().suffix(Constructor("expr") ** Constructor("expr") ** Constructor("expr")),
+        times: DSL().suffix(Constructor("expr") ** Constructor("expr") ** Constructor("expr")),
+    }
+    target = Constructor("expr")
+    solution_space = Synthesizer(component_specifications).construct_solution_space(target).prune()
+
+    statistics = EnumerationStatistics()
+    trees = list(
+        islice(
+            solution_space.enumerate_trees(
+                target,
+                equivalence={target: lambda tree: tree.interpret()},
+                statistics=statistics,
+            ),
+            10,
+        )
+    )
+    values = [tree.interpret() for tree in trees]
+
+    # each value is represented only once
+    assert len(values) == len(set(values)) == 10
+    assert statistics.pruned > 0
+    assert 0 < statistics.pruning_ratio < 1
+
+    # without pruning, the same values are represented by many trees
+    unpruned = [tree.interpret() for tree in islice(solution_space.enumerate_trees(target), 100)]
+    assert len(set(unpruned)) < len(unpruned)
@@ -0,0 +1,100 @@
+# test for the bounded cache of candidates for combinators and target paths
+
+from typing import Any
+
+from cosy.cache import Cache
+from cosy.dsl import DSL
+from cosy.synthesizer import Specification, Synthesizer
+from cosy.types import Constructor, Literal, Type, Var
+
+component_specifications: dict[Any, Specification] = {
+    "fib_zero": DSL().suffix(Constructor("fib") & Constructor("at", Literal(0, "int"))),
+    "fib_one": DSL().suffix(Constructor("fib") & Constructor("at", Literal(1, "int"))),
+    "fib_next": DSL()
+    .parameter("z", "int")
+    .parameter("y", "int", lambda vs: [vs["z"] - 1])
+    .parameter("x", "int", lambda vs: [vs["z"] - 2])
+    .argument("f1", Constructor("fib") & Constructor("at", Var("y")))
+    .argument("f2", Constructor("fib") & Constructor("at", Var("x")))
+    .suffix(Constructor("fib") & Constructor("at", Var("z"))),
+}
+
+
+def test_path_cache() -> None:
+    parameter_space = {"int": list(range(20))}
+    targets = [Constructor("fib") & Constructor("at", Literal(i, "int")) for i in range(20)]
+    cached = Synthesizer(component_specifications, parameter_space)
+    small = Synthesizer(component_specifications, parameter_space, path_cache_size=10)
+    uncached = Synthesizer(component_specifications, parameter_space, path_cache_size=0)
+    for target in targets:
+        expected = set(uncached.construct_solution_space(target).enumerate_trees(target))
+        assert set(cached.construct_solution_space(target).enumerate_trees(target)) == expected
+        assert set(small.construct_solution_space(target).enumerate_trees(target)) == expected
+
+    info = cached.path_cache_info()
+    # three combinators times 20 "at" paths and one "fib" path
+    assert info.misses == info.currsize == 63
+    assert info.hits > info.misses
+    assert small.path_cache_info().currsize == 10
+    assert uncached.path_cache_info().currsize == uncached.path_cache_info().hits == 0
+
+    # cached results depend on the taxonomy
+    cached.subtypes.add_edges({"fib": {"sequence"}})
+    assert cached.path_cache_info().currsize == 0
+
+
+def test_cache() -> None:
+    cache: Cache[str, int] = Cache(2)
+    assert cache.lookup("a", lambda: 1) == 1
+    assert cache.lookup("b", lambda: 2) == 2
+    assert cache.lookup("a", lambda: 0) == 1
+    # "b" is the least recently used entry
+    assert cache.lookup("c", lambda: 3) == 3
+    assert cache.lookup("b", lambda: 4) == 4
+    assert cache.lookup("a", lambda: 5) == 5
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (1, 5, 2, 2)
+
+
+def test_subst_cache() -> None:
+    parameter_space = {"int": list(range(20))}
+    cached = Synthesizer(component_specifications, parameter_space)
+    uncached = Synthesizer(component_specifications, parameter_space, subst_cache_size=0)
+    arguments: dict[Any, list[Any]] = {}
+    for i in range(20):
+        target = Constructor("fib") & Constructor("at", Literal(i, "int"))
+        rules = list(cached.construct_solution_space_rules(target))
+        assert [(nt, rule.arguments) for nt, rule in rules] == [
+            (nt, rule.arguments) for nt, rule in uncached.construct_solution_space_rules(target)
+        ]
+        for _, rule in rules:
+            for argument in rule.arguments:
+                arguments.setdefault(argument.origin, []).append(argument.origin)
+
+    info = cached.subst_cache_info()
+    assert info.hits > info.misses > 0
+    # instances of argument types are shared
+    assert all(all(ty is tys[0] for ty in tys) for tys in arguments.values() if isinstance(tys[0], Type))
+
+
+def test_subst_cache_intersections() -> None:
+    component_specifications: dict[Any, Specification] = {
+        "f": DSL()
+        .parameter("x", "int")
+        .suffix(
+            (Constructor("a", Var("x")) ** Constructor("t", Var("x")))
+            & (Constructor("b", Var("x")) ** Constructor("u", Var("x")))
+        ),
+    }
+    synthesizer = Synthesizer(component_specifications, {"int": range(10)})
+    target = Constructor("t", Literal(3, "int")) & Constructor("u", Literal(3, "int"))
+    # the argument is an intersection, which is newly constructed for each query
+    rules = list(synthesizer.construct_solution_space_rules(target))
+    assert [rule.arguments[-1].origin.organized for _, rule in rules] == [
+        {Constructor("a", Literal(3, "int")), Constructor("b", Literal(3, "int"))}
+    ]
+    currsize = synthesizer.subst_cache_info().currsize
+    for _ in range(5):
+        assert list(synthesizer.construct_solution_space_rules(target)) == rules
+    # only the components of intersections are cached
+    assert synthesizer.subst_cache_info().currsize == currsize == 2
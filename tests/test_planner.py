@@ -0,0 +1,113 @@
+# test planning the evaluation order of literal parameters and predicates
+
+from collections.abc import Mapping
+from functools import partial
+from typing import Any
+
+from cosy.dsl import DSL
+from cosy.planner import introspect_dependencies, plan_prefix
+from cosy.synthesizer import Synthesizer
+from cosy.types import Constructor, LiteralParameter, Predicate, Var
+
+
+def first_is_zero(name: str, vs: dict[str, Any]) -> bool:
+    return vs[name] == 0
+
+
+def test_introspect_dependencies() -> None:
+    assert introspect_dependencies(lambda vs: vs["x"] < vs.get("y")) == {"x", "y"}
+    assert introspect_dependencies(lambda vs, offset=1: vs["x"] + offset) == {"x"}
+    assert introspect_dependencies(lambda _vs: True) == set()
+    # unknown dependencies
+    assert introspect_dependencies(lambda vs: sum(vs.values())) is None
+    assert introspect_dependencies(lambda vs: any(vs["x"] < y for y in (1, 2))) is None
+    assert introspect_dependencies(partial(first_is_zero, "x")) is None
+    name = "x"
+    assert introspect_dependencies(lambda vs: vs[name]) is None
+
+
+def test_plan_prefix() -> None:
+    x = LiteralParameter("x", "big")
+    y = LiteralParameter("y", "small")
+    z = LiteralParameter("z", "big", lambda vs: [vs["y"]])
+    x_positive = Predicate(lambda vs: vs["x"] > 0, True)
+    unknown = Predicate(partial(first_is_zero, "y"), True)
+    prefix: list[Any] = [x, y, z, x_positive, unknown]
+    group_sizes = {"big": 100, "small": 2}
+
+    # small groups and computed values first, predicates as soon as their dependencies are bound
+    assert plan_prefix(prefix, group_sizes) == [y, z, x, x_positive, unknown]
+    # bound parameters are evaluated first
+    assert plan_prefix(prefix, group_sizes, bound={"x"}) == [x, x_positive, y, z, unknown]
+    # parameters constrained by predicates are preferred
+    assert plan_prefix([y, x, x_positive], group_sizes) == [x, x_positive, y]
+
+
+def test_hoisted_predicates() -> None:
+    calls: list[Any] = []
+
+    def x_is_small(vs: Mapping[str, Any]) -> bool:
+        calls.append(vs["x"])
+        return vs["x"] < 2
+
+    component_specifications = {
+        "c": DSL()
+        .parameter("x", "int")
+        .parameter("y", "int")
+        .parameter("z", "int")
+        .parameter_constraint(lambda vs: vs["y"] <= vs["z"])
+        .parameter_constraint(x_is_small)
+        .suffix(Constructor("c", Var("x"))),
+    }
+    synthesizer = Synthesizer(component_specifications, {"int": range(20)})
+    prefix = synthesizer.repository[0][1].prefix
+
+    def canonical(substitutions: Any) -> list[tuple[tuple[str, Any], ...]]:
+        return sorted(tuple(sorted(vs.items())) for vs in substitutions)
+
+    expected = canonical(synthesizer._enumerate_substitutions_fairly(prefix, {}))
+    calls.clear()
+    assert canonical(synthesizer._enumerate_substitutions(prefix, {})) == expected
+    assert len(expected) == 2 * 210
+    # the constraint on x is evaluated once for each value of x
+    assert sorted(calls) == list(range(20))
+
+
+def is_odd(name: str, vs: Mapping[str, Any]) -> bool:
+    return vs[name] % 2 == 1
+
+
+class Bounds:
+    def __init__(self, bound: int) -> None:
+        self.bound = bound
+
+    def positive(self, vs: Mapping[str, Any]) -> bool:
+        return vs["x"] > 0
+
+    def above(self, vs: Mapping[str, Any]) -> list[int]:
+        return list(range(vs["x"] + 1, self.bound))
+
+
+def test_bound_functions() -> None:
+    # the substitution is not the first parameter of bound methods and partial objects
+    bounds = Bounds(4)
+    assert introspect_dependencies(bounds.positive) is None
+    assert introspect_dependencies(bounds.above) is None
+
+    def f(x: int, y: int) -> str:
+        return f"f {x} {y}"
+
+    component_specifications = {
+        f: DSL()
+        .parameter("x", "int")
+        .parameter("y", "int", bounds.above)
+        .parameter_constraint(bounds.positive)
+        .parameter_constraint(partial(is_odd, "y"))
+        .suffix(Constructor("c")),
+    }
+    synthesizer = Synthesizer(component_specifications, {"int": range(4)})
+    solution_space = synthesizer.construct_solution_space(Constructor("c")).prune()
+    assert sorted(tree.interpret() for tree in solution_space.enumerate_trees(Constructor("c"))) == [
+        "f 1 3",
+        "f 2 3",
+    ]
@@ -0,0 +1,73 @@
+# test for solution spaces shared by all instances of a query template
+
+from collections.abc import Container
+from typing import Any
+
+import pytest
+from cosy.dsl import DSL
+from cosy.synthesizer import Specification, Synthesizer
+from cosy.types import Constructor, Literal, Var
+
+
+def fib_zero() -> int:
+    return 0
+
+
+def fib_one() -> int:
+    return 1
+
+
+def fib_next(_z: int, _y: int, _x: int, f1: int, f2: int) -> int:
+    return f1 + f2
+
+
+component_specifications: dict[Any, Specification] = {
+    fib_zero: DSL().suffix(Constructor("fib") & Constructor("at", Literal(0, "int"))),
+    fib_one: DSL().suffix(Constructor("fib") & Constructor("at", Literal(1, "int"))),
+    fib_next: DSL()
+    .parameter("z", "int")
+    .parameter("y", "int", lambda vs: [vs["z"] - 1])
+    .parameter("x", "int", lambda vs: [vs["z"] - 2])
+    .argument("f1", Constructor("fib") & Constructor("at", Var("y")))
+    .argument("f2", Constructor("fib") & Constructor("at", Var("x")))
+    .suffix(Constructor("fib") & Constructor("at", Var("z"))),
+}
+
+
+def test_query_template() -> None:
+    synthesizer = Synthesizer(component_specifications, {"int": list(range(20))})
+    template = Constructor("fib") & Constructor("at", Var("n"))
+    solution_space_template = synthesizer.construct_solution_space_template(template, {"n": "int"}).prune()
+
+    # all instances share the same non-terminals
+    assert len(list(solution_space_template.solution_space.nonterminals())) == 20
+
+    fibs = [0, 1]
+    for _ in range(18):
+        fibs.append(fibs[-1] + fibs[-2])
+    for n in range(20):
+        trees = list(solution_space_template.enumerate_trees({"n": n}))
+        assert [tree.interpret() for tree in trees] == [fibs[n]]
+        target = solution_space_template.instantiate({"n": n})
+        assert target == Constructor("fib") & Constructor("at", Literal(n, "int"))
+        expected = synthesizer.construct_solution_space(target).prune()
+        assert set(expected.enumerate_trees(target)) == set(trees)
+
+
+def test_query_template_values() -> None:
+    class Nat(Container):
+        def __contains__(self, value: object) -> bool:
+            return isinstance(value, int) and value >= 0
+
+    synthesizer = Synthesizer(component_specifications, {"int": Nat()})
+    template = Constructor("fib") & Constructor("at", Var("n"))
+
+    with pytest.raises(ValueError, match="The values of n could not be enumerated"):
+        synthesizer.construct_solution_space_template(template, {"n": "int"})
+    with pytest.raises(ValueError, match="Parameter n is not abstracted"):
+        synthesizer.construct_solution_space_template(template, {})
+
+    solution_space_template = synthesizer.construct_solution_space_template(template, {"n": "int"}, {"n": [-1, 5, 6]})
+    assert [tree.interpret() for tree in solution_space_template.enumerate_trees({"n": 6})] == [8]
+    # values outside of the group are ignored
+    assert list(solution_space_template.enumerate_trees({"n": -1})) == []
@@ -0,0 +1,85 @@
+# test relations over literal parameters
+
+from collections.abc import Callable
+from functools import partial
+from itertools import product
+from typing import Any
+
+import pytest
+from cosy.bottom_up import BottomUpSynthesizer
+from cosy.dsl import DSL
+from cosy.solution_space import SolutionSpace
+from cosy.synthesizer import Specification, Synthesizer
+from cosy.types import Constructor, Literal, Var
+
+SIZE = 5
+POSITIONS = [(x, y) for x, y in product(range(SIZE), range(SIZE)) if (x + 2 * y) % 7 != 3]
+
+
+def step(dx: int, dy: int) -> Callable[[tuple[int, int]], tuple[int, int]]:
+    return lambda pos: (pos[0] + dx, pos[1] + dy)
+
+
+MOVES = {"up": step(0, 1), "down": step(0, -1), "left": step(1, 0), "right": step(-1, 0)}
+
+
+def neighbors(move: Callable[[tuple[int, int]], tuple[int, int]], vs: dict[str, Any]) -> list[tuple[int, int]]:
+    return [move(vs["b"])]
+
+
+def specifications(use_relations: bool) -> dict[Any, Specification]:
+    component_specifications: dict[Any, Specification] = {"start": Constructor("pos", Literal((0, 0), "pos"))}
+    for name, move in MOVES.items():
+        dsl = DSL().parameter("b", "pos")
+        if use_relations:
+            dsl = dsl.parameter("a", "pos").relation(("b", "a"), ((b, move(b)) for b in POSITIONS))
+        else:
+            dsl = dsl.parameter("a", "pos", partial(neighbors, move))
+        component_specifications[name] = dsl.argument("p", Constructor("pos", Var("a"))).suffix(
+            Constructor("pos", Var("b"))
+        )
+    return component_specifications
+
+
+def rules(solution_space: SolutionSpace) -> set[tuple[Any, ...]]:
+    return {(nt, rule.terminal, tuple(rule.arguments)) for nt, rhss in solution_space.as_tuples() for rule in rhss}
+
+
+@pytest.mark.parametrize("engine", [Synthesizer, BottomUpSynthesizer])
+def test_relation(engine: type[Synthesizer]) -> None:
+    parameter_space = {"pos": POSITIONS}
+    target = Constructor("pos", Literal((SIZE - 1, SIZE - 1), "pos"))
+    expected = Synthesizer(specifications(False), parameter_space).construct_solution_space(target).prune()
+    actual = engine(specifications(True), parameter_space).construct_solution_space(target).prune()
+    assert rules(actual) == rules(expected)
+    assert len(list(actual.enumerate_trees(target, 10))) == 10
+
+
+def test_relation_lookup() -> None:
+    component_specifications = {
+        "c": DSL()
+        .parameter("x", "int")
+        .parameter("y", "int")
+        .parameter("z", "int")
+        .relation(("x", "y", "z"), [(x, y, x + y) for x in range(10) for y in range(10)])
+        .relation(("z", "x"), [(z, x) for z in range(20) for x in range(z % 3)])
+        .suffix(Constructor("c", Var("z")))
+    }
+    synthesizer = Synthesizer(component_specifications, {"int": range(20)})
+    prefix = synthesizer.repository[0][1].prefix
+    substitutions = list(synthesizer._enumerate_substitutions(prefix, {"z": 5}))
+    assert substitutions == [{"z": 5, "x": 0, "y": 5}, {"z": 5, "x": 1, "y": 4}]
+
+
+def test_invalid_relation() -> None:
+    with pytest.raises(ValueError, match="does not match"):
+        DSL().parameter("x", "int").relation(("x",), [(1, 2)])
+    component_specifications = {
+        "c": DSL()
+        .parameter("x", "int")
+        .argument("y", Constructor("c"))
+        .relation(("x", "y"), [(1, 2)])
+        .suffix(Constructor("c"))
+    }
+    with pytest.raises(ValueError, match="not a literal parameter"):
+        Synthesizer(component_specifications, {"int": range(3)})
@@ -0,0 +1,96 @@
+# test adding and removing components of an existing synthesizer and updating solution spaces
+
+from typing import Any
+
+import pytest
+from cosy.bottom_up import BottomUpSynthesizer
+from cosy.dsl import DSL
+from cosy.solution_space import SolutionSpace
+from cosy.synthesizer import Specification, Synthesizer
+from cosy.types import Constructor, Literal, Type, Var
+
+A, B, C, D = Constructor("A"), Constructor("B"), Constructor("C"), Constructor("D")
+
+
+def nat(n: Any) -> Type:
+    return Constructor("nat", n)
+
+
+component_specifications: dict[Any, Specification] = {
+    "a": A,
+    "d": D,
+    "f": A**B,
+    "g": B**C,
+    "h": D**C,
+    "loop": C**C,
+    "zero": nat(Literal(0, "int")),
+    "succ": DSL()
+    .parameter("x", "int")
+    .parameter("y", "int", lambda vs: [vs["x"] - 1])
+    .argument("n", nat(Var("y")))
+    .suffix(nat(Var("x"))),
+    "double": DSL()
+    .parameter("x", "int")
+    .parameter("y", "int")
+    .parameter_constraint(lambda vs: vs["x"] == 2 * vs["y"])
+    .argument("n", nat(Var("y")))
+    .suffix(nat(Var("x"))),
+}
+targets = [C, nat(Literal(4, "int"))]
+
+
+def reachable_rules(solution_space: SolutionSpace, targets: list[Type]) -> dict[Any, set[Any]]:
+    """Rules reachable from the targets (ignoring their order and duplicates)."""
+
+    result: dict[Any, set[Any]] = {}
+    stack = list(targets)
+    while stack:
+        nt = stack.pop()
+        rules = solution_space.get(nt)
+        if nt in result or rules is None:
+            continue
+        result[nt] = set(rules)
+        stack.extend(m for rule in rules for m in rule.non_terminals)
+    return result
+
+
+@pytest.mark.parametrize("synthesizer_class", [Synthesizer, BottomUpSynthesizer])
+def test_repository_updates(synthesizer_class: type[Synthesizer]) -> None:
+    updates = ["a", "-f", "d", "zero", "f", "-loop", "-succ", "-d", "-zero", "succ", "zero", "-a"]
+    components = {name: component_specifications[name] for name in ["f", "g", "h", "loop", "succ", "double"]}
+    synthesizer = synthesizer_class(components, {"int": range(5)})
+    solution_space = synthesizer.construct_solution_space(*targets)
+    pruned = solution_space.prune()
+    for update in updates:
+        if update.startswith("-"):
+            name = update[1:]
+            changed = synthesizer.remove_component(name, solution_space, targets)
+            del components[name]
+        else:
+            changed = synthesizer.add_component(update, component_specifications[update], solution_space, targets)
+            components[update] = component_specifications[update]
+        pruned = solution_space.reprune(pruned, changed)
+
+        expected = synthesizer_class(components, {"int": range(5)}).construct_solution_space(*targets)
+        assert reachable_rules(pruned, targets) == reachable_rules(expected.prune(), targets)
+        assert reachable_rules(solution_space.prune(), targets) == reachable_rules(expected.prune(), targets)
+        # the synthesizer answers new queries as a new one
+        assert reachable_rules(synthesizer.construct_solution_space(*targets), targets) == reachable_rules(
+            expected, targets
+        )
+
+
+def test_invalid_updates() -> None:
+    synthesizer = Synthesizer({"a": A})
+    with pytest.raises(ValueError, match="already in the repository"):
+        synthesizer.add_component("a", B)
+    with pytest.raises(ValueError, match="not in the repository"):
+        synthesizer.remove_component("b")
+    solution_space = synthesizer.construct_solution_space(A).freeze()
+    with pytest.raises(ValueError, match="cannot be modified"):
+        synthesizer.remove_component("a", solution_space)
+    with pytest.raises(ValueError, match="cannot be modified"):
+        synthesizer.add_component("b", B, solution_space)
+    # the repository is unchanged
+    assert [combinator for combinator, _ in synthesizer.repository] == ["a"]
+    assert list(synthesizer.construct_solution_space(A)[A]) == list(solution_space[A])
@@ -0,0 +1,80 @@
+# test saving solution spaces to files and loading them (memory-mapped)
+
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import pytest
+from cosy.dsl import DSL
+from cosy.frozen_solution_space import FrozenSolutionSpace
+from cosy.solution_space import SolutionSpace
+from cosy.synthesizer import Specification, Synthesizer
+from cosy.types import Constructor, Literal, Var
+
+
+def zero_depth(_vs: Mapping[str, Any]) -> int:
+    return 0
+
+
+def rules(solution_space: SolutionSpace) -> dict[Any, list[Any]]:
+    return {nt: list(rhss) for nt, rhss in solution_space.as_tuples()}
+
+
+def test_save_load(tmp_path: Path) -> None:
+    # local functions are registered by name, module-level functions are pickled by reference
+    def balanced(vs: Mapping[str, Any]) -> bool:
+        return vs["l"].size <= vs["r"].size
+
+    def succ_depth(vs: Mapping[str, Any]) -> int:
+        return vs["n"].attributes["depth"] + 1
+
+    def plus_depth(vs: Mapping[str, Any]) -> int:
+        return max(vs["l"].attributes["depth"], vs["r"].attributes["depth"]) + 1
+
+    component_specifications: dict[Any, Specification] = {
+        "zero": DSL().attribute("depth", zero_depth).suffix(Constructor("nat", Literal(0, "int"))),
+        "succ": DSL()
+        .parameter("x", "int")
+        .parameter("y", "int", lambda vs: [vs["x"] - 1])
+        .argument("n", Constructor("nat", Var("y")))
+        .attribute("depth", succ_depth)
+        .suffix(Constructor("nat", Var("x"))),
+        "plus": DSL()
+        .parameter("x", "int")
+        .parameter("y", "int")
+        .parameter("z", "int")
+        .parameter_constraint(lambda vs: vs["x"] == vs["y"] + vs["z"])
+        .argument("l", Constructor("nat", Var("y")))
+        .argument("r", Constructor("nat", Var("z")))
+        .constraint(balanced, dependencies=["l", "r"])
+        .attribute("depth", plus_depth)
+        .suffix(Constructor("nat", Var("x"))),
+    }
+    synthesizer = Synthesizer(component_specifications, {"int": range(5)})
+    target = Constructor("nat", Literal(4, "int"))
+    solution_space = synthesizer.construct_solution_space(target).prune()
+    registry = {"balanced": balanced, "succ depth": succ_depth, "plus depth": plus_depth}
+
+    path = tmp_path / "nat.cosy"
+    with pytest.raises(ValueError, match="not registered"):
+        solution_space.save(path, {"balanced": balanced})
+    solution_space.save(path, registry)
+
+    loaded = SolutionSpace.load(path, registry)
+    assert isinstance(loaded, FrozenSolutionSpace)
+    assert rules(loaded) == rules(solution_space)
+    assert isinstance(loaded._arguments, memoryview)
+    trees = list(loaded.enumerate_trees(target, 30))
+    assert len(trees) == 30
+    assert all(solution_space.contains_tree(target, tree) for tree in trees)
+    assert all(tree.attributes["depth"] >= 1 for tree in trees)
+
+    # frozen solution spaces are saved as they are
+    loaded.prune().save(path, registry)
+    assert rules(SolutionSpace.load(path, registry)) == rules(solution_space)
+
+    with pytest.raises(ValueError, match="not registered"):
+        SolutionSpace.load(path, {"balanced": balanced})
+    (tmp_path / "other").write_bytes(b"solution space")
+    with pytest.raises(ValueError, match="does not contain a saved solution space"):
+        SolutionSpace.load(tmp_path / "other")
@@ -0,0 +1,112 @@
+# test solution spaces stored in an SQLite database
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+from cosy.dsl import DSL
+from cosy.solution_space import ConstantArgument, SolutionSpace
+from cosy.sqlite_solution_space import SQLiteSolutionSpace
+from cosy.synthesizer import Specification, Synthesizer
+from cosy.tree import Tree
+from cosy.types import Constructor, Literal, Predicate, Var
+
+component_specifications: dict[Any, Specification] = {
+    "zero": Constructor("nat", Literal(0, "int")),
+    "succ": DSL()
+    .parameter("x", "int")
+    .parameter("y", "int", lambda vs: [vs["x"] - 1])
+    .argument("n", Constructor("nat", Var("y")))
+    .suffix(Constructor("nat", Var("x"))),
+    "plus": DSL()
+    .parameter("x", "int")
+    .parameter("y", "int")
+    .parameter("z", "int")
+    .parameter_constraint(lambda vs: vs["x"] == vs["y"] + vs["z"])
+    .argument("l", Constructor("nat", Var("y")))
+    .argument("r", Constructor("nat", Var("z")))
+    .constraint(lambda vs: vs["l"].size <= vs["r"].size, dependencies=["l", "r"])
+    .suffix(Constructor("nat", Var("x"))),
+    # unproductive
+    "loop": Constructor("nat", Literal(4, "int")) ** Constructor("nat", Literal(4, "int")),
+}
+
+
+def rules(solution_space: SolutionSpace) -> dict[Any, list[Any]]:
+    return {nt: list(rhss) for nt, rhss in solution_space.as_tuples()}
+
+
+def symbol_count(path: Path) -> int:
+    with closing(sqlite3.connect(path)) as connection:
+        return connection.execute("SELECT COUNT(*) FROM symbols").fetchone()[0]
+
+
+def test_sqlite_solution_space(tmp_path: Path) -> None:
+    synthesizer = Synthesizer(component_specifications, {"int": range(5)})
+    target = Constructor("nat", Literal(4, "int"))
+    solution_space = synthesizer.construct_solution_space(target)
+    # the term predicate of plus is a lambda
+    term_predicates = {
+        predicate.constraint
+        for _, rhss in solution_space.as_tuples()
+        for rule in rhss
+        for predicate in rule.predicates
+        if isinstance(predicate, Predicate)
+    }
+    assert len(term_predicates) == 1
+    registry = {"balanced": next(iter(term_predicates))}
+
+    # rules are added in several batches, only few symbols are cached
+    path = tmp_path / "nat.sqlite"
+    stored = synthesizer.construct_solution_space(
+        target, solution_space=SQLiteSolutionSpace(path, registry, batch_size=7, cache_size=4)
+    )
+    assert isinstance(stored, SQLiteSolutionSpace)
+    assert rules(stored) == rules(solution_space)
+    assert stored.rule_count == sum(len(rhss) for rhss in rules(solution_space).values())
+    assert target in stored.nonterminals()
+    assert Constructor("nat", Literal(7, "int")) not in stored.nonterminals()
+    assert stored.symbol_cache_info().currsize <= 4
+    # symbols, whose ids are evicted from the cache, are found in the database instead of stored again
+    unique: SQLiteSolutionSpace = SQLiteSolutionSpace(tmp_path / "unique", registry)
+    synthesizer.construct_solution_space(target, solution_space=unique)
+    stored.close()
+    unique.close()
+    assert symbol_count(path) == symbol_count(tmp_path / "unique")
+    stored = SQLiteSolutionSpace(path, registry)
+
+    pruned = stored.prune()
+    assert rules(pruned) == rules(solution_space.prune())
+    trees = list(pruned.enumerate_trees(target, 30))
+    assert len(trees) == 30
+    assert all(stored.contains_tree(target, tree) for tree in trees)
+    assert all(pruned.contains_tree(target, tree) for tree in solution_space.enumerate_trees(target, 30))
+    assert not pruned.contains_tree(target, Tree("zero"))
+    pruned.close()
+
+    # rules are kept in the database file
+    seven = Constructor("nat", Literal(7, "int"))
+    stored.add_rule(seven, "seven", (), ())
+    stored.close()
+    reopened: SQLiteSolutionSpace = SQLiteSolutionSpace(path, registry)
+    assert [rule.terminal for rule in reopened[seven]] == ["seven"]
+    assert {nt: rhss for nt, rhss in rules(reopened).items() if nt != seven} == rules(solution_space)
+    reopened.close()
+
+
+def test_constants_of_different_types() -> None:
+    solution_space: SQLiteSolutionSpace = SQLiteSolutionSpace()
+    arguments = tuple(ConstantArgument(name, value, "any") for name, value in [("a", 1), ("b", True), ("c", 1.0)])
+    solution_space.add_rule("s", 1, arguments, ())
+    solution_space.add_rule("s", True, (), ())
+    # equal values of different types are kept apart
+    constants = [
+        argument.value
+        for rule in solution_space["s"]
+        for argument in rule.arguments
+        if isinstance(argument, ConstantArgument)
+    ]
+    assert [type(value) for value in constants] == [int, bool, float]
+    assert [type(rule.terminal) for rule in solution_space["s"]] == [int, bool]
+    solution_space.close()
@@ -0,0 +1,101 @@
+# test for the closure of taxonomies in Subtypes
+
+import random
+from typing import Any
+
+from cosy.subtypes import Subtypes
+from cosy.types import Arrow, Constructor, Intersection, Literal, Type, Var
+
+
+def naive_closure(taxonomy: dict[str, set[str]]) -> dict[str, set[str]]:
+    names = set(taxonomy).union(*taxonomy.values())
+    result = {name: {name}.union(taxonomy.get(name, set())) for name in names}
+    has_changed = True
+    while has_changed:
+        has_changed = False
+        for supertypes in result.values():
+            new_supertypes = set().union(*(result[supertype] for supertype in supertypes))
+            if not new_supertypes <= supertypes:
+                supertypes.update(new_supertypes)
+                has_changed = True
+    return result
+
+
+def test_closure() -> None:
+    for seed in range(50):
+        rng = random.Random(seed)
+        size = rng.randint(1, 30)
+        taxonomy = {
+            f"c{i}": {f"c{rng.randrange(size)}" for _ in range(rng.randint(0, 3))}
+            for i in range(size)
+            if rng.random() < 0.8
+        }
+        assert Subtypes(taxonomy).taxonomy == naive_closure(taxonomy)
+
+
+def test_cycle() -> None:
+    subtypes = Subtypes({"A": {"B"}, "B": {"C"}, "C": {"A", "D"}})
+    for name in "ABC":
+        assert set(subtypes.supertypes(name)) == {"A", "B", "C", "D"}
+    assert not subtypes.is_subconcept("D", "A")
+    assert subtypes.check_subtype(Constructor("A"), Constructor("D"), {}, {})
+    assert not subtypes.check_subtype(Constructor("D"), Constructor("A"), {}, {})
+
+
+def test_large_taxonomy() -> None:
+    size = 20000
+    # complete binary tree, where each concept is a subconcept of its parent
+    subtypes = Subtypes({f"c{i}": {f"c{(i - 1) // 2}"} for i in range(1, size)})
+    assert subtypes.is_subconcept(f"c{size - 1}", "c0")
+    assert not subtypes.is_subconcept("c0", "c1")
+    assert not subtypes.is_subconcept("c1", "c2")
+    assert subtypes.is_subconcept("unknown", "unknown")
+    assert not subtypes.is_subconcept("unknown", "c0")
+
+
+def random_type(rng: random.Random, depth: int, variables: bool) -> Type:
+    choice = rng.randrange(6 if depth > 0 else 3)
+    if choice == 0:
+        return Literal(rng.randrange(2), "bit")
+    if choice == 1 and variables:
+        return Var(rng.choice("xy"))
+    if choice <= 2:
+        return Constructor(rng.choice("ABCD"))
+    if choice == 3:
+        return Constructor(rng.choice("ABCD"), random_type(rng, depth - 1, variables))
+    if choice == 4:
+        return Arrow(random_type(rng, depth - 1, variables), random_type(rng, depth - 1, variables))
+    return Intersection(random_type(rng, depth - 1, variables), random_type(rng, depth - 1, variables))
+
+
+def test_compiled_checker() -> None:
+    subtypes = Subtypes({"A": {"B"}, "B": {"C"}})
+    groups = {"x": "bit", "y": "bit"}
+    substitution: dict[str, Any] = {"x": 0, "y": 1}
+    rng = random.Random(0)
+    for _ in range(200):
+        supertype = random_type(rng, 3, variables=True)
+        checker = subtypes.compile_checker(supertype)
+        for _ in range(20):
+            subtype = random_type(rng, 3, variables=True)
+            assert checker(subtype, groups, substitution) == subtypes.check_subtype(
+                subtype, supertype, groups, substitution
+            )
+
+
+def test_wide_intersections() -> None:
+    size = 50
+    subtypes = Subtypes({f"c{i}": {f"d{i}"} for i in range(size)})
+    subtype = Type.intersect([Constructor(f"c{i}", Literal(i, "int")) for i in range(size)])
+    supertype = Type.intersect([Constructor(f"d{i}", Literal(i, "int")) for i in range(size)])
+    assert subtypes.check_subtype(subtype, supertype, {}, {})
+    assert not subtypes.check_subtype(supertype, subtype, {}, {})
+    # distributivity of constructors over intersections
+    assert subtypes.check_subtype(subtype, Constructor("d0", Literal(0, "int") & Literal(0, "int")), {}, {})
+    assert not subtypes.check_subtype(subtype, Constructor("d0", Literal(0, "int") & Literal(1, "int")), {}, {})
+    assert subtypes.check_subtype(
+        Constructor("c", Constructor("A")) & Constructor("c", Constructor("B")),
+        Constructor("c", Constructor("A") & Constructor("B")),
+        {},
+        {},
+    )
@@ -0,0 +1,111 @@
+# test for incremental updates of the taxonomy
+
+import random
+from typing import Any
+
+from cosy.bottom_up import BottomUpSynthesizer
+from cosy.subtypes import Subtypes
+from cosy.synthesizer import Specification, Synthesizer
+from cosy.tree import Tree
+from cosy.types import Constructor, Type
+
+
+def test_add_and_remove_edges() -> None:
+    for seed in range(30):
+        rng = random.Random(seed)
+        size = rng.randint(1, 20)
+        edges = {(f"c{rng.randrange(size)}", f"c{rng.randrange(size)}") for _ in range(rng.randint(0, 30))}
+        current: set[tuple[str, str]] = set()
+        subtypes = Subtypes({})
+        for _ in range(10):
+            added = set(rng.sample(sorted(edges), rng.randint(0, len(edges))))
+            removed = set(rng.sample(sorted(current), rng.randint(0, len(current))))
+            subtypes.add_edges({sub: {sup for s, sup in added if s == sub} for sub, _ in added})
+            subtypes.remove_edges({sub: {sup for s, sup in removed if s == sub} for sub, _ in removed})
+            current = (current | added) - removed
+            expected = Subtypes({sub: {sup for s, sup in current if s == sub} for sub, _ in current})
+            for name, supertypes in expected.taxonomy.items():
+                assert set(subtypes.supertypes(name)) == supertypes
+
+
+def test_listener() -> None:
+    subtypes = Subtypes({"A": {"B"}, "C": {"D"}})
+    notifications: list[set[str]] = []
+    subtypes.add_listener(notifications.append)
+    subtypes.add_edges({"B": {"E"}})
+    subtypes.add_edges({"B": {"E"}})
+    subtypes.remove_edges({"C": {"D"}})
+    assert notifications == [{"A", "B", "E"}, {"C", "D"}]
+
+
+def trees(synthesizer: Synthesizer, target: Type) -> set[Any]:
+    return set(synthesizer.construct_solution_space(target).prune().enumerate_trees(target, max_count=100))
+
+
+def test_synthesizer_update() -> None:
+    component_specifications: dict[Any, Specification] = {
+        "a": Constructor("A"),
+        "b": Constructor("B"),
+        "f": Constructor("Super") ** Constructor("G"),
+        "g": Constructor("Other") ** Constructor("H"),
+    }
+    targets = [Constructor("A"), Constructor("Super"), Constructor("G"), Constructor("H")]
+    for synthesizer_class in (Synthesizer, BottomUpSynthesizer):
+        synthesizer = synthesizer_class(component_specifications)
+        assert trees(synthesizer, Constructor("G")) == set()
+        assert len(trees(synthesizer, Constructor("A"))) == 1
+
+        synthesizer.subtypes.add_edges({"A": {"Super"}, "B": {"Super"}})
+        expected = synthesizer_class(component_specifications, None, {"A": {"Super"}, "B": {"Super"}})
+        for target in targets:
+            assert trees(synthesizer, target) == trees(expected, target)
+        assert len(trees(synthesizer, Constructor("G"))) == 2
+
+        synthesizer.subtypes.remove_edges({"B": {"Super"}})
+        synthesizer.subtypes.add_edges({"B": {"Other"}})
+        expected = synthesizer_class(component_specifications, None, {"A": {"Super"}, "B": {"Other"}})
+        for target in targets:
+            assert trees(synthesizer, target) == trees(expected, target)
+        assert len(trees(synthesizer, Constructor("H"))) == 1
+
+
+def test_bottom_up_keeps_unaffected_rules() -> None:
+    component_specifications: dict[Any, Specification] = {
+        "a": Constructor("A"),
+        "b": Constructor("B"),
+        "f": Constructor("A") ** Constructor("F"),
+    }
+    targets = [Constructor("F"), Constructor("B"), Constructor("Super"), Constructor("Other")]
+    synthesizer = BottomUpSynthesizer(component_specifications)
+    before = synthesizer.construct_solution_space(*targets)
+    synthesizer.subtypes.add_edges({"B": {"Super"}, "Super": {"Other"}})
+    expected = BottomUpSynthesizer(component_specifications, None, {"B": {"Super"}, "Super": {"Other"}})
+    after = synthesizer.construct_solution_space(*targets)
+    # inhabitation of the facts did not change, the rules for F do not depend on B
+    assert list(after[Constructor("F")]) == list(before[Constructor("F")])
+    # rules for the affected concepts are updated
+    assert Constructor("Super") not in before.nonterminals()
+    for target in targets:
+        assert list(after.get(target) or ()) == list(expected.construct_solution_space(target).get(target) or ())
+        assert trees(synthesizer, target) == trees(expected, target)
+    assert trees(synthesizer, Constructor("Other")) == {Tree("b")}
+
+
+def test_partial_invalidation() -> None:
+    component_specifications: dict[Any, Specification] = {
+        "a": Constructor("A"),
+        "b": Constructor("B"),
+        "f": Constructor("A") ** Constructor("F"),
+    }
+    targets = [Constructor("F"), Constructor("B"), Constructor("Super")]
+    synthesizer = Synthesizer(component_specifications)
+    for target in targets:
+        synthesizer.construct_solution_space(target)
+    currsize = synthesizer.path_cache_info().currsize
+    synthesizer.subtypes.add_edges({"B": {"Super"}})
+    # candidates for F and A do not depend on B or Super
+    assert 0 < synthesizer.path_cache_info().currsize < currsize
+    expected = Synthesizer(component_specifications, None, {"B": {"Super"}})
+    for target in targets:
+        assert trees(synthesizer, target) == trees(expected, target)
+    assert trees(synthesizer, Constructor("Super")) == {Tree("b")}
@@ -0,0 +1,40 @@
+# test vectorized constraints on literal parameters
+
+import sys
+from typing import Any
+
+import pytest
+from cosy.dsl import DSL
+from cosy.synthesizer import Specification, Synthesizer
+from cosy.types import Constructor, Var
+
+
+def specifications(vectorized: bool) -> dict[Any, Specification]:
+    return {
+        "c": DSL()
+        .parameter("x", "int")
+        .parameter("y", "int")
+        .parameter_constraint(lambda vs: vs["y"] % 1000 == vs["x"], vectorized=vectorized)
+        .parameter_constraint(lambda vs: vs["y"] > 0, vectorized=vectorized)
+        .suffix(Constructor("c", Var("x")) & Constructor("d", Var("y")))
+    }
+
+
+def substitutions(synthesizer: Synthesizer, substitution: dict[str, Any]) -> list[dict[str, Any]]:
+    return list(synthesizer._enumerate_substitutions(synthesizer.repository[0][1].prefix, substitution))
+
+
+@pytest.mark.parametrize("numpy_available", [True, False])
+def test_vectorized_constraints(numpy_available: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    if not numpy_available:
+        # importing numpy fails
+        monkeypatch.setitem(sys.modules, "numpy", None)
+    parameter_space = {"int": range(10000)}
+    expected = Synthesizer(specifications(False), parameter_space)
+    synthesizer = Synthesizer(specifications(True), parameter_space)
+    for substitution in [{"x": 3}, {"x": 3, "y": 5003}, {"x": 3, "y": 5004}, {"y": 2002}]:
+        assert substitutions(synthesizer, substitution) == substitutions(expected, substitution)
+    assert [vs["y"] for vs in substitutions(synthesizer, {"x": 0})] == list(range(1000, 10000, 1000))
+    for vs in substitutions(synthesizer, {"x": 7}):
+        # values are not converted to NumPy scalars
+        assert type(vs["y"]) is int